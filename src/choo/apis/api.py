@@ -1,7 +1,26 @@
+import asyncio
 from abc import ABCMeta
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock, Thread
+from urllib.parse import urlsplit
+from weakref import WeakKeyDictionary
+
+import requests
+from requests.adapters import HTTPAdapter
 
 from ..types import SimpleSerializable
+from .policy import UpstreamPolicy
+from .singleflight import SingleFlight
+from .stats import LatencyStats, TransferStats
+from .transports import LiveTransport
+from .xmlbackends import default_backend
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
 
 _apis_by_name = {}
 
@@ -43,18 +62,185 @@ class API(SimpleSerializable, metaclass=MetaAPI):
     To start a query on an API instance use its properties:
     >>> api.stops.where(name='Essen')
     This may raise a NotImplementedError if the API does not implement this Query.
+
+    Each API instance owns a pool of keep-alive HTTP connections that is shared by all its requests.
+    Compressed responses are requested, transfer_stats counts the transferred bytes (see TransferStats)
+    and latency_stats keeps the recent latencies by host (see get_latency_stats()).
+    pool_size is the maximum number of connections kept open per host,
+    keep_alive=False closes each connection after its request.
+    If preconnect is True, connections are opened when the API instance is created, see preconnect().
+    Asynchronous requests use an aiohttp session per event loop instead, if aiohttp is installed
+    (see get_async_session()).
+
+    response_cache can be a choo.caches.ResponseCache to cache raw responses of this API.
+    response_ttls contains the default time to live of cached responses by endpoint.
+
+    If coalesce_requests is True, identical requests that are executed concurrently (e.g. by multiple threads)
+    only result in one upstream request.
+
+    If streaming is True, requests that support it (like large coordinate requests) parse their response
+    incrementally while it is being received, instead of waiting for the complete document.
+
+    If eager_parsing is True, parsers that support it extract all fields they can in one pass over their data
+    before they are converted into a Model.Sourced, instead of parsing each field separately
+    (see Parser._parse_eager()). This is faster if most fields of the results are used.
+
+    transport is the choo.apis.transports.Transport that sends requests upstream (or replays recorded ones).
+    If None, a LiveTransport is used.
+
+    policy is the choo.apis.policy.UpstreamPolicy that applies timeouts, rate limiting, retries and
+    circuit breaking to upstream requests. If None, the default UpstreamPolicy is used.
+
+    xml_backend is the choo.apis.xmlbackends.XMLBackend used to parse XML responses. If None, the default
+    ElementTreeBackend is used. LXMLBackend is faster, but needs lxml.
+
+    intern_pool can be a choo.caches.InternPool. If given, structurally identical Model.Sourced instances
+    created from this API's parsers share one instance.
     """
     _model_to_query = {}
+    response_ttls = {}
 
-    def __init__(self, name):
+    def __init__(self, name, pool_size=10, keep_alive=True, preconnect=False, response_cache=None,
+                 coalesce_requests=True, policy=None, streaming=False, transport=None, xml_backend=None,
+                 intern_pool=None, eager_parsing=False):
         if self.__class__ == API:
             raise TypeError('Only API subclasses can be initialized.')
         if name in _apis_by_name:
             raise TypeError('Duplicate API name: %s' % name)
+        if not isinstance(pool_size, int) or pool_size < 1:
+            raise TypeError('pool_size has to be int >= 1')
 
         self.name = name
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.response_cache = response_cache
+        self.single_flight = SingleFlight() if coalesce_requests else None
+        self.policy = policy if policy is not None else UpstreamPolicy()
+        self.transport = transport if transport is not None else LiveTransport()
+        self.streaming = streaming
+        self.eager_parsing = eager_parsing
+        self.xml_backend = xml_backend if xml_backend is not None else default_backend
+        self.intern_pool = intern_pool
+        self.transfer_stats = TransferStats()
+        self.latency_stats = {}
+        self._session = None
+        self._session_lock = Lock()
+        self._executor = None
+        self._async_sessions = WeakKeyDictionary()
         _apis_by_name[name] = self
 
+        if preconnect:
+            self.preconnect()
+
+    @property
+    def session(self):
+        """
+        The requests.Session used for all requests of this API. It is created on first access.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        session = requests.Session()
+        session.headers['Accept-Encoding'] = 'gzip, deflate'
+        # one connection pool per host (e.g. mirrors), so they don't evict each other
+        adapter = HTTPAdapter(pool_connections=max(1, len(self._preconnect_urls())), pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def get_async_session(self):
+        """
+        Get the aiohttp.ClientSession used for asynchronous requests of this API in the current event loop.
+        It is created on first use and keeps up to pool_size connections per host. Close it using aclose().
+        """
+        if aiohttp is None:
+            raise ImportError('Asynchronous requests need aiohttp to be installed.')
+        loop = asyncio.get_event_loop()
+        session = self._async_sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=0, limit_per_host=self.pool_size, force_close=not self.keep_alive)
+            session = aiohttp.ClientSession(connector=connector, headers={'Accept-Encoding': 'gzip, deflate'})
+            self._async_sessions[loop] = session
+        return session
+
+    async def aclose(self):
+        """
+        Close the aiohttp session of the current event loop, if there is one.
+        """
+        session = self._async_sessions.pop(asyncio.get_event_loop(), None)
+        if session is not None:
+            await session.close()
+
+    @property
+    def executor(self):
+        """
+        The ThreadPoolExecutor used for asynchronous queries and requests that can not be executed without blocking,
+        e.g. if aiohttp is not installed. It has one worker per pooled connection.
+        """
+        if self._executor is None:
+            with self._session_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.pool_size)
+        return self._executor
+
+    def run_async(self, func, *args):
+        """
+        Run the blocking func with the given arguments in the API's executor. Returns an awaitable.
+        """
+        return asyncio.get_event_loop().run_in_executor(self.executor, partial(func, *args))
+
+    def get_latency_stats(self, url):
+        """
+        Get the LatencyStats of the host of the given URL (e.g. the API's or one of its mirrors).
+        """
+        host = urlsplit(url).netloc
+        stats = self.latency_stats.get(host)
+        if stats is None:
+            with self._session_lock:
+                stats = self.latency_stats.setdefault(host, LatencyStats())
+        return stats
+
+    def get_mirror_urls(self, url):
+        """
+        Get the URLs of mirrors that answer the same requests as url. Used for hedged requests if the API's policy
+        enables hedging (see UpstreamPolicy).
+        Overwritten by API subclasses that support mirrors.
+        """
+        return ()
+
+    def _preconnect_urls(self):
+        """
+        URLs to which connections should be opened by preconnect(). Overwritten by API subclasses.
+        """
+        return ()
+
+    def preconnect(self, connections=1, timeout=5):
+        """
+        Open the given number of keep-alive connections to each of the APIs hosts, so that the first requests
+        don't have to wait for the TCP and TLS handshakes. Connection errors are ignored.
+        """
+        if not self.keep_alive:
+            return
+
+        def connect(url):
+            try:
+                self.session.head(url, timeout=timeout)
+            except requests.RequestException:
+                pass
+
+        threads = [Thread(target=connect, args=(url, ))
+                   for url in self._preconnect_urls() for i in range(min(connections, self.pool_size))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
     @classmethod
     def _get_serialized_type_name(cls):
         return 'api'
@@ -0,0 +1,147 @@
+import gzip
+import json
+import mmap
+import os
+import zlib
+from collections import OrderedDict, defaultdict
+from threading import Lock
+
+from .requests import request_fingerprint
+
+
+class CassetteWriter:
+    """
+    Writes recorded requests to a cassette file, see Cassette. Recordings are written and flushed immediately,
+    so a cassette can be recorded continuously without keeping the recordings in memory.
+
+    >>> with CassetteWriter('traffic.cassette') as cassette:
+    ...     vrr.transport = RecordingTransport(cassette=cassette)
+    """
+    def __init__(self, path, append=True):
+        self.path = path
+        mode = 'ab' if append else 'wb'
+        self._file = open(path, mode)
+        self._index = open(Cassette.get_index_path(path), mode)
+        if append and self._file.tell() and not self._index.tell():
+            raise ValueError('Cassette %s has no index, use Cassette.rebuild_index() first.' % path)
+        self._lock = Lock()
+
+    def write(self, recording):
+        """
+        Write a recording (a dict with the keys method, url, data (optional) and result).
+        """
+        fingerprint = request_fingerprint(recording['method'], recording['url'], recording.get('data'))
+        data = gzip.compress(json.dumps(recording, ensure_ascii=False).encode()+b'\n')
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(data)
+            self._file.flush()
+            self._index.write(json.dumps((fingerprint, offset, len(data))).encode()+b'\n')
+            self._index.flush()
+
+    def extend(self, recordings):
+        """
+        Write multiple recordings, e.g. a RecordingTransport's requests_dump.
+        """
+        for recording in recordings:
+            self.write(recording)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+            self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class Cassette:
+    """
+    A file of recorded requests with their responses that can be replayed using a ReplayTransport.
+
+    Each recording is stored as a JSON line in its own gzip member. The members are concatenated, so the whole
+    file is also a valid gzip compressed JSON lines file (e.g. zcat traffic.cassette | jq .url).
+    The index file (path+'.idx') contains a JSON line with the request fingerprint, offset and length of each
+    recording. The cassette file is memory mapped, so only the recordings that are used are read and decompressed.
+    """
+    chunk_size = 64*1024
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+        index_path = self.get_index_path(path)
+        if not os.path.exists(index_path):
+            self.rebuild_index(path)
+        with open(index_path, 'rb') as f:
+            self.index = [tuple(json.loads(line.decode())) for line in f if line.strip()]
+
+    @staticmethod
+    def get_index_path(path):
+        return path+'.idx'
+
+    @classmethod
+    def rebuild_index(cls, path):
+        """
+        Create the index of a cassette file by decompressing all its recordings.
+        """
+        with open(path, 'rb') as f:
+            data = memoryview(f.read())
+
+        with open(cls.get_index_path(path), 'wb') as index:
+            offset = 0
+            while offset < len(data):
+                decompressor = zlib.decompressobj(wbits=16+zlib.MAX_WBITS)
+                chunks = []
+                position = offset
+                while not decompressor.eof:
+                    chunk = data[position:position+cls.chunk_size]
+                    if not chunk:
+                        raise ValueError('Cassette %s is truncated.' % path)
+                    chunks.append(decompressor.decompress(chunk))
+                    position += len(chunk)
+                recording = json.loads(b''.join(chunks).decode())
+                length = position - offset - len(decompressor.unused_data)
+                fingerprint = request_fingerprint(recording['method'], recording['url'], recording.get('data'))
+                index.write(json.dumps((fingerprint, offset, length)).encode()+b'\n')
+                offset += length
+
+    def __len__(self):
+        return len(self.index)
+
+    def read(self, offset, length):
+        """
+        Read the recording at the given position.
+        """
+        return json.loads(gzip.decompress(self._data[offset:offset+length]).decode(), object_pairs_hook=OrderedDict)
+
+    def __iter__(self):
+        """
+        Iterate over all recordings in the order they were recorded.
+        """
+        return (self.read(offset, length) for fingerprint, offset, length in self.index)
+
+    def get_positions_by_fingerprint(self):
+        """
+        Get a dict of the (offset, length) tuples of all recordings by their request fingerprints.
+        """
+        result = defaultdict(list)
+        for fingerprint, offset, length in self.index:
+            result[fingerprint].append((offset, length))
+        return result
+
+    def close(self):
+        if self._data:
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,69 @@
+from threading import local
+from time import monotonic
+
+from ..exceptions import DeadlineExceeded
+
+_local = local()
+
+
+class Deadline:
+    """
+    A point in time (seconds from now) until which something has to be finished.
+
+    Deadlines are activated for the current thread using with. All requests that are executed in the thread
+    while it is active are limited to the remaining time and raise DeadlineExceeded once it is exceeded.
+    Nested deadlines can only shorten the active deadline, never extend it.
+
+    >>> with Deadline(0.8):
+    ...     stop = vrr.stops.get(stop)
+    """
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires = monotonic() + seconds
+
+    def remaining(self):
+        """
+        Get the remaining time in seconds (0 if the deadline is exceeded).
+        """
+        return max(0, self.expires - monotonic())
+
+    @property
+    def exceeded(self):
+        return monotonic() >= self.expires
+
+    def check(self):
+        """
+        Raise DeadlineExceeded if the deadline is exceeded.
+        """
+        if self.exceeded:
+            raise self.get_exception()
+
+    def get_exception(self):
+        return DeadlineExceeded('Deadline of %.3fs exceeded.' % self.seconds)
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self if not stack or stack[-1].expires > self.expires else stack[-1])
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _local.stack.pop()
+
+
+def get_deadline():
+    """
+    Get the active Deadline of the current thread or None.
+    """
+    stack = getattr(_local, 'stack', None)
+    return stack[-1] if stack else None
+
+
+def check_deadline():
+    """
+    Raise DeadlineExceeded if the active Deadline of the current thread is exceeded.
+    """
+    deadline = get_deadline()
+    if deadline is not None:
+        deadline.check()
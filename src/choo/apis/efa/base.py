@@ -3,6 +3,10 @@ from ...types import PlatformType, POIType
 
 
 class EFA(API):
+    """
+    An EFA instance. base_url is the URL of the EFA, mirrors can be URLs of other EFAs that serve the same data.
+    They are only used for hedged requests, which have to be enabled in the policy (see UpstreamPolicy).
+    """
     poitype_mapping = (
         ('A', POIType.education),
         ('B', POIType.public_building),
@@ -20,11 +24,24 @@ class EFA(API):
         'Platform': PlatformType.platform,
         '': PlatformType.unknown,
     }
+    response_ttls = {
+        'XML_STOPFINDER_REQUEST': 6*60*60,
+        'XML_COORD_REQUEST': 5*60,
+    }
 
-    def __init__(self, name, base_url, preset):
-        super().__init__(name)
+    def __init__(self, name, base_url, preset, mirrors=(), **kwargs):
         self.base_url = base_url
+        self.mirrors = tuple(mirrors)
         self.preset = preset
+        super().__init__(name, **kwargs)
+
+    def get_mirror_urls(self, url):
+        if not url.startswith(self.base_url):
+            return ()
+        return tuple(mirror+url[len(self.base_url):] for mirror in self.mirrors)
+
+    def _preconnect_urls(self):
+        return (self.base_url, )+self.mirrors
 
     def _parse_omc(self, omc):
         """
@@ -2,6 +2,7 @@ from .. import EFA
 from ... import ParserError, cached_property, parser_property
 from ....models import POI, City, GeoPoint, Platform, Stop, StopArea
 from ....types import Coordinates, FrozenIDs
+from ...xmlbackends import XPath
 from .utils import GenAttrMapping
 
 
@@ -25,26 +26,52 @@ class CoordInfoGeoPoint(EFA.Parser, GeoPoint.XMLParser):
 class GeoPointParserMixin:
     """
     Mixin for any <coordInfoItem> parser
-    """
+
+    If the API's eager_parsing is enabled, the coordinates and <genAttrList> are parsed in one pass over the
+    children of <coordInfoItem>. Afterwards, the fields in _eager_fields are parsed, as they only need the attributes
+    of <coordInfoItem> and the <genAttrList>.
+    """
+    _x_xpath = XPath('./itdPathCoordinates/itdCoordinateBaseElemList/itdCoordinateBaseElem/x')
+    _y_xpath = XPath('./itdPathCoordinates/itdCoordinateBaseElemList/itdCoordinateBaseElem/y')
+    _coord_elem_xpath = XPath('./itdCoordinateBaseElemList/itdCoordinateBaseElem')
+    _attrs_xpath = XPath('./genAttrList')
+    _eager_fields = ()
+
+    def _parse_eager(self, data, no_coords=False, platform=None, **kwargs):
+        result = {}
+        for child in data:
+            if child.tag == 'itdPathCoordinates' and not no_coords and 'coords' in self.Model._fields:
+                coords = {elem.tag: elem.text for elem in self._coord_elem_xpath.find(child)}
+                result['coords'] = Coordinates(int(coords['y'])/1000000, int(coords['x'])/1000000)
+            elif child.tag == 'genAttrList' and platform is None:
+                self.__dict__['_attrs'] = GenAttrMapping(child)
+        for name in self._eager_fields:
+            result[name] = getattr(self, name)
+        return result
+
     @parser_property
     def coords(self, data, no_coords=False, **kwargs):
         if no_coords:
             return None
-        coords = data.find('./itdPathCoordinates/itdCoordinateBaseElemList/itdCoordinateBaseElem')
-        return Coordinates(int(coords.find('./y').text)/1000000, int(coords.find('./x').text)/1000000)
+        return Coordinates(int(self._y_xpath.findtext(data))/1000000, int(self._x_xpath.findtext(data))/1000000)
 
     @cached_property
-    def _attrs(self, data, **kwargs):
+    def _attrs(self, data, platform=None, **kwargs):
         """
         Get <genAttrList> attributes
         """
-        return GenAttrMapping(data.find('./genAttrList'))
+        if platform is not None:
+            # the platform was parsed from the same <coordInfoItem>
+            return platform._attrs
+        return GenAttrMapping(self._attrs_xpath.find(data))
 
 
 class LocationParserMixin(GeoPointParserMixin):
     """
     Mixin for any <coordInfoItem> parser for Location submodels
     """
+    _eager_fields = ('name', )
+
     @parser_property
     def name(self, data, **kwargs):
         return data.attrib.get('name', '').strip() or None
@@ -83,6 +110,8 @@ class CoordInfoStop(LocationParserMixin, EFA.Parser, Stop.XMLParser):
     """
     Parse a <coordInfoItem> that describes a Stop
     """
+    _eager_fields = ('name', 'ids')
+
     @parser_property
     def ids(self, data, platform=None, **kwargs):
         return FrozenIDs({
@@ -100,6 +129,8 @@ class CoordInfoPOI(LocationParserMixin, EFA.Parser, POI.XMLParser):
     """
     Parse a <coordInfoItem> that describes a POI
     """
+    _eager_fields = ('name', 'poitype')
+
     @parser_property
     def city(self, data, **kwargs):
         return CoordInfoLocationCity(self, data)
@@ -114,6 +145,8 @@ class CoordInfoPlatform(GeoPointParserMixin, EFA.Parser, Platform.XMLParser):
     """
     Parse a <coordInfoItem> that describes a Platform
     """
+    _eager_fields = ('ids', 'name', 'platform_type')
+
     @parser_property
     def ids(self, data, **kwargs):
         return FrozenIDs({
@@ -142,6 +175,8 @@ class CoordInfoStopArea(GeoPointParserMixin, EFA.Parser, StopArea.XMLParser):
     """
     Parse a the stop area part pf <coordInfoItem> that describes a Platform into a StopArea
     """
+    _eager_fields = ('ids', 'name')
+
     @parser_property
     def ids(self, data, platform):
         myid = platform.ids.get(self.api.name)
@@ -1,7 +1,10 @@
+from copy import copy, deepcopy
+
 from .. import EFA
 from ... import cached_property, parser_property
 from ....models import POI, Address, City, Stop
 from ....types import Coordinates, FrozenIDs
+from ...xmlbackends import XPath
 
 
 class OmcParserMixin:
@@ -50,14 +53,37 @@ class OdvNameElemCity(OmcParserMixin, EFA.Parser, City.XMLParser):
 class LocationParserMixin:
     """
     Mixin class for anything that parses an <odvNameElem> Element into a Location subclass
+
+    odv_city is the <odvPlaceElem> of the ODV the element belongs to. It is kept next to the element instead of being
+    appended to it, so the element does not have to be copied. Serialized parsers contain it as a child element.
     """
+    _city_xpath = XPath('./odvPlaceElem')
+
+    def __init__(self, parent, data, odv_city=None, **kwargs):
+        super().__init__(parent, data, **kwargs)
+        self._odv_city = odv_city
+
+    def _get_printable_element(self):
+        if self._odv_city is None:
+            return self.data
+        # print as one element, so the city and the text survive unserializing
+        data = deepcopy(self.data)
+        if data.text is not None:
+            data.attrib['choo-text'] = data.text
+        data.append(copy(self._odv_city))
+        return data
+
+    @cached_property
+    def _text(self, data, **kwargs):
+        return data.attrib.get('choo-text', data.text)
+
     @parser_property
     def ids(self, data, **kwargs):
         myid = data.attrib.get('stopID') or data.attrib.get('id')
         return myid and FrozenIDs({self.api.name: myid})
 
     def _city_parse(self, data, country, **kwargs):
-        city = data.find('./odvPlaceElem')
+        city = self._odv_city if self._odv_city is not None else self._city_xpath.find(data)
         if city is not None:
             return OdvPlaceElemCity(self, city, country=country)
         return OdvNameElemCity(self, data, country=country)
@@ -68,7 +94,7 @@ class LocationParserMixin:
 
     @parser_property
     def name(self, data, **kwargs):
-        return data.attrib.get('objectName', data.attrib.get('choo-text'))
+        return data.attrib.get('objectName', self._text)
 
     @parser_property
     def coords(self, data, **kwargs):
@@ -96,7 +122,7 @@ class OdvNameElemAddress(LocationParserMixin, EFA.Parser, Address.XMLParser):
 
     @parser_property
     def name(self, data, **kwargs):
-        name = data.attrib.get('objectName', data.text)
+        name = data.attrib.get('objectName', self._text)
         if name is not None:
             number = self.number
             if number and number not in name:
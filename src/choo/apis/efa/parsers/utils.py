@@ -1,10 +1,24 @@
+from ...xmlbackends import XPath
+
+
 class GenAttrMapping:
     """
     Parses an <genAttrList> Element into a Mapping that supports duplicate keys
     """
+    _elem_xpath = XPath('./genAttrElem')
+
     def __init__(self, data):
-        self._items = tuple((elem.find('./name').text, elem.find('./value').text or '')
-                            for elem in data.findall('./genAttrElem'))
+        items = []
+        # iterating over the children is faster than path lookups, especially with lxml
+        for elem in self._elem_xpath.findall(data):
+            name = value = None
+            for child in elem:
+                if child.tag == 'name':
+                    name = child.text
+                elif child.tag == 'value':
+                    value = child.text
+            items.append((name, value or ''))
+        self._items = tuple(items)
         self._anyitem = dict(self._items)
 
     def __getitem__(self, name):
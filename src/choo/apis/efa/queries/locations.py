@@ -7,12 +7,22 @@ from ..requests.stopfinder import StopfinderRequest
 
 class GeoPointQuery(EFA.GeoPointQueryBase):
     def _execute(self):
+        return self._wrap_distance_results(CoordRequest(api=self.api, **self._get_coord_request_args()).results)
+
+    async def _aexecute(self):
+        r = await CoordRequest.create_async(self.api, **self._get_coord_request_args())
+        return self._wrap_distance_results(r.results)
+
+    def _get_coord_request_args(self):
         if not self.coords:
             raise NotImplementedError('Not enough data for Query.')
 
-        results = CoordRequest(api=self.api, coords=self.coords, model_cls=self.Model,
-                               max_distance=self.settings.max_distance, limit=self.settings.limit).results
-        return self._wrap_distance_results(results)
+        only = self.settings.only
+        if only is not None and 'coords' not in only:
+            # the coordinates are needed to calculate the distances
+            only += ('coords', )
+        return {'coords': self.coords, 'model_cls': self.Model, 'max_distance': self.settings.max_distance,
+                'limit': self.settings.limit, 'only': only}
 
     def _wrap_distance_results(self, results):
         """
@@ -45,9 +55,32 @@ class PlatformQuery(GeoPointQuery, EFA.PlatformQueryBase):
         else:
             return super()._execute()
 
+    async def _aexecute(self):
+        if self.stop:
+            # the stop and the platforms near it are retrieved using other queries
+            return None
+        return await super()._aexecute()
+
 
 class LocationQuery(GeoPointQuery, EFA.LocationQueryBase):
     def _execute(self):
+        location = self._get_stopfinder_location()
+        if location is None:
+            return super()._execute()
+        return self._get_stopfinder_results(StopfinderRequest(api=self.api, location=location,
+                                                              limit=self.settings.limit))
+
+    async def _aexecute(self):
+        location = self._get_stopfinder_location()
+        if location is None:
+            return await super()._aexecute()
+        return self._get_stopfinder_results(await StopfinderRequest.create_async(self.api, location=location,
+                                                                                 limit=self.settings.limit))
+
+    def _get_stopfinder_location(self):
+        """
+        Return the location for a STOPFINDER_REQUEST, or None if all locations near the coordinates are queried.
+        """
         # Is this location unique by ID? If so, just query it.
         location = self._convert_unique_location()
 
@@ -61,13 +94,13 @@ class LocationQuery(GeoPointQuery, EFA.LocationQueryBase):
                 location = {'type': 'coord', 'name': '%.6f:%.6f:WGS84' % reversed(self.coords)}
 
             if not location:
-                return super()._execute()
+                return None
 
         if not location:
             raise NotImplementedError('Not enough data for Query.')
+        return location
 
-        r = StopfinderRequest(api=self.api, location=location, limit=self.settings.limit)
-
+    def _get_stopfinder_results(self, r):
         if r.type == 'none':
             return ()
         elif r.type == 'stop':
@@ -1,8 +1,7 @@
 from ...requests import XMLRequest
 from ..parsers.odv import OdvPlaceElemCity, OdvNameElemPOI, OdvNameElemStop, OdvNameElemAddress
 from ... import ParserError
-
-from copy import deepcopy
+from ...xmlbackends import XPath
 
 
 class EFARequest(XMLRequest):
@@ -11,6 +10,11 @@ class EFARequest(XMLRequest):
 
 
 class OdvParserMixin:
+    _odv_place_xpath = XPath('./itdOdvPlace')
+    _odv_place_elem_xpath = XPath('./odvPlaceElem')
+    _odv_name_xpath = XPath('./itdOdvName')
+    _odv_name_elem_xpath = XPath('./odvNameElem')
+
     def _parse_odv(self, data):
         """
         Parse an ODV (OriginDestinationVia) XML node
@@ -18,25 +22,25 @@ class OdvParserMixin:
         odvtype = data.attrib['type']
 
         # Place.city
-        p = data.find('./itdOdvPlace')
+        p = self._odv_place_xpath.find(data)
         if p.attrib['state'] == 'empty':
             city = None
         elif p.attrib['state'] != 'identified':
             if p.attrib['state'] == 'list':
-                return 'cities', (OdvPlaceElemCity(self, city) for city in p.find('./odvPlaceElem'))
+                return 'cities', (OdvPlaceElemCity(self, city) for city in self._odv_place_elem_xpath.find(p))
             return 'none', ()
         else:
-            city = p.find('./odvPlaceElem')
+            city = self._odv_place_elem_xpath.find(p)
 
         # Location.name
-        n = data.find('./itdOdvName')
+        n = self._odv_name_xpath.find(data)
         if n.attrib['state'] == 'empty':
             if city is not None:
                 return 'cities', (city, )
             return 'none', ()
 
         if n.attrib['state'] == 'identified':
-            ne = n.find('./odvNameElem')
+            ne = self._odv_name_elem_xpath.find(n)
             # AnyTypes are used in some EFA instances instead of ODV types
             odvtype = ne.attrib.get('anyType', odvtype)
             odvtype, location = self._parse_location_name(ne, city, odvtype)
@@ -46,23 +50,19 @@ class OdvParserMixin:
             return 'none', ()
 
         return 'mixed', (self._parse_location_name(item, city, odvtype)[1]
-                         for item in sorted(n.findall('./odvNameElem'), reverse=True,
+                         for item in sorted(self._odv_name_elem_xpath.findall(n), reverse=True,
                                             key=lambda e: e.attrib.get('matchQuality', 0)))
 
     def _parse_location_name(self, data, city, odvtype):
         """
         Parses the odvNameElem of an ODV
         """
-        data = deepcopy(data)
-        data.attrib['choo-text'] = data.text
-        if city is not None:
-            data.append(city)
         odvtype = data.attrib.get('anyType', odvtype)
         if odvtype == 'stop':
-            return 'stop', OdvNameElemStop(self, data)
+            return 'stop', OdvNameElemStop(self, data, odv_city=city)
         elif odvtype == 'poi':
-            return 'poi', OdvNameElemPOI(self, data)
+            return 'poi', OdvNameElemPOI(self, data, odv_city=city)
         elif odvtype in ('street', 'singlehouse', 'coord', 'address'):
-            return 'address', OdvNameElemAddress(self, data)
+            return 'address', OdvNameElemAddress(self, data, odv_city=city)
         else:
             raise ParserError(self, 'Unknown odvtype: %s' % odvtype)
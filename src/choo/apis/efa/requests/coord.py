@@ -2,15 +2,27 @@ from datetime import datetime
 
 from . import EFARequest
 from ....models import POI, Platform, Stop
+from ...xmlbackends import XPath
 from ..parsers.coordinfo import CoordInfoGeoPoint
 
 
 class CoordRequest(EFARequest):
     """
     Execute a COORDS_REQUEST (find Locations within a given distance from specific coordinates)
+
+    In streaming mode (stream=True, defaults to the API's streaming attribute), the results are parsed while the
+    response is being received. They are returned as Model.Sourced instances and their XML is discarded immediately.
+    If only is given, only these fields are parsed in streaming mode (see Query.only()).
     """
-    def __init__(self, api, coords, model_cls, max_distance, limit=None):
-        super().__init__(api)
+    endpoint = 'XML_COORD_REQUEST'
+    _items_xpath = XPath('./itdCoordInfoRequest/itdCoordInfo/coordInfoItemList/coordInfoItem')
+
+    def __init__(self, api, coords, model_cls, max_distance, limit=None, stream=None, only=None):
+        super().__init__(api, coords, model_cls, max_distance, limit=limit, stream=stream, only=only)
+
+    def _prepare(self, coords, model_cls, max_distance, limit=None, stream=None, only=None):
+        self.stream = self.api.streaming if stream is None else stream
+        self.only = only
 
         post = {
             'language': 'de',
@@ -40,9 +52,32 @@ class CoordRequest(EFARequest):
                 'radius_%d' % (i+1): max_distance
             })
 
-        xml = self._post('XML_COORD_REQUEST', post)
+        return post
+
+    def _process(self, xml):
         self.time = datetime.strptime(xml.attrib['now'], '%Y-%m-%dT%H:%M:%S')
 
-        data = xml.find('./itdCoordInfoRequest/itdCoordInfo/coordInfoItemList')
-        self.results = (CoordInfoGeoPoint.parse(self, elem)
-                        for elem in data.findall('./coordInfoItem'))
+        self.results = (CoordInfoGeoPoint.parse(self, elem) for elem in self._items_xpath.findall(xml))
+
+    def _process_stream(self, source):
+        events = self._iterparse(source)
+        event, root = next(events)
+        self.time = datetime.strptime(root.attrib['now'], '%Y-%m-%dT%H:%M:%S')
+        self.results = self._stream_results(source, events)
+
+    def _stream_results(self, source, events):
+        """
+        Parse the results while the response is being received. If they are not consumed completely,
+        the response is closed once the generator is closed (and not added to the response cache).
+        """
+        parent = None
+        try:
+            for event, elem in events:
+                if event == 'start':
+                    if elem.tag == 'coordInfoItemList':
+                        parent = elem
+                elif elem.tag == 'coordInfoItem' and parent is not None:
+                    yield CoordInfoGeoPoint.parse(self, elem).sourced(self.only)
+                    parent.remove(elem)
+        finally:
+            source.close()
@@ -1,5 +1,6 @@
 from datetime import datetime
 
+from ...xmlbackends import XPath
 from . import EFARequest, OdvParserMixin
 
 
@@ -7,8 +8,13 @@ class StopfinderRequest(EFARequest, OdvParserMixin):
     """
     Executes a STOPFINDER_REQUEST (which can not only find stops)
     """
+    endpoint = 'XML_STOPFINDER_REQUEST'
+    _odv_xpath = XPath('./itdStopFinderRequest/itdOdv')
+
     def __init__(self, api, location, coords=None, limit=None):
-        super().__init__(api)
+        super().__init__(api, location, coords=coords, limit=limit)
+
+    def _prepare(self, location, coords=None, limit=None):
         post = {
             'language': 'de',
             'outputFormat': 'XML',
@@ -29,8 +35,9 @@ class StopfinderRequest(EFARequest, OdvParserMixin):
         if not post['place_sf']:
             post.pop('place_sf')
 
-        xml = self._post('XML_STOPFINDER_REQUEST', post)
+        return post
+
+    def _process(self, xml):
         self.time = datetime.strptime(xml.attrib['now'], '%Y-%m-%dT%H:%M:%S')
 
-        data = xml.find('./itdStopFinderRequest')
-        self.type, self.results = self._parse_odv(data.find('./itdOdv'))
+        self.type, self.results = self._parse_odv(self._odv_xpath.find(xml))
@@ -1,15 +1,74 @@
 import json
 import os
-import sys
 from abc import ABC, abstractmethod
 from collections import OrderedDict
 from datetime import datetime
 
-import defusedxml.ElementTree as ET
 from defusedxml import minidom
 
 from ..types import Serializable
 from .api import API
+from .xmlbackends import default_backend, tostring
+
+# the ParserStats that parser properties are recorded in, None if profiling is disabled (see set_parser_stats)
+_parser_stats = None
+
+
+def set_parser_stats(stats):
+    """
+    Record the calls of all parser properties in the given choo.apis.stats.ParserStats, or stop recording them
+    if stats is None. Use ParserStats.enable() or ParserStats as context manager instead of calling this directly.
+    """
+    global _parser_stats
+    _parser_stats = stats
+
+
+def get_debug_data(parser, max_length=20000):
+    """
+    Get the parser's data as string for debugging, pretty printed if it is not longer than max_length characters.
+    Longer data is truncated to max_length characters.
+    """
+    if not isinstance(parser, Parser):
+        return repr(parser)
+    data = parser.printable_data(pretty=False)
+    if len(data) <= max_length:
+        data = parser.printable_data()
+    if len(data) > max_length:
+        data = '%s… (%d characters omitted)' % (data[:max_length], len(data)-max_length)
+    return data
+
+
+class ParserDebugMessage:
+    """
+    An exception message with the data of the parser in which the exception occured appended.
+    The parser is kept by reference and its data is only rendered once the message is converted into a string.
+    """
+    def __init__(self, message, parser):
+        self.message = message
+        self.parser = parser
+        self._rendered = None
+
+    def __str__(self):
+        if self._rendered is None:
+            self._rendered = '%s\n\n### CHOO DEBUG INFO:\n%s' % (self.message, get_debug_data(self.parser))
+        return self._rendered
+
+    def __repr__(self):
+        return repr(str(self))
+
+
+def _add_debug_info(e, parser):
+    """
+    Get a copy of the exception e with a ParserDebugMessage. If e already has one (because it was raised in a nested
+    parser) or can not be copied, it is returned unchanged.
+    """
+    if e.args and isinstance(e.args[0], ParserDebugMessage):
+        return e
+    try:
+        result = type(e)(ParserDebugMessage(str(e), parser))
+    except Exception:
+        return e
+    return result.with_traceback(e.__traceback__)
 
 
 class ParserError(Exception):
@@ -17,18 +76,25 @@ class ParserError(Exception):
     Exception raised if data can not be parsed.
 
     The parser attribute contains the Parser in which the error occured.
-    The pretty_data attribute contains the parser's data as a string.
+    The pretty_data attribute contains the parser's data as a string (see get_debug_data). It is only rendered
+    when it is accessed. If the CHOO_DEBUG environment variable is set, it is appended to the message.
     """
     def __init__(self, parser, message):
         self.parser = parser
         self.message = message
-        self.pretty_data = self.parser.printable_data()
+        self._pretty_data = None
 
         if os.environ.get('CHOO_DEBUG'):
-            message += '\n'+self.pretty_data
+            message = ParserDebugMessage(message, parser)
 
         super().__init__(message)
 
+    @property
+    def pretty_data(self):
+        if self._pretty_data is None:
+            self._pretty_data = get_debug_data(self.parser)
+        return self._pretty_data
+
 
 class Parser(Serializable, ABC):
     """
@@ -47,6 +113,10 @@ class Parser(Serializable, ABC):
     Your parser may also inherit from another one of your parsers instead.
 
     Model attributes that are not implemented by your parser automatically will return None.
+
+    Parser properties are evaluated lazily, one at a time. If the API's eager_parsing is True, _parse_eager() is
+    called before a parser is converted into a Model.Sourced, so a parser can extract many fields in one pass over
+    its data.
     """
     API = None
 
@@ -65,6 +135,38 @@ class Parser(Serializable, ABC):
         self.data = data
         self._kwargs = kwargs
 
+    @property
+    def eager(self):
+        """
+        Whether parse_eager() is called before the parser is converted into a Model.Sourced (see API.eager_parsing).
+        """
+        return self.api.eager_parsing
+
+    def _parse_eager(self, data, **kwargs):
+        """
+        Extract the values of multiple fields in one pass over data and return them as a dict.
+        Fields that are not in the result are parsed by their parser properties as usual.
+        cached_property values can be set in self.__dict__.
+        """
+        return {}
+
+    def parse_eager(self):
+        """
+        Parse and cache all fields that the parser extracts in one pass (see _parse_eager).
+        """
+        try:
+            values = self._parse_eager(self.data, **self._kwargs)
+        except Exception as e:
+            raise _add_debug_info(e, self)
+
+        fields = self.Model._fields
+        for name, value in values.items():
+            if name in self.__dict__:
+                continue
+            if not fields[name].validate(value):
+                raise TypeError('Invalid type for attribute %s.' % name)
+            self.__dict__[name] = value
+
     @abstractmethod
     def printable_data(self, pretty=True):
         """
@@ -75,12 +177,12 @@ class Parser(Serializable, ABC):
 
     @classmethod
     @abstractmethod
-    def _parse_raw_data(cls, data):
+    def _parse_raw_data(cls, data, api=None):
         pass
 
     @classmethod
     def parse(cls, api, time, data, **kwargs):
-        result = cls(None, cls._parse_raw_data(data), api=api, time=time, **kwargs)
+        result = cls(None, cls._parse_raw_data(data, api), api=api, time=time, **kwargs)
         if not isinstance(api, cls.API):
             raise TypeError('Wrong API for this parser. Expected %s subclass, not %s.' % (repr(cls.API), repr(api)))
         return result
@@ -139,8 +241,18 @@ class Parser(Serializable, ABC):
         return cls.parse(API.unserialize(data['api']), datetime.strptime(data['time'], '%Y-%m-%dT%H:%M:%S'),
                          data['data'], **kwargs)
 
-    def sourced(self):
-        return self.Model.Sourced.from_parser(self)
+    def sourced(self, only=None):
+        """
+        Get a Model.Sourced with the parsed fields.
+        If only is given, only the given fields are parsed, see Model.Sourced.from_object().
+        """
+        return self.Model.Sourced.from_parser(self, only)
+
+    def lazy_sourced(self):
+        """
+        Get a Model.LazySourced that only parses fields when they are read.
+        """
+        return self.Model.LazySourced.from_parser(self)
 
     def mutable(self):
         return self.sourced().mutable()
@@ -158,18 +270,24 @@ class Parser(Serializable, ABC):
 
 class XMLParser(Parser):
     """
-    A Parser that parses XML using defusedxml.ElementTree.
-    data has to be a defusedxml.ElementTree.Element instance, e.g. ElementTree.fromstring(…).
+    A Parser that parses XML using the API's XML backend (see choo.apis.xmlbackends).
+    data has to be an element of the backend, e.g. api.xml_backend.fromstring(…).
     """
     def printable_data(self, pretty=True):
-        string = ET.tostring(self.data, 'utf-8').decode()
+        string = tostring(self._get_printable_element())
         if pretty:
             string = minidom.parseString(string).toprettyxml(indent='    ').split('\n', 1)[1]
         return string
 
+    def _get_printable_element(self):
+        """
+        Get the element that is printed and serialized, usually the parser's data.
+        """
+        return self.data
+
     @classmethod
-    def _parse_raw_data(cls, data):
-        return ET.fromstring(data)
+    def _parse_raw_data(cls, data, api=None):
+        return (api.xml_backend if api is not None else default_backend).fromstring(data)
 
 
 class JSONParser(Parser):
@@ -181,7 +299,7 @@ class JSONParser(Parser):
         return json.dumps(self.data, indent=4 if pretty else None, ensure_ascii=False)
 
     @classmethod
-    def _parse_raw_data(cls, data):
+    def _parse_raw_data(cls, data, api=None):
         return json.loads(data)
 
 
@@ -195,7 +313,7 @@ class parser_property(object):
     and all additional keyword arguments that the parser was initialized with. It will only be
     called once as it's return value will be cached.
 
-    If an exception is raised from your method, debug info will be added to its message.
+    If an exception is raised from your method, debug info will be added to its message (see ParserDebugMessage).
 
     Example:
     >>> class MyStopParser(Stop.XMLParser):
@@ -213,10 +331,13 @@ class parser_property(object):
 
         field = obj.Model._fields[self.name]
         try:
-            value = obj.__dict__[self.name] = self.func(obj, obj.data, **obj._kwargs)
+            if _parser_stats is None:
+                value = self.func(obj, obj.data, **obj._kwargs)
+            else:
+                value = _parser_stats.measure(obj, self.name, self.func, obj, obj.data, **obj._kwargs)
+            obj.__dict__[self.name] = value
         except Exception as e:
-            raise type(e)(str(e) +
-                          '\n\n### CHOO DEBUG INFO:\n%s' % obj.printable_data()).with_traceback(sys.exc_info()[2])
+            raise _add_debug_info(e, obj)
 
         if not field.validate(value):
             raise TypeError('Invalid type for attribute %s.' % self.name)
@@ -224,7 +345,7 @@ class parser_property(object):
         return value
 
 
-def cached_property(func):
+class cached_property(object):
     """
     A decorator to create an internal parser property that does not correspond to a field of the given model.
     The name of the property should start with an underscore.
@@ -232,8 +353,17 @@ def cached_property(func):
     This decorator is similar to parser_property, but it only caches the result and adds the method arguments.
     There is no exception handling.
     """
-    def wrapped_func(self):
-        value = func(self, self.data, **self._kwargs)
-        self.__dict__[func.__name__] = value
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+
+        if _parser_stats is None:
+            value = self.func(obj, obj.data, **obj._kwargs)
+        else:
+            value = _parser_stats.measure(obj, self.func.__name__, self.func, obj, obj.data, **obj._kwargs)
+        obj.__dict__[self.func.__name__] = value
         return value
-    return property(wrapped_func)
@@ -0,0 +1,317 @@
+import asyncio
+import random
+from threading import Lock
+from time import monotonic, sleep
+
+import requests
+
+from ..exceptions import CircuitOpenError, DeadlineExceeded
+from .deadlines import get_deadline
+
+
+class TokenBucket:
+    """
+    A token bucket rate limiter: allows rate calls per second on average and bursts of up to burst calls.
+    """
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise TypeError('rate has to be > 0')
+        self.rate = rate
+        self.burst = burst or max(1, rate)
+        self._tokens = self.burst
+        self._updated = monotonic()
+        self._lock = Lock()
+
+    def _refill(self):
+        now = monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _take(self):
+        """
+        Take a token if one is available. Returns 0 if one was taken, otherwise the time until there is one.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """
+        Take a token, waiting until one is available.
+        If a Deadline is active and there will be no token before it is exceeded, DeadlineExceeded is raised instead.
+        """
+        deadline = get_deadline()
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            if deadline is not None and wait >= deadline.remaining():
+                raise deadline.get_exception()
+            sleep(wait)
+
+    async def aacquire(self):
+        """
+        Like acquire(), but a coroutine that waits without blocking the event loop.
+        """
+        deadline = get_deadline()
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            if deadline is not None and wait >= deadline.remaining():
+                raise deadline.get_exception()
+            await asyncio.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Fails fast while an upstream is down.
+
+    After failure_threshold consecutive failures the circuit opens and all calls raise CircuitOpenError.
+    After reset_timeout seconds one trial call is let through: if it succeeds the circuit closes again,
+    otherwise it stays open for another reset_timeout seconds.
+    """
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened = None
+        self._trial = False
+        self._lock = Lock()
+
+    @property
+    def is_open(self):
+        return self._opened is not None
+
+    def before_call(self):
+        """
+        Raise CircuitOpenError if the circuit is open and no trial call is due.
+        """
+        with self._lock:
+            if self._opened is None:
+                return
+            if not self._trial and monotonic() - self._opened >= self.reset_timeout:
+                self._trial = True
+                return
+        raise CircuitOpenError('Circuit is open, upstream is considered to be down.')
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.failure_threshold:
+                self._opened = monotonic()
+                self._trial = False
+
+    def record_aborted(self):
+        """
+        Record a call that was aborted without a result from the upstream (e.g. because the deadline was exceeded).
+        Does not change the state, but lets the next call be the trial call if this was one.
+        """
+        with self._lock:
+            self._trial = False
+
+
+class UpstreamPolicy:
+    """
+    Describes how requests are sent to the upstream API. Each API instance has its own policy.
+
+    timeout is passed to requests (seconds, or a (connect, read) tuple).
+    rate_limit is the maximum number of requests per second (None for unlimited), burst the maximum burst size.
+    Connection errors, timeouts and 5xx responses are retried up to retries times. Before each retry,
+    the policy waits for a random time between 0 and backoff*2^attempt seconds, but not more than max_backoff.
+    failure_threshold and reset_timeout configure the CircuitBreaker, failure_threshold=None disables it.
+
+    If a Deadline is active (see Query.timeout()), timeouts are shortened to the remaining time and
+    DeadlineExceeded is raised instead of retrying or waiting for the rate limit once there is no time left.
+
+    Each host (e.g. the API's and each of its mirrors) has its own CircuitBreaker, see get_circuit_breaker().
+
+    Hedging is disabled by default. If hedge_percentile is set and the API has mirrors, a hedge request is sent to
+    the next mirror if there was no response after the hedge_percentile of the recent latencies of the host
+    (see LatencyStats), or hedge_delay seconds as long as less than hedge_min_samples latencies are known.
+    See LiveTransport._hedge() for details.
+
+    Asynchronous requests (see Transport.afetch()) use acall() instead of call().
+
+    To implement a custom policy, overwrite call() and acall().
+    """
+    hedge_min_samples = 20
+
+    def __init__(self, timeout=(3.05, 10), rate_limit=None, burst=None, retries=2, backoff=0.2, max_backoff=5,
+                 failure_threshold=5, reset_timeout=30, hedge_percentile=None, hedge_delay=1):
+        self.timeout = timeout
+        self.rate_limiter = TokenBucket(rate_limit, burst) if rate_limit else None
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._circuit_breakers = {}
+        self._lock = Lock()
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+
+    def get_circuit_breaker(self, host=None):
+        """
+        Get the CircuitBreaker of the given host, or None if circuit breaking is disabled.
+        Hosts have their own circuit breakers, so an upstream that is down does not open the circuit of its mirrors.
+        """
+        if not self.failure_threshold:
+            return None
+        circuit_breaker = self._circuit_breakers.get(host)
+        if circuit_breaker is None:
+            with self._lock:
+                circuit_breaker = self._circuit_breakers.get(host)
+                if circuit_breaker is None:
+                    circuit_breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                    self._circuit_breakers[host] = circuit_breaker
+        return circuit_breaker
+
+    @property
+    def circuit_breaker(self):
+        """
+        The CircuitBreaker of calls without a host, see get_circuit_breaker().
+        """
+        return self.get_circuit_breaker()
+
+    def get_timeout(self):
+        """
+        Get the timeout for the next request, shortened to the remaining time of the active Deadline.
+        """
+        deadline = get_deadline()
+        if deadline is None:
+            return self.timeout
+        remaining = deadline.remaining()
+        if isinstance(self.timeout, tuple):
+            return tuple(min(timeout, remaining) for timeout in self.timeout)
+        return remaining if self.timeout is None else min(self.timeout, remaining)
+
+    def get_hedge_delay(self, latency_stats):
+        """
+        Get the time in seconds after which a hedge request should be sent or None if hedging is disabled.
+        """
+        if self.hedge_percentile is None:
+            return None
+        if len(latency_stats) < self.hedge_min_samples:
+            return self.hedge_delay
+        return latency_stats.percentile(self.hedge_percentile)
+
+    def is_retryable(self, exception):
+        """
+        Check whether a failed request should be retried and counts as an upstream failure.
+        """
+        if isinstance(exception, requests.HTTPError):
+            return exception.response is not None and exception.response.status_code >= 500
+        return isinstance(exception, (requests.ConnectionError, requests.Timeout))
+
+    def get_backoff(self, attempt):
+        """
+        Get the time in seconds to wait before the given retry attempt (starting with 0).
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def call(self, func, *args, host=None):
+        """
+        Call func(*args), which sends a request upstream to the given host, and apply the policy.
+        """
+        deadline = get_deadline()
+        circuit_breaker = self.get_circuit_breaker(host)
+        attempt = 0
+        while True:
+            self._before_attempt(deadline, circuit_breaker)
+            if self.rate_limiter is not None:
+                try:
+                    self.rate_limiter.acquire()
+                except DeadlineExceeded:
+                    if circuit_breaker is not None:
+                        circuit_breaker.record_aborted()
+                    raise
+
+            try:
+                result = func(*args)
+            except Exception as e:
+                backoff = self._get_retry_backoff(e, deadline, circuit_breaker, attempt)
+                if backoff is None:
+                    raise
+            else:
+                if circuit_breaker is not None:
+                    circuit_breaker.record_success()
+                return result
+
+            sleep(backoff)
+            attempt += 1
+
+    async def acall(self, func, *args, host=None):
+        """
+        Like call(), but a coroutine for a func that returns an awaitable. Waiting does not block the event loop.
+        """
+        deadline = get_deadline()
+        circuit_breaker = self.get_circuit_breaker(host)
+        attempt = 0
+        while True:
+            self._before_attempt(deadline, circuit_breaker)
+            if self.rate_limiter is not None:
+                try:
+                    await self.rate_limiter.aacquire()
+                except (DeadlineExceeded, asyncio.CancelledError):
+                    if circuit_breaker is not None:
+                        circuit_breaker.record_aborted()
+                    raise
+
+            try:
+                result = await func(*args)
+            except asyncio.CancelledError:
+                if circuit_breaker is not None:
+                    circuit_breaker.record_aborted()
+                raise
+            except Exception as e:
+                backoff = self._get_retry_backoff(e, deadline, circuit_breaker, attempt)
+                if backoff is None:
+                    raise
+            else:
+                if circuit_breaker is not None:
+                    circuit_breaker.record_success()
+                return result
+
+            await asyncio.sleep(backoff)
+            attempt += 1
+
+    def _before_attempt(self, deadline, circuit_breaker):
+        if deadline is not None:
+            deadline.check()
+        if circuit_breaker is not None:
+            circuit_breaker.before_call()
+
+    def _get_retry_backoff(self, exception, deadline, circuit_breaker, attempt):
+        """
+        Record a failed attempt of call() or acall(). Returns the time to wait before the next attempt,
+        or None if the exception should be raised. Raises DeadlineExceeded if there is no time left for a retry.
+        """
+        if not self.is_retryable(exception):
+            # the upstream did answer, so this is no reason to open the circuit
+            if circuit_breaker is not None:
+                circuit_breaker.record_success()
+            return None
+        if deadline is not None and deadline.exceeded:
+            # the timeout was probably shortened by the deadline, so this is no upstream failure
+            if circuit_breaker is not None:
+                circuit_breaker.record_aborted()
+            raise deadline.get_exception() from exception
+        if circuit_breaker is not None:
+            circuit_breaker.record_failure()
+        if attempt >= self.retries:
+            return None
+
+        backoff = self.get_backoff(attempt)
+        if deadline is not None and backoff >= deadline.remaining():
+            raise deadline.get_exception()
+        return backoff
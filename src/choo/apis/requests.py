@@ -1,84 +1,242 @@
+import hashlib
 import json
-import os
+import re
 from abc import ABC, abstractmethod
-from collections import OrderedDict
 from datetime import datetime
-from pprint import pprint
+from io import BytesIO
 
-import defusedxml.ElementTree as ET
-import requests
+from .deadlines import check_deadline
+
+
+def request_fingerprint(method, url, data=None):
+    """
+    Get a fingerprint that identifies a request by its method, url and data.
+    The data is normalized, so the order of its items does not matter.
+    """
+    items = data.items() if isinstance(data, dict) else (data or ())
+    normalized = (method, url, sorted((str(name), str(value)) for name, value in items))
+    return hashlib.sha1(json.dumps(normalized).encode()).hexdigest()
 
 
 class Request(ABC):
-    requests_dump = []
+    """
+    A request to an API. It gets executed on initialization, the results are available as attributes afterwards.
+
+    Subclasses describe the request in _prepare() and evaluate its result in _process().
+    If the stream attribute is set to True in _prepare(), _process_stream() is called instead of _process(),
+    so the response can be evaluated while it is still being received.
+
+    If the response was fetched from upstream, compressed_size and uncompressed_size contain its size in bytes.
+
+    Use create_async() to execute a request without blocking the event loop:
+    >>> r = await StopfinderRequest.create_async(api, location=location)
+    """
+    method = 'POST'
+    endpoint = None
+    stream = False
+    compressed_size = None
+    uncompressed_size = None
+
+    def __init__(self, api, *args, **kwargs):
+        self._init(api, *args, **kwargs)
+        if self.stream:
+            self._process_stream(self._stream(self.method, self.endpoint, self.data))
+        else:
+            self._process(self._request(self.method, self.endpoint, self.data))
 
-    @abstractmethod
-    def __init__(self, api):
+    @classmethod
+    async def create_async(cls, api, *args, **kwargs):
+        """
+        Create and execute the request without blocking the event loop, see Transport.afetch().
+        Streaming mode is not supported, the response is always read completely.
+        """
+        self = cls.__new__(cls)
+        self._init(api, *args, **kwargs)
+        self.stream = False
+        self._process(await self._arequest(self.method, self.endpoint, self.data))
+        return self
+
+    def _init(self, api, *args, **kwargs):
         self.api = api
         self.time = datetime.now()
+        self.data = self._prepare(*args, **kwargs)
+
+    @abstractmethod
+    def _prepare(self, *args, **kwargs):
+        """
+        Return the data to send with the request.
+        """
+        pass
+
+    @abstractmethod
+    def _process(self, result):
+        """
+        Evaluate the parsed result of the request.
+        """
+        pass
+
+    def _process_stream(self, source):
+        """
+        Evaluate the result of the request in streaming mode. source is a file-like object over the response body.
+        It has to be closed once it is not read anymore, even if it was not read completely.
+        Only requests that support streaming mode have to implement this.
+        """
+        raise NotImplementedError('%s does not support streaming mode.' % self.__class__.__name__)
 
     def _url_filter(self, endpoint, method):
         return endpoint
 
-    def _post(self, endpoint, data, session=requests):
+    def _post(self, endpoint, data, session=None):
         return self._request('POST', endpoint, data, session=session)
 
-    def _get(self, endpoint, session=requests):
+    def _get(self, endpoint, session=None):
         return self._request('GET', endpoint, session=session)
 
-    def _request(self, method, endpoint, data=None, session=requests):
+    async def _arequest(self, method, endpoint, data=None):
+        """
+        Like _request(), but a coroutine that sends the HTTP request using the transport's afetch().
+        """
+        check_deadline()
         url = self._url_filter(endpoint)
-        if os.environ.get('CHOO_DEBUG'):
-            print('=== %s: %s ===' % (method, url))
-            if method == 'POST':
-                pprint(data)
-            print('='*70)
-
-        if os.environ.get('CHOO_REQUESTS_TEST'):
-            if os.environ.get('CHOO_REQUESTS_TEST_ORDERED'):
-                request = self.requests_dump.pop(0)
-            else:
-                for i, request in enumerate(self.requests_dump):
-                    if request['method'] == method and request['url'] == url:
-                        if request['method'] != 'POST' or request['data'] == data:
-                            break
-                else:
-                    raise AssertionError('Request not found in dump: %s %s %s' % (method, url, repr(data)))
-                self.requests_dump.pop(i)
-
-            if not os.environ.get('CHOO_REQUESTS_TEST_FORCE_REQUEST'):
-                return self._parse_result_to_data(request['result'])
-
-        if method == 'POST':
-            result = session.post(url, data)
-        elif method == 'GET':
-            result = session.get(data)
-
-        if os.environ.get('CHOO_REQUESTS_DUMP'):
-            dump = OrderedDict((
-                ('method', method),
-                ('url', url),
-            ))
-            if method == 'POST':
-                dump['data'] = data
-            dump['result'] = result.text
-            Request.requests_dump.append(dump)
-
-        if os.environ.get('CHOO_DEBUG'):
-            open('dump.xml', 'w').write(result.text)
-
-        return self._parse_result_to_data(result.text)
+        key = request_fingerprint(method, url, data)
+        if self.api.single_flight is None:
+            return await self._acached_request(key, method, endpoint, url, data)
+        return await self.api.single_flight.ado(key, self._acached_request, key, method, endpoint, url, data)
+
+    def _request(self, method, endpoint, data=None, session=None):
+        """
+        Execute a HTTP request using the API's transport and return the parsed result.
+        If no session is given, the pooled session of the API is used.
+        If the API has a response cache, cached responses are used and new ones are added to it.
+        Identical requests that are executed concurrently share one upstream request and its parsed result.
+        Raises DeadlineExceeded if the active Deadline is exceeded.
+        """
+        check_deadline()
+        url = self._url_filter(endpoint)
+        key = request_fingerprint(method, url, data)
+        if self.api.single_flight is None:
+            return self._cached_request(key, method, endpoint, url, data, session)
+        return self.api.single_flight.do(key, self._cached_request, key, method, endpoint, url, data, session)
+
+    def _cached_request(self, key, method, endpoint, url, data, session):
+        """
+        Get the parsed result from the response cache, or fetch it if the API has no cache or it is not cached.
+        """
+        item = self._get_cached_item(key)
+        if item is None:
+            return self._cache_result(key, endpoint, self._fetch(key, method, url, data, session))
+        return self._get_item_data(item)
+
+    async def _acached_request(self, key, method, endpoint, url, data):
+        item = self._get_cached_item(key)
+        if item is None:
+            return self._cache_result(key, endpoint, await self._afetch(key, method, url, data))
+        return self._get_item_data(item)
+
+    def _get_cached_item(self, key):
+        cache = self.api.response_cache
+        return None if cache is None else cache.get(key)
+
+    def _cache_result(self, key, endpoint, body):
+        """
+        Add a fetched response body to the response cache, if the API has one, and return its parsed result.
+        """
+        cache = self.api.response_cache
+        item = None if cache is None else cache.set(key, body, cache.get_ttl(endpoint, self.api.response_ttls))
+        if item is None:
+            return self._parse_result_to_data(body)
+        return self._get_item_data(item)
+
+    def _get_item_data(self, item):
+        if item.data is None:
+            item.data = self._parse_result_to_data(item.body)
+        return item.data
+
+    def _fetch(self, key, method, url, data, session):
+        return self._encode_result(self.api.transport.fetch(self, method, url, data, session, key))
+
+    async def _afetch(self, key, method, url, data):
+        return self._encode_result(await self.api.transport.afetch(self, method, url, data, key))
+
+    def _stream(self, method, endpoint, data=None, session=None):
+        """
+        Execute a HTTP request and return a file-like object over the response body that can be read
+        while the response is still being received. Used by requests in streaming mode.
+        Streamed responses are added to the response cache once they were read completely.
+        """
+        check_deadline()
+        url = self._url_filter(endpoint)
+        key = request_fingerprint(method, url, data)
+
+        cache = self.api.response_cache
+        if cache is None:
+            return self.api.transport.stream(self, method, url, data, session, key)
+
+        item = cache.get(key)
+        if item is not None:
+            return BytesIO(item.body)
+
+        def on_complete(body):
+            cache.set(key, self._encode_result(body), cache.get_ttl(endpoint, self.api.response_ttls))
+        return self.api.transport.stream(self, method, url, data, session, key, on_complete)
+
+    @classmethod
+    def _encode_result(cls, result):
+        """
+        Encode a response body to bytes if it is a string (e.g. from a recording).
+        """
+        return result.encode() if isinstance(result, str) else result
+
+    @classmethod
+    def _decode_result(cls, result):
+        """
+        Decode a response body to a string (used for recordings).
+        """
+        return result if isinstance(result, str) else result.decode()
 
     @classmethod
     @abstractmethod
     def _parse_result_to_data(cls, result):
+        """
+        Parse a response body (bytes or str) into data.
+        """
         pass
 
 
 class XMLRequest(Request):
-    @classmethod
+    """
+    A request with an XML response. Responses are parsed from bytes using the encoding from their XML declaration
+    and the API's XML backend.
+    """
+    _xml_encoding = re.compile(r'^\s*<\?xml[^>]*?encoding=["\']([A-Za-z0-9._-]+)["\']')
+
     def _parse_result_to_data(self, result):
-        return ET.fromstring(result)
+        return self.api.xml_backend.fromstring(result)
+
+    @classmethod
+    def _get_declared_encoding(cls, result):
+        if isinstance(result, bytes):
+            result = result[:256].decode('latin-1')
+        match = cls._xml_encoding.match(result)
+        return match.group(1) if match else 'utf-8'
+
+    @classmethod
+    def _encode_result(cls, result):
+        if isinstance(result, bytes):
+            return result
+        return result.encode(cls._get_declared_encoding(result), 'xmlcharrefreplace')
+
+    @classmethod
+    def _decode_result(cls, result):
+        if isinstance(result, str):
+            return result
+        return result.decode(cls._get_declared_encoding(result))
+
+    def _iterparse(self, source):
+        """
+        Parse XML incrementally from a file-like object. Yields (event, element) tuples for start and end events.
+        """
+        return self.api.xml_backend.iterparse(source, events=('start', 'end'))
 
 
 class JSONRequest(Request):
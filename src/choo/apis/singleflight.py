@@ -0,0 +1,79 @@
+import asyncio
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from threading import Lock
+
+from ..exceptions import DeadlineExceeded
+from .deadlines import get_deadline
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: while a call for a key is in flight, other callers with the same key
+    wait for it and get its result (or exception) instead of executing it again.
+
+    >>> flight = SingleFlight()
+    >>> flight.do(key, func, *args)
+
+    Coroutines are coalesced using ado():
+    >>> await flight.ado(key, func, *args)
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self._calls = {}
+        self._tasks = {}
+
+    def do(self, key, func, *args):
+        """
+        Call func(*args) unless a call for the same key is in flight. Returns its result in both cases.
+        Waiting for another call is limited by the active Deadline. If the other call exceeded its own (earlier)
+        deadline, the call is executed again.
+        """
+        while True:
+            with self._lock:
+                future = self._calls.get(key)
+                leader = future is None
+                if leader:
+                    future = self._calls[key] = Future()
+
+            if leader:
+                break
+
+            deadline = get_deadline()
+            try:
+                return future.result(timeout=None if deadline is None else deadline.remaining())
+            except FutureTimeoutError:
+                raise deadline.get_exception()
+            except DeadlineExceeded:
+                if deadline is not None and deadline.exceeded:
+                    raise
+
+        try:
+            result = func(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def ado(self, key, func, *args):
+        """
+        Like do(), but awaits the coroutine func(*args) unless a call for the same key is in flight in the current
+        event loop. The call runs in its own task, so cancelling one of its callers does not cancel it for the others.
+        """
+        task_key = (asyncio.get_event_loop(), key)
+        task = self._tasks.get(task_key)
+        if task is None:
+            task = self._tasks[task_key] = asyncio.ensure_future(func(*args))
+            task.add_done_callback(lambda task: self._tasks.pop(task_key, None))
+        return await asyncio.shield(task)
+
+    def __len__(self):
+        """
+        Get the number of calls in flight.
+        """
+        return len(self._calls) + len(self._tasks)
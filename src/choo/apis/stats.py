@@ -0,0 +1,150 @@
+from collections import deque
+from threading import Lock
+from time import perf_counter
+
+
+class TransferStats:
+    """
+    Counts the upstream requests of an API and the bytes they transferred.
+
+    compressed_bytes is the size of the response bodies as received (e.g. gzip compressed),
+    uncompressed_bytes their size after decompression.
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.compressed_bytes = 0
+            self.uncompressed_bytes = 0
+
+    def add(self, compressed_bytes, uncompressed_bytes):
+        with self._lock:
+            self.requests += 1
+            self.compressed_bytes += compressed_bytes
+            self.uncompressed_bytes += uncompressed_bytes
+
+    @property
+    def compression_ratio(self):
+        """
+        Get uncompressed_bytes/compressed_bytes or None if nothing was transferred yet.
+        """
+        return self.uncompressed_bytes/self.compressed_bytes if self.compressed_bytes else None
+
+    def __repr__(self):
+        return '<%s: %d requests, %d bytes compressed, %d bytes uncompressed>' % (
+            self.__class__.__name__, self.requests, self.compressed_bytes, self.uncompressed_bytes
+        )
+
+
+class LatencyStats:
+    """
+    Keeps the latencies (time until the response headers arrived) of the last size upstream requests to a host.
+    """
+    def __init__(self, size=200):
+        self._latencies = deque(maxlen=size)
+        self._lock = Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def percentile(self, percentile):
+        """
+        Get the given percentile (0-100) of the recent latencies or None if there are none.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies)-1, int(len(latencies)*percentile/100))]
+
+    def __len__(self):
+        return len(self._latencies)
+
+    def __repr__(self):
+        return '<%s: %d requests, median %s>' % (self.__class__.__name__, len(self), self.percentile(50))
+
+
+class ParserStats:
+    """
+    Records the calls of parser properties (parser_property and cached_property) per parser class and property:
+    how often they were called, the cumulative time they took and how many of them raised an exception.
+    The time of a property includes the time of the properties it accessed.
+
+    Recording is global and only active while the ParserStats is enabled:
+    >>> with ParserStats() as stats:
+    ...     list(vrr.platforms.where(coords=Coordinates(51.451137, 7.012941)))
+    >>> print(stats.table())
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._items = {}
+
+    def enable(self):
+        from .parsers import set_parser_stats
+        set_parser_stats(self)
+
+    def disable(self):
+        from .parsers import set_parser_stats
+        set_parser_stats(None)
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disable()
+
+    def measure(self, parser, name, func, *args, **kwargs):
+        """
+        Call func(*args, **kwargs) and record it as a call of the given property of the parser.
+        """
+        failed = True
+        start = perf_counter()
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            self.add('%s.%s' % (parser.__class__.__name__, name), perf_counter()-start, failed)
+
+    def add(self, key, seconds, failed=False):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                item = self._items[key] = [0, 0, 0]
+            item[0] += 1
+            item[1] += seconds
+            item[2] += failed
+
+    def items(self):
+        """
+        Get a list of (key, calls, seconds, exceptions) tuples, sorted by the cumulative time, descending.
+        The keys are 'ParserClass.property'.
+        """
+        with self._lock:
+            items = [(key, calls, seconds, exceptions) for key, (calls, seconds, exceptions) in self._items.items()]
+        return sorted(items, key=lambda item: item[2], reverse=True)
+
+    def table(self):
+        """
+        Get the recorded stats as a text table.
+        """
+        items = self.items()
+        width = max([len(item[0]) for item in items]+[8])
+        lines = ['%s %8s %10s %10s %10s' % ('property'.ljust(width), 'calls', 'total ms', 'µs/call', 'exceptions')]
+        for key, calls, seconds, exceptions in items:
+            lines.append('%s %8d %10.2f %10.2f %10d' % (key.ljust(width), calls, seconds*1000,
+                                                        seconds*1000000/calls, exceptions))
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return '<%s: %d properties, %d calls>' % (self.__class__.__name__, len(self._items),
+                                                  sum(item[0] for item in self._items.values()))
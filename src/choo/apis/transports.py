@@ -0,0 +1,512 @@
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict, deque
+from heapq import heappop, heappush
+from io import BytesIO
+from itertools import count
+from pprint import pprint
+from queue import Empty, Queue
+from threading import Condition, Lock, Thread
+from time import monotonic
+from urllib.parse import urlsplit
+
+import requests
+
+from ..exceptions import DeadlineExceeded
+from .cassettes import Cassette
+from .deadlines import get_deadline
+from .requests import request_fingerprint
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class Transport(ABC):
+    """
+    A Transport sends the requests of an API upstream and returns the raw response bodies.
+    Each API instance has a transport (API.transport), the default one is a LiveTransport.
+
+    Transports are below the response cache and request coalescing of Request._request().
+    If debug is True, requests are printed and the last response body is written to dump.xml.
+    If debug is None, it is enabled if the CHOO_DEBUG environment variable is set when the transport is created.
+    """
+    def __init__(self, debug=None):
+        self.debug = bool(os.environ.get('CHOO_DEBUG')) if debug is None else debug
+
+    @abstractmethod
+    def fetch(self, request, method, url, data=None, session=None, fingerprint=None):
+        """
+        Execute the HTTP request for the given Request and return the response body.
+        """
+        pass
+
+    @abstractmethod
+    def stream(self, request, method, url, data=None, session=None, fingerprint=None, on_complete=None):
+        """
+        Execute the HTTP request for the given Request and return a file-like object over the response body.
+        on_complete is called with the complete body once it was read.
+        """
+        pass
+
+    async def afetch(self, request, method, url, data=None, fingerprint=None):
+        """
+        Like fetch(), but a coroutine that does not block the event loop.
+        By default, fetch() is run in the API's executor (see API.run_async()).
+        """
+        return await request.api.run_async(self.fetch, request, method, url, data, None, fingerprint)
+
+    def _debug_request(self, method, url, data):
+        print('=== %s: %s ===' % (method, url))
+        if method == 'POST':
+            pprint(data)
+        print('='*70)
+
+    def _debug_response(self, body):
+        with open('dump.xml', 'wb') as f:
+            f.write(body if isinstance(body, bytes) else body.encode())
+
+
+class HedgeScheduler:
+    """
+    Calls functions in a new thread once their delay has passed, unless they were cancelled before.
+    All delays of a LiveTransport are awaited by one thread, so requests that are not hedged need no thread.
+    """
+    def __init__(self):
+        self._condition = Condition()
+        self._queue = []
+        self._counter = count()
+        self._thread = None
+
+    def schedule(self, delay, func):
+        """
+        Call func in a new thread after delay seconds. Returns an entry that can be passed to cancel().
+        """
+        entry = [monotonic()+delay, next(self._counter), func]
+        with self._condition:
+            heappush(self._queue, entry)
+            if self._thread is None:
+                self._thread = Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return entry
+
+    def cancel(self, entry):
+        if entry is None:
+            return
+        with self._condition:
+            entry[2] = None
+
+    def _run(self):
+        with self._condition:
+            while True:
+                while self._queue and self._queue[0][2] is None:
+                    heappop(self._queue)
+                if not self._queue:
+                    self._condition.wait()
+                    continue
+                wait = self._queue[0][0]-monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                Thread(target=heappop(self._queue)[2], daemon=True).start()
+
+
+class LiveTransport(Transport):
+    """
+    Sends requests to the upstream API using the API's session and UpstreamPolicy.
+    If the API has mirrors and the policy enables hedging, slow requests are hedged (see _hedge()).
+
+    If aiohttp is installed (pip install choo[async]), afetch() sends requests using the API's aiohttp session
+    (see API.get_async_session()) without blocking the event loop. Asynchronous requests are not hedged.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._hedge_scheduler = HedgeScheduler()
+
+    def fetch(self, request, method, url, data=None, session=None, fingerprint=None):
+        if self.debug:
+            self._debug_request(method, url, data)
+        return self._call(request, url, lambda url: self._fetch(request, method, url, data, session))
+
+    def stream(self, request, method, url, data=None, session=None, fingerprint=None, on_complete=None):
+        if self.debug:
+            self._debug_request(method, url, data)
+        return self._call(request, url, lambda url: self._fetch_stream(request, method, url, data, session,
+                                                                       on_complete))
+
+    async def afetch(self, request, method, url, data=None, fingerprint=None):
+        if aiohttp is None:
+            return await super().afetch(request, method, url, data, fingerprint)
+        if self.debug:
+            self._debug_request(method, url, data)
+        return await request.api.policy.acall(self._afetch, request, method, url, data, host=urlsplit(url).netloc)
+
+    def _call(self, request, url, func):
+        """
+        Call func(url) using the API's policy, hedged across the API's mirrors if it has any and hedging is enabled.
+        """
+        api = request.api
+        mirror_urls = api.get_mirror_urls(url)
+        delay = api.policy.get_hedge_delay(api.get_latency_stats(url)) if mirror_urls else None
+        if delay is None:
+            return api.policy.call(func, url, host=urlsplit(url).netloc)
+        return self._hedge(api.policy, func, (url, )+mirror_urls, delay)
+
+    def _hedge(self, policy, func, urls, delay):
+        """
+        Call func(url) for the first url in the current thread. Whenever there was no result for delay seconds
+        or a call failed, func(url) is called for the next url in a new thread. Returns the first result of the
+        current thread or, if its call failed, the first result of the other ones. Results that arrive later are
+        closed if they can be closed.
+
+        The call in the current thread can not be interrupted, so hedging mainly helps if it fails or times out:
+        the response of the next url is already on its way.
+        """
+        results = Queue()
+        lock = Lock()
+        deadline = get_deadline()
+        urls = deque(urls)
+        first_url = urls.popleft()
+        state = {'done': False, 'pending': 0, 'timer': None}
+
+        def call(url):
+            try:
+                if deadline is None:
+                    result = policy.call(func, url, host=urlsplit(url).netloc)
+                else:
+                    with deadline:
+                        result = policy.call(func, url, host=urlsplit(url).netloc)
+            except Exception as e:
+                results.put((None, e))
+                return
+            with lock:
+                if not state['done']:
+                    results.put((result, None))
+                    return
+            self._discard(result)
+
+        def next_url():
+            # get the next url to call and schedule the hedge after it, has to be called with the lock held
+            if state['done'] or not urls:
+                return None
+            state['pending'] += 1
+            self._hedge_scheduler.cancel(state['timer'])
+            state['timer'] = self._hedge_scheduler.schedule(delay, hedge) if len(urls) > 1 else None
+            return urls.popleft()
+
+        def hedge():
+            # called in a new thread by the scheduler
+            with lock:
+                url = next_url()
+            if url is not None:
+                call(url)
+
+        def finish():
+            with lock:
+                state['done'] = True
+                self._hedge_scheduler.cancel(state['timer'])
+            while not results.empty():
+                self._discard(results.get()[0])
+
+        state['timer'] = self._hedge_scheduler.schedule(delay, hedge)
+        try:
+            result = policy.call(func, first_url, host=urlsplit(first_url).netloc)
+        except DeadlineExceeded:
+            finish()
+            raise
+        except Exception as e:
+            error = e
+        else:
+            finish()
+            return result
+
+        while True:
+            # a call failed, so the next url is called right away
+            with lock:
+                url = next_url()
+                if url is None and not state['pending']:
+                    state['done'] = True
+                    raise error
+            if url is not None:
+                Thread(target=call, args=(url, ), daemon=True).start()
+
+            try:
+                result, e = results.get(timeout=None if deadline is None else deadline.remaining())
+            except Empty:
+                finish()
+                raise deadline.get_exception()
+            with lock:
+                state['pending'] -= 1
+            if e is None:
+                finish()
+                return result
+            error = e
+
+    def _discard(self, result):
+        if hasattr(result, 'close'):
+            result.close()
+
+    def _send(self, request, method, url, data, session, stream=False):
+        if session is None:
+            session = request.api.session
+
+        timeout = request.api.policy.get_timeout()
+        start = monotonic()
+        if method == 'POST':
+            result = session.post(url, data, timeout=timeout, stream=stream)
+        elif method == 'GET':
+            result = session.get(url, params=data, timeout=timeout, stream=stream)
+        request.api.get_latency_stats(url).add(monotonic() - start)
+        result.raise_for_status()
+        return result
+
+    def _fetch(self, request, method, url, data, session):
+        """
+        Send the HTTP request upstream and return the response body as bytes.
+        Raises requests.HTTPError for error responses, so they never get cached or parsed.
+        """
+        result = self._send(request, method, url, data, session)
+        body = result.content
+        self._count_transfer(request, result, body)
+        return body
+
+    async def _afetch(self, request, method, url, data):
+        """
+        Send the HTTP request upstream using aiohttp and return the response body as bytes.
+        Errors are raised as the same requests exceptions as by _fetch(), so the policy can handle them.
+        """
+        timeout = request.api.policy.get_timeout()
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        items = data.items() if isinstance(data, dict) else (data or ())
+        data = [(str(name), str(value)) for name, value in items if value is not None]
+        start = monotonic()
+        try:
+            async with request.api.get_async_session().request(
+                    method, url, data=data if method == 'POST' else None, params=data if method == 'GET' else None,
+                    timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)) as result:
+                if result.status >= 400:
+                    response = requests.Response()
+                    response.status_code, response.reason, response.url = result.status, result.reason, url
+                    response.raise_for_status()
+                body = await result.read()
+        except asyncio.TimeoutError as e:
+            raise requests.Timeout(str(e) or 'Request timed out.') from e
+        except aiohttp.ClientError as e:
+            raise requests.ConnectionError(str(e)) from e
+        request.api.get_latency_stats(url).add(monotonic() - start)
+        self._add_transfer(request, int(result.headers.get('Content-Length') or len(body)), body)
+        return body
+
+    def _fetch_stream(self, request, method, url, data, session, on_complete):
+        """
+        Send the HTTP request upstream and return a StreamedResponse.
+        """
+        result = self._send(request, method, url, data, session, stream=True)
+
+        def complete(body):
+            self._count_transfer(request, result, body)
+            if on_complete is not None:
+                on_complete(body)
+        return StreamedResponse(result, complete)
+
+    def _count_transfer(self, request, result, body):
+        """
+        Add the compressed and uncompressed size of a response body to the API's transfer stats.
+        """
+        compressed = result.raw.tell() if result.raw is not None else 0
+        if not compressed:
+            compressed = int(result.headers.get('Content-Length') or len(body))
+        self._add_transfer(request, compressed, body)
+
+    def _add_transfer(self, request, compressed, body):
+        request.compressed_size = compressed
+        request.uncompressed_size = len(body)
+        request.api.transfer_stats.add(compressed, len(body))
+        if self.debug:
+            self._debug_response(body)
+
+
+class RecordingTransport(Transport):
+    """
+    Passes requests to another transport (a new LiveTransport by default) and records them with their responses.
+
+    The recordings are dicts with the keys method, url, data (only for POST requests) and result (the response body
+    decoded to a string), which is the format ReplayTransport expects. If cassette is a CassetteWriter, they are
+    written to it. Otherwise, they are appended to requests_dump.
+    """
+    def __init__(self, transport=None, requests_dump=None, cassette=None, **kwargs):
+        super().__init__(**kwargs)
+        self.transport = transport if transport is not None else LiveTransport(debug=self.debug)
+        self.requests_dump = requests_dump if requests_dump is not None else []
+        self.cassette = cassette
+        self._lock = Lock()
+
+    def fetch(self, request, method, url, data=None, session=None, fingerprint=None):
+        body = self.transport.fetch(request, method, url, data, session, fingerprint)
+        self._record(request, method, url, data, body)
+        return body
+
+    async def afetch(self, request, method, url, data=None, fingerprint=None):
+        body = await self.transport.afetch(request, method, url, data, fingerprint)
+        self._record(request, method, url, data, body)
+        return body
+
+    def stream(self, request, method, url, data=None, session=None, fingerprint=None, on_complete=None):
+        def complete(body):
+            self._record(request, method, url, data, body)
+            if on_complete is not None:
+                on_complete(body)
+        return self.transport.stream(request, method, url, data, session, fingerprint, complete)
+
+    def _record(self, request, method, url, data, body):
+        dump = OrderedDict((
+            ('method', method),
+            ('url', url),
+        ))
+        if method == 'POST':
+            dump['data'] = data
+        dump['result'] = request._decode_result(body)
+        if self.cassette is not None:
+            self.cassette.write(dump)
+            return
+        with self._lock:
+            self.requests_dump.append(dump)
+
+
+class ReplayTransport(Transport):
+    """
+    Answers requests from recordings (see RecordingTransport) instead of sending them upstream.
+    requests_dump can be a list of recordings or a Cassette.
+
+    Recordings are indexed by their request fingerprint, so finding a response does not depend on the number
+    of recordings. Each recording is used once, in the order they were recorded. If repeat is True, recordings are
+    used again and again instead, e.g. to replay recorded traffic in load tests.
+    If ordered is True, the recordings are used in the order they were recorded, regardless of the request.
+    If there is no recording for a request, AssertionError is raised.
+
+    If passthrough is a transport, the matching recording is still consumed, but the response is fetched
+    using passthrough, e.g. to check whether recorded tests still work with the live API.
+    """
+    def __init__(self, requests_dump, ordered=False, repeat=False, passthrough=None, **kwargs):
+        super().__init__(**kwargs)
+        self.ordered = ordered
+        self.repeat = repeat
+        self.passthrough = passthrough
+        self._lock = Lock()
+
+        # recordings are either recording dicts or (offset, length) tuples of recordings in the cassette
+        if isinstance(requests_dump, Cassette):
+            self._cassette = requests_dump
+            self._recordings = deque((offset, length) for fingerprint, offset, length in requests_dump.index)
+            if not ordered:
+                self._recordings_by_fingerprint = {key: deque(positions) for key, positions
+                                                   in requests_dump.get_positions_by_fingerprint().items()}
+        else:
+            self._cassette = None
+            self._recordings = deque(requests_dump)
+            if not ordered:
+                self._recordings_by_fingerprint = defaultdict(deque)
+                for recording in self._recordings:
+                    key = request_fingerprint(recording['method'], recording['url'], recording.get('data'))
+                    self._recordings_by_fingerprint[key].append(recording)
+
+    def __len__(self):
+        """
+        Get the number of recordings that were not used yet.
+        """
+        if self.ordered:
+            return len(self._recordings)
+        return sum(len(recordings) for recordings in self._recordings_by_fingerprint.values())
+
+    def _replay(self, method, url, data, fingerprint):
+        if self.debug:
+            self._debug_request(method, url, data)
+
+        with self._lock:
+            if self.ordered:
+                recordings = self._recordings
+                if not recordings:
+                    raise AssertionError('No recordings left: %s %s %s' % (method, url, repr(data)))
+            else:
+                if fingerprint is None:
+                    fingerprint = request_fingerprint(method, url, data)
+                recordings = self._recordings_by_fingerprint.get(fingerprint)
+                if not recordings:
+                    raise AssertionError('Request not found in dump: %s %s %s' % (method, url, repr(data)))
+
+            recording = recordings.popleft()
+            if self.repeat:
+                recordings.append(recording)
+
+        if self._cassette is not None:
+            recording = self._cassette.read(*recording)
+        return recording['result']
+
+    def fetch(self, request, method, url, data=None, session=None, fingerprint=None):
+        body = self._replay(method, url, data, fingerprint)
+        if self.passthrough is not None:
+            return self.passthrough.fetch(request, method, url, data, session, fingerprint)
+        return body
+
+    async def afetch(self, request, method, url, data=None, fingerprint=None):
+        body = self._replay(method, url, data, fingerprint)
+        if self.passthrough is not None:
+            return await self.passthrough.afetch(request, method, url, data, fingerprint)
+        return body
+
+    def stream(self, request, method, url, data=None, session=None, fingerprint=None, on_complete=None):
+        body = self._replay(method, url, data, fingerprint)
+        if self.passthrough is not None:
+            return self.passthrough.stream(request, method, url, data, session, fingerprint, on_complete)
+        if on_complete is not None:
+            on_complete(body)
+        return BytesIO(request._encode_result(body))
+
+
+class StreamedResponse:
+    """
+    A file-like object over the body of a streamed requests.Response.
+    Once the body was read completely, the connection is released and on_complete is called with the body.
+    If it is closed before, the connection is closed and on_complete is not called.
+    The body is decompressed if needed.
+    """
+    chunk_size = 64*1024
+
+    def __init__(self, response, on_complete=None):
+        self.response = response
+        self.on_complete = on_complete
+        self._chunks = []
+        self._iterator = response.iter_content(self.chunk_size)
+        self._buffer = b''
+        self._done = False
+
+    def read(self, size=-1):
+        """
+        Read up to size bytes, or the rest of the body if size is negative or None.
+        """
+        while not self._done and (size is None or size < 0 or len(self._buffer) < size):
+            chunk = next(self._iterator, b'')
+            if not chunk:
+                self._complete()
+                break
+            self._chunks.append(chunk)
+            self._buffer += chunk
+
+        if size is None or size < 0:
+            size = len(self._buffer)
+        result, self._buffer = self._buffer[:size], self._buffer[size:]
+        return result
+
+    def _complete(self):
+        self._done = True
+        self.response.close()
+        if self.on_complete is not None:
+            self.on_complete(b''.join(self._chunks))
+
+    def close(self):
+        self._done = True
+        self._buffer = b''
+        self.response.close()
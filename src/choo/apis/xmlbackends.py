@@ -0,0 +1,147 @@
+import re
+from abc import ABC, abstractmethod
+
+import defusedxml.ElementTree as ET
+from defusedxml import EntitiesForbidden
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover
+    etree = None
+
+_xml_declaration = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+
+class XMLBackend(ABC):
+    """
+    Parses and serializes the XML of API responses. Each API instance has one (API.xml_backend).
+
+    The default is ElementTreeBackend. If lxml is installed, LXMLBackend can be used instead:
+    >>> vrr = EFA(name='vrr', base_url='http://efa.vrr.de/standard/', preset='de', xml_backend=LXMLBackend())
+    Parsers have to work with the elements of all backends, so they should only use the ElementTree API
+    (find, findall, findtext, iterfind, attrib, text, tag) or XPath.
+    """
+    name = None
+
+    @abstractmethod
+    def fromstring(self, data):
+        """
+        Parse a document (bytes or str) and return its root element.
+        """
+        pass
+
+    @abstractmethod
+    def iterparse(self, source, events=('start', 'end')):
+        """
+        Parse XML incrementally from a file-like object. Yields (event, element) tuples.
+        """
+        pass
+
+    @abstractmethod
+    def tostring(self, element):
+        """
+        Serialize an element to a str without XML declaration.
+        """
+        pass
+
+
+class ElementTreeBackend(XMLBackend):
+    """
+    Parses XML using defusedxml.ElementTree, which rejects entity declarations and external references.
+    """
+    name = 'etree'
+
+    def fromstring(self, data):
+        return ET.fromstring(data)
+
+    def iterparse(self, source, events=('start', 'end')):
+        return ET.iterparse(source, events=events)
+
+    def tostring(self, element):
+        return ET.tostring(element, 'unicode')
+
+
+class LXMLBackend(XMLBackend):
+    """
+    Parses XML using lxml, which is considerably faster than ElementTree and supports precompiled XPath expressions.
+
+    Like defusedxml, it rejects entity declarations and never resolves entities, loads DTDs or accesses the network.
+    Documents that need more than libxml2's default limits (huge_tree) are rejected.
+    """
+    name = 'lxml'
+
+    def __init__(self):
+        if etree is None:
+            raise ImportError('LXMLBackend needs lxml to be installed.')
+        self.parser_options = {'resolve_entities': False, 'load_dtd': False, 'no_network': True, 'huge_tree': False}
+        self.parser = etree.XMLParser(**self.parser_options)
+
+    def fromstring(self, data):
+        if isinstance(data, str):
+            # lxml does not accept str with an encoding declaration
+            data = _xml_declaration.sub('', data, count=1)
+        root = etree.fromstring(data, self.parser)
+        self._check_docinfo(root.getroottree().docinfo)
+        return root
+
+    def iterparse(self, source, events=('start', 'end')):
+        for event, element in etree.iterparse(source, events=events, **self.parser_options):
+            if event == 'start' and element.getparent() is None:
+                self._check_docinfo(element.getroottree().docinfo)
+            yield event, element
+
+    def _check_docinfo(self, docinfo):
+        dtd = docinfo.internalDTD
+        if dtd is None:
+            return
+        for entity in dtd.iterentities():
+            raise EntitiesForbidden(entity.name, entity.content, None, entity.system_url, None, None)
+
+    def tostring(self, element):
+        return etree.tostring(element, encoding='unicode', with_tail=False)
+
+
+class XPath:
+    """
+    A precompiled path expression in ElementPath syntax (a subset of XPath) that works with the elements of all
+    XML backends. For lxml elements, a compiled lxml XPath expression is used.
+
+    Parsers use them as class attributes, so each expression is only compiled once:
+    >>> class CoordInfoGeoPoint(EFA.Parser, GeoPoint.XMLParser):
+    ...     _coords_xpath = XPath('./itdPathCoordinates/itdCoordinateBaseElemList/itdCoordinateBaseElem')
+    """
+    def __init__(self, path):
+        self.path = path
+        self._xpath = etree.XPath(path) if etree is not None else None
+
+    def findall(self, element):
+        if self._xpath is not None and isinstance(element, etree._Element):
+            return self._xpath(element)
+        return element.findall(self.path)
+
+    def find(self, element):
+        if self._xpath is not None and isinstance(element, etree._Element):
+            result = self._xpath(element)
+            return result[0] if result else None
+        return element.find(self.path)
+
+    def findtext(self, element, default=None):
+        result = self.find(element)
+        if result is None:
+            return default
+        return result.text or ''
+
+    def __repr__(self):
+        return 'XPath(%s)' % repr(self.path)
+
+
+default_backend = ElementTreeBackend()
+
+
+def tostring(element):
+    """
+    Serialize an element of any XML backend to a str without XML declaration.
+    """
+    if etree is not None and isinstance(element, etree._Element):
+        return etree.tostring(element, encoding='unicode', with_tail=False)
+    return default_backend.tostring(element)
@@ -1,3 +1,5 @@
 from .default import DefaultCache
+from .interning import InternPool
+from .responses import ResponseCache
 
-__all__ = ['DefaultCache']
+__all__ = ['DefaultCache', 'InternPool', 'ResponseCache']
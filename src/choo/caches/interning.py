@@ -0,0 +1,109 @@
+from collections import OrderedDict
+from threading import Lock
+
+from ..models.base import Model
+from ..models.sourced import LazySourcedModelMixin, SourcedModelMixin
+from ..types import IDs
+
+
+class InternPool:
+    """
+    A pool of Model.Sourced instances that makes structurally identical ones share one instance (hash-consing),
+    e.g. the City.Sourced of Essen that is part of every stop in Essen.
+
+    Instances are pooled by their model, source and field values. Sub-models are interned first, so they are
+    compared by identity. Up to maxsize instances are kept, the least recently used ones are dropped first.
+
+    If an API has an intern_pool, all Model.Sourced instances created from its parsers are interned:
+    >>> vrr.intern_pool = InternPool()
+    """
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._keys_by_id = {}
+        self._field_kinds = {}
+        self._lock = Lock()
+
+    def intern(self, obj):
+        """
+        Get the pooled instance that is equal to the given Model.Sourced and add it to the pool if there is none.
+        Objects that are not Model.Sourced instances (or lazy ones) and objects with values that can not be
+        hashed are returned unchanged.
+        """
+        kinds = self._get_field_kinds(obj.__class__)
+        if kinds is None:
+            return obj
+
+        values = list(obj)
+        key = [obj.Model]
+        changed = False
+        for i, kind in enumerate(kinds):
+            value = values[i]
+            if value is None or kind is None:
+                key.append(value)
+            elif kind is Model:
+                # sub-models are usually interned already, e.g. if they were created from a parser
+                interned = value if id(value) in self._keys_by_id else self.intern(value)
+                if interned is not value:
+                    changed = True
+                    values[i] = interned
+                key.append(id(interned))
+            else:
+                key.append(frozenset(value.items()))
+        key = tuple(key)
+
+        try:
+            hash(key)
+        except TypeError:
+            return obj
+
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item
+            self.misses += 1
+
+        if changed:
+            # the pooled instance references the pooled sub-models, which keeps their ids in the key valid
+            obj = obj.Model.Sourced(values[0], **dict(zip(obj._nonproxy_fields, values[1:])))
+
+        with self._lock:
+            obj = self._items.setdefault(key, obj)
+            self._keys_by_id[id(obj)] = key
+            while len(self._items) > self.maxsize:
+                del self._keys_by_id[id(self._items.popitem(last=False)[1])]
+        return obj
+
+    def _get_field_kinds(self, cls):
+        """
+        Get the kind of the source and each field of a Model.Sourced class: Model for sub-models, IDs for ids and
+        None for all other values. Returns None for other classes (including Model.LazySourced).
+        """
+        try:
+            return self._field_kinds[cls]
+        except KeyError:
+            pass
+        kinds = None
+        if issubclass(cls, SourcedModelMixin) and not issubclass(cls, LazySourcedModelMixin):
+            kinds = (None, )+tuple(
+                Model if issubclass(field.type, Model) else (IDs if issubclass(field.type, IDs) else None)
+                for field in cls._nonproxy_fields.values()
+            )
+        self._field_kinds[cls] = kinds
+        return kinds
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._keys_by_id.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return '<%s: %d objects, %d hits, %d misses>' % (self.__class__.__name__, len(self), self.hits, self.misses)
@@ -0,0 +1,133 @@
+import os
+from collections import OrderedDict
+from threading import Lock, get_ident
+from time import time
+
+
+class CachedResponse:
+    """
+    A cached response body (bytes). The data attribute holds the parsed body once it was parsed.
+    """
+    __slots__ = ('body', 'expires', 'data')
+
+    def __init__(self, body, expires, data=None):
+        self.body = body
+        self.expires = expires
+        self.data = data
+
+
+class ResponseCache:
+    """
+    A cache for raw API responses, keyed on request fingerprints (see choo.apis.requests.request_fingerprint).
+
+    Responses are kept in an in-memory LRU tier of up to maxsize entries. If directory is given,
+    they are also stored on disk, so they survive a restart and are shared between processes.
+
+    The time to live depends on the endpoint. ttls maps endpoints to seconds, endpoints not in ttls fall back
+    to the API's default TTLs (API.response_ttls) and then to default_ttl. A TTL of 0 disables caching.
+
+    >>> vrr.response_cache = ResponseCache(ttls={'XML_COORD_REQUEST': 60}, directory='/tmp/choo')
+    """
+    def __init__(self, ttls=None, default_ttl=60, maxsize=1000, directory=None):
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.maxsize = maxsize
+        self.directory = directory
+        self._items = OrderedDict()
+        self._lock = Lock()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get_ttl(self, endpoint, api_ttls=None):
+        """
+        Get the time to live in seconds for responses of the given endpoint.
+        """
+        if endpoint in self.ttls:
+            return self.ttls[endpoint]
+        if api_ttls and endpoint in api_ttls:
+            return api_ttls[endpoint]
+        return self.default_ttl
+
+    def get(self, key):
+        """
+        Get the CachedResponse for the given key or None if there is no valid one.
+        """
+        now = time()
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                if item.expires > now:
+                    self._items.move_to_end(key)
+                    return item
+                del self._items[key]
+
+        if self.directory is None:
+            return None
+
+        item = self._read(key, now)
+        if item is not None:
+            self._remember(key, item)
+        return item
+
+    def set(self, key, body, ttl, data=None):
+        """
+        Cache the response body for ttl seconds. Returns the CachedResponse or None if ttl is 0.
+        """
+        if not ttl:
+            return None
+        item = CachedResponse(body, time()+ttl, data)
+        self._remember(key, item)
+        if self.directory is not None:
+            self._write(key, item)
+        return item
+
+    def clear(self):
+        """
+        Remove all cached responses from memory and disk.
+        """
+        with self._lock:
+            self._items.clear()
+        if self.directory is not None:
+            for filename in os.listdir(self.directory):
+                if filename.endswith('.response'):
+                    os.remove(os.path.join(self.directory, filename))
+
+    def __len__(self):
+        return len(self._items)
+
+    def _remember(self, key, item):
+        with self._lock:
+            self._items[key] = item
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def _get_filename(self, key):
+        return os.path.join(self.directory, key+'.response')
+
+    def _read(self, key, now):
+        filename = self._get_filename(key)
+        try:
+            with open(filename, 'rb') as f:
+                expires = float(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+
+        if expires <= now:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+            return None
+        return CachedResponse(body, expires)
+
+    def _write(self, key, item):
+        # write to a temporary file first so concurrent readers never see partial responses
+        filename = self._get_filename(key)
+        tmp_filename = '%s.%d.%d.tmp' % (filename, os.getpid(), get_ident())
+        with open(tmp_filename, 'wb') as f:
+            f.write(('%f\n' % item.expires).encode())
+            f.write(item.body)
+        os.replace(tmp_filename, filename)
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+A local stand-in for an EFA server that answers XML_STOPFINDER_REQUEST and XML_COORD_REQUEST, e.g. to benchmark
+choo end to end without sending requests to real EFA servers.
+
+Responses are taken from recordings (see RecordingTransport) or generated, with configurable latency, jitter
+and error rate:
+>>> server = StandInServer(('127.0.0.1', 0), [SyntheticResponses(size=50)], latency=0.05, jitter=0.02)
+>>> server.start()
+>>> api = EFA(name='standin', base_url=server.base_url, preset='de')
+"""
+import argparse
+import ast
+import gzip
+import json
+import random
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from itertools import cycle
+from math import cos, radians
+from socketserver import ThreadingMixIn
+from threading import Lock, Thread
+from time import sleep
+from urllib.parse import parse_qsl, urlsplit
+
+from . import __version__
+from .apis.cassettes import Cassette
+from .apis.requests import XMLRequest, request_fingerprint
+
+
+def load_recordings(path):
+    """
+    Load recordings from a cassette, a JSON file containing a list of recordings or a test module created by
+    create_test.py (all requests_dump lists in it are loaded).
+    """
+    with open(path, 'rb') as f:
+        magic = f.read(2)
+
+    if magic == b'\x1f\x8b':
+        with Cassette(path) as cassette:
+            return list(cassette)
+
+    with open(path, encoding='utf-8') as f:
+        content = f.read()
+
+    if not path.endswith('.py'):
+        return json.loads(content)
+
+    recordings = []
+    for node in ast.walk(ast.parse(content)):
+        if isinstance(node, ast.Assign) and any(getattr(target, 'id', None) == 'requests_dump'
+                                                for target in node.targets):
+            recordings.extend(ast.literal_eval(node.value))
+    return recordings
+
+
+class RecordedResponses:
+    """
+    Answers requests with recorded responses, matched by endpoint and request data.
+    If there is no recording for a request and strict is False, the recordings of the endpoint are used in turn.
+    """
+    def __init__(self, recordings, strict=False):
+        self.strict = strict
+        self._by_fingerprint = {}
+        by_endpoint = defaultdict(list)
+        for recording in recordings:
+            endpoint = recording['url'].rsplit('/', 1)[-1]
+            body = XMLRequest._encode_result(recording['result'])
+            self._by_fingerprint[request_fingerprint(recording['method'], endpoint, recording.get('data'))] = body
+            by_endpoint[endpoint].append(body)
+        self._by_endpoint = {endpoint: cycle(bodies) for endpoint, bodies in by_endpoint.items()}
+        self._lock = Lock()
+
+    def get(self, method, endpoint, data):
+        """
+        Get the response body for the given request or None.
+        """
+        body = self._by_fingerprint.get(request_fingerprint(method, endpoint, data))
+        if body is not None or self.strict or endpoint not in self._by_endpoint:
+            return body
+        with self._lock:
+            return next(self._by_endpoint[endpoint])
+
+
+class SyntheticResponses:
+    """
+    Answers requests with generated responses that contain size results (or less if the request has a limit).
+    The same request always gets the same response for the same seed.
+    """
+    city = {'omc': '5113000', 'placeID': '18', 'locality': 'Essen'}
+
+    def __init__(self, size=10, seed=0):
+        self.size = size
+        self.seed = seed
+
+    def get(self, method, endpoint, data):
+        """
+        Get the response body for the given request or None.
+        """
+        rand = random.Random('%s:%s' % (self.seed, request_fingerprint(method, endpoint, data)))
+        if endpoint == 'XML_STOPFINDER_REQUEST':
+            return self._stopfinder(rand, data)
+        if endpoint == 'XML_COORD_REQUEST':
+            return self._coord(rand, data)
+        return None
+
+    def _request_element(self):
+        return ET.Element('itdRequest', version='10.0.43.44', language='de',
+                          now=datetime.now().strftime('%Y-%m-%dT%H:%M:%S'))
+
+    def _encode(self, root):
+        return ET.tostring(root, encoding='ISO-8859-1')
+
+    def _stopfinder(self, rand, data):
+        size = min(self.size, int(data.get('anyMaxSizeHitList') or self.size))
+        name = data.get('name_sf', '')
+
+        root = self._request_element()
+        odv = ET.SubElement(ET.SubElement(root, 'itdStopFinderRequest', requestID='0'), 'itdOdv',
+                            type=data.get('type_sf', 'any'), usage='sf')
+        ET.SubElement(odv, 'itdOdvPlace', state='empty')
+        odv_name = ET.SubElement(odv, 'itdOdvName', state='identified' if size == 1 else 'list')
+        for i in range(size):
+            stop_id = str(20000000 + rand.randrange(100000))
+            elem = ET.SubElement(odv_name, 'odvNameElem', x=str(rand.randint(6900000, 7100000)),
+                                 y=str(rand.randint(51400000, 51500000)), mapName='WGS84', id=stop_id,
+                                 anyType='stop', objectName='%s %d' % (name, i) if i else name, stateless=stop_id,
+                                 gid='de:5113:%s' % stop_id[-5:], matchQuality=str(1000-i), **self.city)
+            elem.text = '%s, %s' % (self.city['locality'], elem.attrib['objectName'])
+        return self._encode(root)
+
+    def _coord(self, rand, data):
+        lon, lat = (float(value) for value in data.get('coord', '7.0:51.45:WGS84').split(':')[:2])
+        limit = int(data.get('max') or 0)
+
+        root = self._request_element()
+        items = ET.SubElement(ET.SubElement(ET.SubElement(root, 'itdCoordInfoRequest', requestID='0'),
+                                            'itdCoordInfo'), 'coordInfoItemList')
+        i = 1
+        while 'type_%d' % i in data:
+            type_, radius = data['type_%d' % i], int(data.get('radius_%d' % i, 1000))
+            for j in range(self.size):
+                if limit and len(items) >= limit:
+                    break
+                items.append(self._coord_item(rand, type_, lon, lat, radius))
+            i += 1
+        return self._encode(root)
+
+    def _coord_item(self, rand, type_, lon, lat, radius):
+        distance = rand.uniform(0, radius)
+        dx, dy = rand.uniform(-1, 1), rand.uniform(-1, 1)
+        scale = distance / max((dx**2 + dy**2)**0.5, 0.001)
+        x = int((lon + dx*scale / (111320 * cos(radians(lat)))) * 1000000)
+        y = int((lat + dy*scale / 111320) * 1000000)
+
+        stop_id = str(20000000 + rand.randrange(100000))
+        ifopt = 'de:5113:%s' % stop_id[-5:]
+        attrs = {'STOP_GLOBAL_ID': ifopt}
+        if type_ == 'BUS_POINT':
+            platform = rand.randint(1, 9)
+            item_id = '%s-%d-%d' % (stop_id, rand.randint(1, 3), platform)
+            attrs.update({
+                'STOP_POINT_LONGNAME': '',
+                'STOP_POINT_CHARACTERISTICS': rand.choice(('Bay', 'Platform')),
+                'STOP_AREA_NAME': '',
+                'STOPPOINT_GLOBAL_ID': '%s:%s' % (ifopt, item_id.split('-', 1)[1].replace('-', ':')),
+                'IDENTIFIER': str(platform),
+            })
+        elif type_ in ('POI_POINT', 'POI_AREA'):
+            item_id = str(rand.randrange(1000000))
+            attrs = {'POI_HIERARCHY_KEY': rand.choice(('A', 'B', 'F', 'K', 'U'))}
+        else:
+            item_id = stop_id
+
+        item = ET.Element('coordInfoItem', type=type_, id=item_id, name='Synthetic %s' % item_id,
+                          distance=str(int(distance)), stateless=item_id, **self.city)
+        coordinates = ET.SubElement(item, 'itdPathCoordinates')
+        ET.SubElement(coordinates, 'coordEllipsoid').text = 'WGS84'
+        ET.SubElement(coordinates, 'coordType').text = 'GEO_DECIMAL'
+        base_elem = ET.SubElement(ET.SubElement(coordinates, 'itdCoordinateBaseElemList'), 'itdCoordinateBaseElem')
+        ET.SubElement(base_elem, 'x').text = str(x)
+        ET.SubElement(base_elem, 'y').text = str(y)
+        attr_list = ET.SubElement(item, 'genAttrList')
+        for name, value in attrs.items():
+            attr_elem = ET.SubElement(attr_list, 'genAttrElem')
+            ET.SubElement(attr_elem, 'name').text = name
+            ET.SubElement(attr_elem, 'value').text = value
+        return item
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'choo-efaserver/%s' % __version__
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        self._respond('GET', url.path, dict(parse_qsl(url.query)))
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self._respond('POST', urlsplit(self.path).path, dict(parse_qsl(body.decode('iso-8859-1'))))
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _respond(self, method, path, data):
+        server = self.server
+        delay = server.latency + server.random.uniform(-server.jitter, server.jitter)
+        if delay > 0:
+            sleep(delay)
+
+        if server.error_rate and server.random.random() < server.error_rate:
+            self.send_error(503, 'Simulated error')
+            return
+
+        endpoint = path.rsplit('/', 1)[-1]
+        body = None
+        for source in server.sources:
+            body = source.get(method, endpoint, data)
+            if body is not None:
+                break
+        if body is None:
+            self.send_error(404, 'No response for this request')
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml')
+        if 'gzip' in (s.strip() for s in self.headers.get('Accept-Encoding', '').split(',')):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    """
+    A multithreaded stand-in EFA server. sources are tried in order to answer a request.
+
+    Each request is delayed by latency ± jitter seconds. error_rate is the fraction of requests that
+    are answered with 503 Service Unavailable.
+    """
+    daemon_threads = True
+
+    def __init__(self, address, sources, latency=0, jitter=0, error_rate=0, verbose=False):
+        super().__init__(address, StandInHandler)
+        self.sources = sources
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.verbose = verbose
+        self.random = random.Random()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """
+        The base_url to use for an EFA instance using this server.
+        """
+        return 'http://%s:%d/standard/' % self.server_address[:2]
+
+    def start(self):
+        """
+        Serve requests in a background thread.
+        """
+        self._thread = Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='choo-efa-server', description='local stand-in for an EFA server')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='set address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=0, help='set tcp port (default: random unused port)')
+    parser.add_argument('--recordings', action='append', default=[], metavar='PATH',
+                        help='serve recordings from a cassette, JSON file or recorded test module (repeatable)')
+    parser.add_argument('--strict', action='store_true', help='only use recordings that match the request exactly')
+    parser.add_argument('--synthetic', action='store_true',
+                        help='generate responses (default if there are no recordings, else used as a fallback)')
+    parser.add_argument('--size', type=int, default=10, help='number of generated results (default: 10)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for generated responses (default: 0)')
+    parser.add_argument('--latency', type=float, default=0, help='latency in seconds (default: 0)')
+    parser.add_argument('--jitter', type=float, default=0, help='random latency variation in seconds (default: 0)')
+    parser.add_argument('--error-rate', type=float, default=0, help='fraction of 503 responses (default: 0)')
+    parser.add_argument('--verbose', action='store_true', help='log requests')
+    args = parser.parse_args()
+
+    sources = []
+    if args.recordings:
+        recordings = []
+        for path in args.recordings:
+            recordings.extend(load_recordings(path))
+        sources.append(RecordedResponses(recordings, strict=args.strict))
+    if args.synthetic or not sources:
+        sources.append(SyntheticResponses(size=args.size, seed=args.seed))
+
+    server = StandInServer((args.host, args.port), sources, latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, verbose=args.verbose)
+    print('Starting stand-in EFA server, base_url: %s' % server.base_url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,23 @@
 class ObjectNotFound(Exception):
     pass
+
+
+class UpstreamError(Exception):
+    """
+    Raised if the upstream API can not be reached.
+    """
+    pass
+
+
+class CircuitOpenError(UpstreamError):
+    """
+    Raised instead of sending a request while the upstream API is considered to be down.
+    """
+    pass
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised if a query (or a request) did not finish before its deadline, see Query.timeout().
+    """
+    pass
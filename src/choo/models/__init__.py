@@ -1,8 +1,9 @@
 from .base import Model
+from .index import IDIndex
 from .locations import City, GeoPoint, Location, Platform, StopArea, Address, Addressable, Stop, POI
 from .ride import Ride, MetaRide, Line, RidePoint
 from .trip import Trip, Way
 
 
-__all__ = ['Model', 'GeoPoint', 'Location', 'Platform', 'City', 'Address', 'Addressable',
+__all__ = ['Model', 'IDIndex', 'GeoPoint', 'Location', 'Platform', 'City', 'Address', 'Addressable',
            'Stop', 'StopArea', 'POI', 'Ride', 'MetaRide', 'Line', 'RidePoint', 'Trip', 'Way']
@@ -98,6 +98,41 @@ class Field:
             value = FrozenIDs(value)
         return value
 
+    def get_immutable_converter(self):
+        """
+        Get a function (value, default_source) that does the same as get_immutable(value, default_source).
+        The checks that only depend on the field are resolved once, used by Model.Sourced constructors.
+        """
+        type_, name = self.type, self.name
+
+        def invalid():
+            return TypeError('Invalid type for attribute %s.' % name)
+
+        if issubclass(type_, Model):
+            def convert(value, default_source):
+                if value is None:
+                    return None
+                if not isinstance(value, type_):
+                    raise invalid()
+                if isinstance(value, Parser):
+                    return value.sourced()
+                if not isinstance(value, tuple):
+                    return value._sourced(default_source)
+                return value
+        elif type_ is IDs:
+            def convert(value, default_source):
+                if value is None:
+                    return FrozenIDs()
+                if not isinstance(value, IDs):
+                    raise invalid()
+                return value if isinstance(value, FrozenIDs) else FrozenIDs(value)
+        else:
+            def convert(value, default_source):
+                if value is not None and not isinstance(value, type_):
+                    raise invalid()
+                return value
+        return convert
+
     def get_mutable(self, value):
         value = self.getdefault(value)
         if issubclass(self.type, Model):
@@ -110,10 +145,10 @@ class Field:
     def __get__(self, obj, cls):
         if obj is None:
             return self
-        return obj._data.get(self.name)
+        return getattr(obj._data, self.name, None)
 
     def __set__(self, obj, value):
-        obj._data[self.name] = self.get_mutable(value)
+        setattr(obj._data, self.name, self.get_mutable(value))
 
 
 class ProxyField:
@@ -178,14 +213,19 @@ class MetaModel(ABCMeta):
 
         cls._fields = fields
         cls._nonproxy_fields = OrderedDict((n, v) for n, v in fields.items() if isinstance(v, Field))
+        names = tuple(cls._nonproxy_fields.keys())
+        cls._Data = type('_Data', (ModelData, ), {'__slots__': names, '_names': names, '__module__': cls.__module__,
+                                                  '__qualname__': cls.__qualname__+'._Data'})
 
         cls.NotFound = type('NotFound', (ObjectNotFound, ), {'__module__': attrs['__module__']})
 
         if mcs.__module__ != attrs['__module__'] and not issubclass(cls, Parser):
-            from .sourced import SourcedModelMixin
+            from .sourced import LazySourcedModelMixin, SourcedModelMixin
             API._register_model(cls)
             cls.Sourced = type('Sourced'+cls.__name__, (SourcedModelMixin, cls),
                                {'__module__': cls.__module__, 'Model': cls})
+            cls.LazySourced = type('LazySourced'+cls.__name__, (LazySourcedModelMixin, cls.Sourced),
+                                   {'__module__': cls.__module__, 'Model': cls})
             cls.XMLParser = type('XMLParser', (XMLParser, cls), {'__module__': cls.__module__, 'Model': cls})
             cls.JSONParser = type('JSONParser', (JSONParser, cls), {'__module__': cls.__module__, 'Model': cls})
         elif issubclass(cls, Parser) and Parser not in cls.__bases__:
@@ -196,15 +236,34 @@ class MetaModel(ABCMeta):
         return cls
 
 
+class ModelData:
+    """
+    Storage for the field values of a mutable model instance (Model._data), which uses slots instead of a dict.
+    MetaModel creates a subclass for each model. Fields that were never set have no value.
+    """
+    __slots__ = ()
+    _names = ()
+
+    def items(self):
+        """
+        Iterate over the (name, value) tuples of all fields that have a value.
+        """
+        for name in self._names:
+            try:
+                yield name, getattr(self, name)
+            except AttributeError:
+                pass
+
+
 class Model(Serializable, metaclass=MetaModel):
     Query = None
 
     def __init__(self, **kwargs):
-        self._data = {}
+        self._data = data = self._Data()
         for name, field in self._nonproxy_fields.items():
             default = field.getdefault()
             if default is not None:
-                self._data[name] = default
+                setattr(data, name, default)
 
         for name, value in kwargs.items():
             # We access the field directly so it also works with Model.Sourced which prevents setting attributes
@@ -230,7 +289,7 @@ class Model(Serializable, metaclass=MetaModel):
         return result
 
     def _sourced(self, source):
-        return self.Sourced(source, **self._data)
+        return self.Sourced(source, **dict(self._data.items()))
 
     @classmethod
     def _unserialize(cls, data):
@@ -244,17 +303,26 @@ class Model(Serializable, metaclass=MetaModel):
 
 
 class ModelWithIDs(Model):
+    """
+    A model with ids. Two instances of the same model are equal if they have any id in common.
+
+    Because of this, equality is not transitive and instances are unhashable: a hash that is consistent with it
+    could only depend on the model, which would make sets and dicts of instances quadratic. Use IDIndex to group
+    or deduplicate many instances by their ids.
+    """
     ids = Field(IDs)
 
-    def __eq__(self, other):
+    def _get_eq_model(self):
         from .sourced import SourcedModelMixin
+        return self.Model if isinstance(self, SourcedModelMixin) else self.__class__
+
+    def __eq__(self, other):
         if not isinstance(other, ModelWithIDs):
             return False
 
-        model1 = self.Model if isinstance(self, SourcedModelMixin) else self.__class__
-        model2 = other.Model if isinstance(other, SourcedModelMixin) else other.__class__
-
-        if model1 != model2:
+        if self._get_eq_model() != other._get_eq_model():
             return False
 
         return bool(self.ids and other.ids and (self.ids & other.ids)) or None
+
+    __hash__ = None
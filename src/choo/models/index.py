@@ -0,0 +1,105 @@
+from collections import OrderedDict
+
+from .base import ModelWithIDs
+
+
+class IDIndex:
+    """
+    Groups ModelWithIDs instances that describe the same object, e.g. to merge the results of multiple queries.
+
+    Instances of the same model are in the same group if they share any (namespace, id) pair, directly or through
+    other instances of the group. Instances without ids are in a group of their own.
+    Adding an instance takes time proportional to its number of ids (union-find), so grouping n instances is linear.
+
+    >>> index = IDIndex(vrr.stops.where(name='Essen Hbf'))
+    >>> index.update(vrr.stops.where(coords=Coordinates(51.451137, 7.012941)))
+    >>> stops = index.unique()
+    """
+    def __init__(self, objs=()):
+        self._objs = []
+        self._parents = []
+        self._sizes = []
+        self._by_id = {}
+        self.update(objs)
+
+    def add(self, obj):
+        """
+        Add an instance to the index.
+        """
+        if not isinstance(obj, ModelWithIDs):
+            raise TypeError('Expected ModelWithIDs instance, got %s' % repr(obj))
+
+        i = len(self._objs)
+        self._objs.append(obj)
+        self._parents.append(i)
+        self._sizes.append(1)
+
+        model = obj._get_eq_model()
+        for namespace, id_ in obj.ids.items():
+            key = (model, namespace, id_)
+            other = self._by_id.setdefault(key, i)
+            if other != i:
+                self._union(i, other)
+
+    def update(self, objs):
+        """
+        Add multiple instances to the index.
+        """
+        for obj in objs:
+            self.add(obj)
+
+    def _find(self, i):
+        parents = self._parents
+        while parents[i] != i:
+            # path halving
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    def _union(self, i, j):
+        i, j = self._find(i), self._find(j)
+        if i == j:
+            return
+        if self._sizes[i] < self._sizes[j]:
+            i, j = j, i
+        self._parents[j] = i
+        self._sizes[i] += self._sizes[j]
+
+    def groups(self):
+        """
+        Get a list of groups. Each group is a list of instances in the order they were added.
+        The groups are ordered by their first instance.
+        """
+        groups = OrderedDict()
+        for i, obj in enumerate(self._objs):
+            groups.setdefault(self._find(i), []).append(obj)
+        return list(groups.values())
+
+    def unique(self):
+        """
+        Get the first instance of each group.
+        """
+        return [group[0] for group in self.groups()]
+
+    def get_group(self, obj):
+        """
+        Get the group of instances that share any id with the given instance (which does not have to be in the
+        index). Returns an empty list if there is none.
+        """
+        model = obj._get_eq_model()
+        roots = set(self._find(i) for i in (self._by_id.get((model, namespace, id_))
+                                            for namespace, id_ in obj.ids.items()) if i is not None)
+        return [obj for i, obj in enumerate(self._objs) if self._find(i) in roots]
+
+    def __contains__(self, obj):
+        model = obj._get_eq_model()
+        return any((model, namespace, id_) in self._by_id for namespace, id_ in obj.ids.items())
+
+    def __len__(self):
+        """
+        Get the number of groups.
+        """
+        return sum(1 for i in range(len(self._objs)) if self._find(i) == i)
+
+    def __iter__(self):
+        return iter(self.groups())
@@ -1,4 +1,5 @@
 from collections import OrderedDict
+from keyword import iskeyword
 from operator import itemgetter
 
 from ..apis import API
@@ -14,13 +15,65 @@ class SourcedModelMixinMeta(MetaModel, type):
             cls.source = property(itemgetter(0))
 
             for i, (name, field) in enumerate(cls._nonproxy_fields.items(), start=1):
-                setattr(cls, name, property(itemgetter(i)))
+                setattr(cls, name, lazy_field_property(name, field) if cls._lazy else property(itemgetter(i)))
+
+            if not cls._lazy and '__new__' not in attrs:
+                cls.__new__ = mcs._compile_new(cls)
 
         return cls
 
+    @staticmethod
+    def _compile_new(cls):
+        """
+        Generate a constructor for the given Model.Sourced class with the fields as keyword arguments, so the
+        field order and conversions (see Field.get_immutable_converter) are only resolved once.
+        """
+        names = tuple(cls._nonproxy_fields.keys())
+        if any(iskeyword(name) or not name.isidentifier() for name in names):
+            return SourcedModelMixin.__new__
+
+        namespace = {'API': API, 'tuple_new': tuple.__new__}
+        for name, field in cls._nonproxy_fields.items():
+            namespace['convert_'+name] = field.get_immutable_converter()
+        code = (
+            'def __new__(cls, source, *, %(args)s):\n'
+            '    if not isinstance(source, API):\n'
+            '        raise TypeError("source argument has to be an API instance, not %%s" %% repr(source))\n'
+            '    return tuple_new(cls, (source, %(values)s))\n'
+        ) % {
+            'args': ', '.join('%s=None' % name for name in names),
+            'values': ''.join('convert_%s(%s, source), ' % (name, name) for name in names),
+        }
+        exec(code, namespace)
+        return namespace['__new__']
+
+
+def lazy_field_property(name, field):
+    """
+    Create the property of a Model.LazySourced field, which parses the field on first access.
+    """
+    def getter(self):
+        values = self.__dict__['_values']
+        try:
+            return values[name]
+        except KeyError:
+            pass
+
+        parser = self.__dict__['_parser']
+        value = field.get_immutable(getattr(parser, name, None), default_source=self.source, allow_parser=True)
+        if isinstance(value, Parser):
+            value = value.lazy_sourced()
+        values[name] = value
+        if len(values) == len(self._nonproxy_fields):
+            # everything is parsed, the parser and its data are not needed anymore
+            self.__dict__['_parser'] = None
+        return value
+    return property(getter)
+
 
 class SourcedModelMixin(tuple, metaclass=SourcedModelMixinMeta):
     __slots__ = ()
+    _lazy = False
 
     def __new__(cls, source, **kwargs):
         if cls is SourcedModelMixin:
@@ -46,20 +99,54 @@ class SourcedModelMixin(tuple, metaclass=SourcedModelMixinMeta):
         return ('<from %s: ' % self.source.serialize())+self.Model.__repr__(self)+'>'
 
     @classmethod
-    def from_parser(cls, parser):
+    def from_parser(cls, parser, only=None):
         if not isinstance(parser, Parser):
             raise TypeError('%s.Sourced: parser has to be a Parser instance, not %s' %
                             (cls.Model.__name__, repr(parser)))
 
-        return cls.from_object(parser.api, parser)
+        if parser.eager and only is None:
+            parser.parse_eager()
+        result = cls.from_object(parser.api, parser, only)
+        if parser.api.intern_pool is not None:
+            result = parser.api.intern_pool.intern(result)
+        return result
 
     @classmethod
-    def from_object(cls, source, obj):
+    def from_object(cls, source, obj, only=None):
+        """
+        Create a Model.Sourced from any instance of the model.
+        If only is given, only the given fields are taken from obj, the other ones are None. Proxy fields
+        (e.g. city__name) are taken from the submodel, so for parsers, only the given fields are parsed.
+        """
         if not isinstance(obj, cls.Model):
             raise ValueError('%s.Sourced: obj has to be a %s instance, not %s' %
                              (cls.Model.__name__, cls.Model.__name__, repr(obj)))
 
-        kwargs = {name: getattr(obj, name, None) for name, field in cls._nonproxy_fields.items()}
+        if only is None:
+            kwargs = {name: getattr(obj, name, None) for name, field in cls._nonproxy_fields.items()}
+            return cls(source=source, **kwargs)
+
+        subfields = OrderedDict()
+        for name in only:
+            name, sep, subname = name.partition('__')
+            if name not in cls._nonproxy_fields:
+                raise AttributeError('%s model has no field %s' % (cls.Model.__name__, repr(name)))
+            if not sep:
+                subfields[name] = None
+            elif subfields.get(name, ()) is not None:
+                subfields.setdefault(name, []).append(subname)
+
+        kwargs = {}
+        for name, names in subfields.items():
+            value = getattr(obj, name, None)
+            if names is not None and value is not None:
+                if isinstance(value, SourcedModelMixin):
+                    value = value.from_object(value.source, value, names)
+                elif isinstance(value, Parser):
+                    value = value.sourced(only=names)
+                else:
+                    value = value.Sourced.from_object(source, value, names)
+            kwargs[name] = value
         return cls(source=source, **kwargs)
 
     def mutable(self):
@@ -79,6 +166,11 @@ class SourcedModelMixin(tuple, metaclass=SourcedModelMixinMeta):
     def __eq__(self, other):
         return self.Model.__eq__(self, other)
 
+    def __hash__(self):
+        if self.Model.__hash__ is None:
+            raise TypeError('unhashable type: %s' % repr(self.__class__.__name__))
+        return self.Model.__hash__(self)
+
     def _apply_recursive(self, func):
         kwargs = {}
         for name in self._nonproxy_fields:
@@ -110,6 +202,10 @@ class SourcedModelMixin(tuple, metaclass=SourcedModelMixinMeta):
         if not isinstance(other, self.Model.Sourced):
             raise TypeError('Can only combine with another Model.Sourced instance, got %s instead' % repr(other))
 
+        if other is self:
+            # e.g. interned instances (see choo.caches.InternPool)
+            return self
+
         if self.source != other.source:
             raise NotImplementedError('Combining Model.Sourced instances from different sources is not supported yet!')
 
@@ -153,4 +249,56 @@ class SourcedModelMixin(tuple, metaclass=SourcedModelMixinMeta):
             raise TypeError('Cannot delete a Model.Sourced property')
         super().__delattr__(name)
 
+
+class LazySourcedModelMixin(SourcedModelMixin):
+    """
+    A Model.Sourced that is created from a parser and parses each field when it is read for the first time.
+    Use parser.lazy_sourced() to create one, e.g. if only a few fields of many results are needed.
+
+    Like Model.Sourced, it is immutable. Sub-models are also lazy. The parser and its data are kept until all
+    fields were read, use materialize() to get a regular Model.Sourced instead.
+    It is serialized like a Model.Sourced and unserialized into one.
+    """
+    __slots__ = ()
+    _lazy = True
+
+    def __new__(cls, *args, **kwargs):
+        raise TypeError('Model.LazySourced can only be created using from_parser()')
+
+    @classmethod
+    def from_parser(cls, parser):
+        if not isinstance(parser, Parser):
+            raise TypeError('%s.LazySourced: parser has to be a Parser instance, not %s' %
+                            (cls.Model.__name__, repr(parser)))
+
+        self = tuple.__new__(cls, (parser.api, ))
+        self.__dict__['_parser'] = parser
+        self.__dict__['_values'] = {}
+        return self
+
+    @classmethod
+    def from_object(cls, source, obj, only=None):
+        """
+        Create a regular Model.Sourced, see SourcedModelMixin.from_object().
+        """
+        return cls.Model.Sourced.from_object(source, obj, only)
+
+    def materialize(self):
+        """
+        Parse all remaining fields and return a regular Model.Sourced.
+        """
+        kwargs = {name: getattr(self, name) for name in self._nonproxy_fields}
+        return self.Model.Sourced(self.source, **kwargs)
+
+    def mutable(self):
+        return self.materialize().mutable()
+
+    @classmethod
+    def _collect_serializables(cls):
+        # unserializing has to return a Model.Sourced, so LazySourced classes are not registered
+        super()._collect_serializables()
+        cls.subclasses = {}
+        return cls.subclasses
+
+
 Model.Sourced = SourcedModelMixin
@@ -1,5 +1,6 @@
 from .base import Query
+from .frames import GeoPointFrame
 from .locations import GeoPointQuery, PlatformQuery, AddressQuery, AddressableQuery, LocationQuery, POIQuery, StopQuery
 
 __all__ = ['Query', 'GeoPointQuery', 'PlatformQuery', 'AddressableQuery', 'AddressQuery',
-           'LocationQuery', 'POIQuery', 'StopQuery']
+           'LocationQuery', 'POIQuery', 'StopQuery', 'GeoPointFrame']
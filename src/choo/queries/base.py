@@ -1,8 +1,12 @@
+import asyncio
+import json
 from abc import ABCMeta, abstractmethod
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from itertools import chain
 
+from ..apis.deadlines import Deadline, get_deadline
 from ..types import Serializable
 
 
@@ -62,9 +66,13 @@ class Query(Serializable, metaclass=MetaQuery):
     A Query has settings and all attributes of its model.
     Neither of these values ever change. All methods by which the query can be altered return a new query.
     It can be executed using .execute() or by accessing its results like an iterable.
+
+    In a coroutine, use .aexecute() or async for to execute it without blocking the event loop (see aexecute()):
+    >>> async for stop in query:
+    ...     pass
     """
     Model = None
-    _settings_defaults = {'limit': None}
+    _settings_defaults = OrderedDict((('limit', None), ('timeout', None), ('only', None)))
 
     def __init__(self, api_with_cache=None):
         if self.__class__ == Query:
@@ -97,7 +105,7 @@ class Query(Serializable, metaclass=MetaQuery):
         """
         result = self.__class__(self.api_with_cache)
         result._obj = deepcopy(self._obj)
-        result._settings = self._settings
+        result._settings = self._settings.copy()
         return result
 
     def where(self, **kwargs):
@@ -125,7 +133,9 @@ class Query(Serializable, metaclass=MetaQuery):
         result = OrderedDict((
             ('api', self.api.serialize(**kwargs) if self.api else None),
             ('obj', self._obj.serialize(**kwargs)),
-            ('settings', self._settings),
+            # the timeout does not change the results, so it is not serialized
+            ('settings', OrderedDict((name, value) for name, value in self._settings.items()
+                                     if name != 'timeout' and not (name == 'only' and value is None))),
         ))
         if self._results_generator is not None:
             if _collector is not None:
@@ -178,6 +188,96 @@ class Query(Serializable, metaclass=MetaQuery):
             raise self.Model.NotFound
         return next(iter(r))
 
+    def get_many(self, objs, concurrency=None):
+        """
+        Retrieve the given objects from the API. Returns a list of the retrieved objects in the same order,
+        with None for objects that were not found.
+
+        Objects that are already in the query's cache as results of this API are not retrieved again.
+        Equal objects are only retrieved once. The others are retrieved concurrently in up to concurrency threads
+        (the API's pool_size by default).
+
+        Example:
+        >>> query.get_many([Stop(ids=IDs({'vrr': 20009289})), Stop(ids=IDs({'vrr': 20009161}))])
+        """
+        objs = list(objs)
+        if self.api is None:
+            raise TypeError('Cannot execute query not bound to an API')
+        if concurrency is not None and (not isinstance(concurrency, int) or concurrency < 1):
+            raise TypeError('concurrency has to be None or int >= 1')
+        for obj in objs:
+            if not isinstance(obj, self.Model):
+                raise TypeError('Expected %s instance, got %s' % (self.Model.__name__, repr(obj)))
+
+        results = [None]*len(objs)
+        missing = OrderedDict()
+        for i, obj in enumerate(objs):
+            cached = self._get_cached(obj)
+            if cached is not None:
+                results[i] = cached
+                continue
+            missing.setdefault(self._get_many_key(obj), []).append(i)
+
+        if missing:
+            # the worker threads have to use the deadline of this thread or this query, whichever is earlier
+            deadline = get_deadline()
+            timeout = self._settings['timeout']
+            if timeout is not None and (deadline is None or deadline.remaining() > timeout):
+                deadline = Deadline(timeout)
+
+            with ThreadPoolExecutor(max_workers=concurrency or self.api.pool_size) as executor:
+                futures = [(executor.submit(self._get_uncached, objs[indexes[0]], deadline), indexes)
+                           for indexes in missing.values()]
+                try:
+                    found = [(future.result(), indexes) for future, indexes in futures]
+                except Exception:
+                    for future, indexes in futures:
+                        future.cancel()
+                    raise
+
+            # the cache is not thread-safe, so results are only added to it here
+            found = [(result, indexes) for result, indexes in found if result is not None]
+            if self.cache is not None and self._settings['only'] is None:
+                found = zip(self.cache.apply_multiple(result for result, indexes in found),
+                            (indexes for result, indexes in found))
+            for result, indexes in found:
+                for i in indexes:
+                    results[i] = result
+        return results
+
+    def _get_cached(self, obj):
+        """
+        Get a result of this query's API for the given object from the query's cache or None. Used by get_many().
+        """
+        if self.cache is None or self._settings['only'] is not None:
+            return None
+        if not hasattr(obj, 'Model'):
+            # the cache only looks up sourced objects and parsers
+            obj = obj._sourced(self.api)
+        result = self.cache.get(obj, none=True)
+        if result is None or not isinstance(result, self.Model) or self.api.name not in result.ids:
+            return None
+        return result
+
+    @staticmethod
+    def _get_many_key(obj):
+        return json.dumps(obj.serialize(), sort_keys=True, default=str)
+
+    def _get_uncached(self, obj, deadline=None):
+        """
+        Retrieve the given object without using the query's cache. Returns None if it was not found.
+        Used by get_many(), so the object is not copied.
+        """
+        from ..apis.api import APIWithCache
+        query = self.__class__(APIWithCache(self.api))
+        query._obj = obj
+        query._settings = self._settings.copy()
+        query._settings['limit'] = 1
+        if deadline is None:
+            return next(iter(query.execute()), None)
+        with deadline:
+            return next(iter(query.execute()), None)
+
     def _execute(self, api):
         """
         This is the only method that an APIs should overwrite.
@@ -186,6 +286,14 @@ class Query(Serializable, metaclass=MetaQuery):
         """
         raise TypeError('Cannot execute query not bound to an API')
 
+    async def _aexecute(self):
+        """
+        Like _execute(), but a coroutine that executes the requests without blocking the event loop
+        (see Request.create_async()). APIs can overwrite it. If it returns None, the query is executed in the API's
+        executor instead.
+        """
+        return None
+
     def limit(self, limit):
         """
         Set the maximum number of results. Returns a new query.
@@ -193,8 +301,38 @@ class Query(Serializable, metaclass=MetaQuery):
         """
         if limit is not None and (not isinstance(limit, int) or limit < 1):
             raise TypeError('limit has to be None or int >= 1')
-        self._update_setting('limit', limit)
-        return self
+        return self._update_setting('limit', limit)
+
+    def timeout(self, timeout):
+        """
+        Set the maximum time in seconds that executing the query may take, including all requests it needs
+        (e.g. looking up a stop first). The time starts when the query is executed. Returns a new query.
+        Once it is exceeded, no more requests are executed and DeadlineExceeded is raised.
+        None means no timeout (although the API's UpstreamPolicy has a timeout for each request).
+        """
+        if timeout is not None and (not isinstance(timeout, (int, float)) or timeout <= 0):
+            raise TypeError('timeout has to be None or a number > 0')
+        return self._update_setting('timeout', timeout)
+
+    def only(self, *fields):
+        """
+        Only get the given fields of the results, the other ones are None. Returns a new query.
+        Fields of submodels can be given as proxy fields (e.g. city__name). None means all fields.
+        Only the given fields are parsed and serialized. The results are not added to the cache.
+
+        Example:
+        >>> query.only('name', 'coords', 'city__name')
+        """
+        if len(fields) == 1 and (fields[0] is None or isinstance(fields[0], (list, tuple))):
+            fields = fields[0]
+        if fields is not None:
+            if not fields:
+                raise TypeError('only needs at least one field')
+            for name in fields:
+                if name not in self.Model._fields:
+                    raise TypeError('invalid field: %s.%s' % (self.Model.__name__, name))
+            fields = tuple(fields)
+        return self._update_setting('only', fields)
 
     def _update_setting(self, name, value):
         result = self.copy()
@@ -207,9 +345,76 @@ class Query(Serializable, metaclass=MetaQuery):
         If the Query was already executed, nothing happens.
         """
         if self._results_generator is None:
-            self.set_results_generator(self._execute())
+            if self._settings['timeout'] is None:
+                results = self._execute()
+            else:
+                results = self._execute_with_deadline(Deadline(self._settings['timeout']))
+            self._set_results(results)
         return self
 
+    def _set_results(self, results):
+        only = self._settings['only']
+        if only is None:
+            self.set_results_generator(results)
+        else:
+            self.set_results_generator((self._project_result(result, only) for result in results), nocache=True)
+
+    def _project_result(self, result, only):
+        """
+        Get a Model.Sourced with only the given fields of a result. Used if the only setting is set.
+        """
+        return result.Model.Sourced.from_object(result.source, result, only)
+
+    def _execute_with_deadline(self, deadline):
+        """
+        Wrap _execute() so that the deadline is active for the current thread whenever the query is executing
+        (but not while the caller processes the results).
+        """
+        with deadline:
+            results = iter(self._execute())
+        while True:
+            with deadline:
+                try:
+                    result = next(results)
+                except StopIteration:
+                    return
+            yield result
+
+    async def aexecute(self):
+        """
+        Execute the query without blocking the event loop. Returns the query itself.
+        All results are retrieved, so iterating over the query afterwards does not block.
+
+        The requests are sent using the API transport's afetch() if the query supports it (see _aexecute()),
+        otherwise the whole query is executed in the API's executor.
+        """
+        if self.api is None:
+            raise TypeError('Cannot execute query not bound to an API')
+
+        if self._results_generator is None:
+            timeout = self._settings['timeout']
+            if timeout is None:
+                results = await self._aexecute()
+            else:
+                try:
+                    results = await asyncio.wait_for(self._aexecute(), timeout)
+                except asyncio.TimeoutError:
+                    raise Deadline(timeout).get_exception()
+            if results is not None:
+                self._set_results(results)
+
+        if not self._results_done:
+            if self._results_generator is None:
+                await self.api.run_async(self._fetch_all)
+            else:
+                # the responses were already received, so only parsing is left
+                self._fetch_all()
+        return self
+
+    def _fetch_all(self):
+        for result in self._full_iter():
+            pass
+
     def set_results_generator(self, generator, nocache=False):
         if self._results_generator is not None:
             raise TypeError('query already has a results operator')
@@ -235,7 +440,13 @@ class Query(Serializable, metaclass=MetaQuery):
         """
         Iterate over the query results. Each item is _alwayss_ a subclass of the query's Model.
         """
-        return self._full_iter
+        return self._full_iter()
+
+    def __aiter__(self):
+        """
+        Iterate over the query results asynchronously, see aexecute().
+        """
+        return AsyncQueryIterator(self)
 
     def _next_result(self):
         """
@@ -283,6 +494,27 @@ class Query(Serializable, metaclass=MetaQuery):
         super().__delattr__(name)
 
 
+class AsyncQueryIterator:
+    """
+    Asynchronous iterator over the results of a query (used by Query.__aiter__)
+    """
+    def __init__(self, query):
+        self.query = query
+        self.iterator = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.iterator is None:
+            await self.query.aexecute()
+            self.iterator = iter(self.query)
+        try:
+            return next(self.iterator)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
 class MetaBoundAPIQuery(MetaQuery, ABCMeta):
     """
     Metaclass for BoundAPIQuery that registers subclasses to their correct API.
@@ -0,0 +1,255 @@
+from array import array
+from collections import OrderedDict
+from math import asin, cos, isnan, radians, sin, sqrt
+from sys import intern
+
+from ..models import Way
+from ..types import Coordinates, Serializable
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+nan = float('nan')
+
+
+class GeoPointFrame(Serializable):
+    """
+    The results of a GeoPointQuery in columns instead of model instances, see GeoPointQuery.to_frame().
+    Meant for many results (e.g. all POIs of a map tile) that are filtered, sorted and serialized in bulk.
+
+    Columns:
+    types: serialized type names of the results (e.g. 'stop'), as interned strings
+    lat, lon: coordinates as array('d'), nan if a result has no coordinates
+    distance: distance from the query's coordinates in meters as array('d'), nan if not known
+    name: names as interned strings or None
+    ids: an OrderedDict of id columns by namespace. Each value is the id, a sorted tuple if there are multiple
+         ids in the namespace, or None.
+    fields: an OrderedDict of columns of additional fields by field name (e.g. city__name). Once the frame was
+            unserialized, their values are in their serialized form.
+
+    All methods that select rows return a new frame:
+    >>> frame = vrr.pois.where(coords=Coordinates(51.451137, 7.012941)).to_frame('poitype')
+    >>> frame.within(51.44, 7.0, 51.46, 7.03).sort_by_distance().serialize()
+    """
+    def __init__(self, source=None, fields=()):
+        self.source = source
+        self.types = []
+        self.lat = array('d')
+        self.lon = array('d')
+        self.distance = array('d')
+        self.name = []
+        self.ids = OrderedDict()
+        self.fields = OrderedDict((name, []) for name in fields)
+
+    @classmethod
+    def from_results(cls, results, source=None, fields=()):
+        """
+        Create a frame from GeoPoint instances or from Way instances that have them as their destination.
+        """
+        frame = cls(source, fields)
+        for result in results:
+            frame.append(result)
+        return frame
+
+    def append(self, obj):
+        """
+        Add a GeoPoint instance or a Way instance that has it as its destination as a row.
+        """
+        distance = None
+        if isinstance(obj, Way):
+            distance = obj.distance
+            obj = obj.destination
+
+        i = len(self.types)
+        self.types.append(intern(obj.serialized_type_name.split('.')[0]))
+
+        coords = obj.coords
+        self.lat.append(nan if coords is None else coords.lat)
+        self.lon.append(nan if coords is None else coords.lon)
+        self.distance.append(nan if distance is None else distance)
+
+        name = getattr(obj, 'name', None)
+        self.name.append(intern(name) if isinstance(name, str) else name)
+
+        ids = getattr(obj, 'ids', None)
+        if ids:
+            for namespace in ids:
+                column = self.ids.get(namespace)
+                if column is None:
+                    column = self.ids[namespace] = [None]*i
+                values = ids.getall(namespace)
+                column.append(next(iter(values)) if len(values) == 1 else tuple(sorted(values)))
+
+        for namespace, column in self.ids.items():
+            if len(column) == i:
+                column.append(None)
+
+        for name, column in self.fields.items():
+            value = getattr(obj, name, None)
+            column.append(intern(value) if isinstance(value, str) else value)
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, i):
+        """
+        Get a row as an OrderedDict.
+        """
+        row = OrderedDict((
+            ('type', self.types[i]),
+            ('lat', self.lat[i]),
+            ('lon', self.lon[i]),
+            ('distance', self.distance[i]),
+            ('name', self.name[i]),
+            ('ids', OrderedDict((namespace, column[i]) for namespace, column in self.ids.items()
+                                if column[i] is not None)),
+        ))
+        row.update((name, column[i]) for name, column in self.fields.items())
+        return row
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def take(self, indices):
+        """
+        Get a frame with the rows at the given indices, in the given order.
+        """
+        indices = list(indices)
+        frame = self.__class__(self.source, self.fields.keys())
+        frame.types = [self.types[i] for i in indices]
+        frame.lat = array('d', (self.lat[i] for i in indices))
+        frame.lon = array('d', (self.lon[i] for i in indices))
+        frame.distance = array('d', (self.distance[i] for i in indices))
+        frame.name = [self.name[i] for i in indices]
+        for namespace, column in self.ids.items():
+            column = [column[i] for i in indices]
+            if any(value is not None for value in column):
+                frame.ids[namespace] = column
+        for name, column in self.fields.items():
+            frame.fields[name] = [column[i] for i in indices]
+        return frame
+
+    def filter(self, mask):
+        """
+        Get a frame with the rows for which mask (an iterable of booleans, one for each row) is true.
+        """
+        return self.take(i for i, selected in enumerate(mask) if selected)
+
+    def within(self, min_lat, min_lon, max_lat, max_lon):
+        """
+        Get a frame with the rows whose coordinates are within the given bounding box.
+        """
+        return self.filter(min_lat <= lat <= max_lat and min_lon <= lon <= max_lon
+                           for lat, lon in zip(self.lat, self.lon))
+
+    def distances_to(self, coords):
+        """
+        Get the distances in meters of all rows to the given Coordinates as array('d'), nan for rows without
+        coordinates. Uses numpy if it is installed.
+        """
+        if not isinstance(coords, Coordinates):
+            raise TypeError('distances_to expected Coordinates object, not %s' % repr(coords))
+
+        lat1, lon1 = radians(coords.lat), radians(coords.lon)
+        if numpy is not None:
+            lat2 = numpy.radians(numpy.frombuffer(self.lat, dtype='d'))
+            lon2 = numpy.radians(numpy.frombuffer(self.lon, dtype='d'))
+            result = 12742000 * numpy.arcsin(numpy.sqrt(numpy.sin((lat2-lat1)/2)**2 +
+                                                        cos(lat1)*numpy.cos(lat2)*numpy.sin((lon2-lon1)/2)**2))
+            return array('d', result.tobytes())
+
+        result = array('d')
+        cos_lat1 = cos(lat1)
+        for lat2, lon2 in zip(self.lat, self.lon):
+            if isnan(lat2):
+                result.append(nan)
+                continue
+            lat2, lon2 = radians(lat2), radians(lon2)
+            result.append(12742000 * asin(sqrt(sin((lat2-lat1)/2)**2+cos_lat1*cos(lat2)*sin((lon2-lon1)/2)**2)))
+        return result
+
+    def sort_by_distance(self, coords=None, max_distance=None):
+        """
+        Get a frame with the rows sorted by their distance, rows without a distance come last.
+        If coords are given, the distances to them are used instead of the distance column.
+        If max_distance is given, rows that are further away or have no distance are left out.
+        """
+        distances = self.distance if coords is None else self.distances_to(coords)
+        indices = sorted(range(len(self)), key=lambda i: (isnan(distances[i]), distances[i]))
+        if max_distance is not None:
+            indices = [i for i in indices if distances[i] <= max_distance]
+        frame = self.take(indices)
+        if coords is not None:
+            frame.distance = array('d', (distances[i] for i in indices))
+        return frame
+
+    def to_numpy(self):
+        """
+        Get the columns as an OrderedDict of numpy arrays. Needs numpy to be installed.
+        Coordinates and distances are float64 arrays, all other columns are object arrays.
+        """
+        if numpy is None:
+            raise ImportError('GeoPointFrame.to_numpy() needs numpy to be installed.')
+
+        result = OrderedDict((
+            ('type', numpy.array(self.types, dtype=object)),
+            ('lat', numpy.array(self.lat, dtype='d')),
+            ('lon', numpy.array(self.lon, dtype='d')),
+            ('distance', numpy.array(self.distance, dtype='d')),
+            ('name', numpy.array(self.name, dtype=object)),
+        ))
+        result.update(('ids__'+namespace, numpy.array(column, dtype=object))
+                      for namespace, column in self.ids.items())
+        result.update((name, numpy.array(column, dtype=object)) for name, column in self.fields.items())
+        return result
+
+    @classmethod
+    def _get_serialized_type_name(cls):
+        return 'geopoint.frame'
+
+    def _serialize_value(self, value, **kwargs):
+        if isinstance(value, float):
+            return None if isnan(value) else value
+        if isinstance(value, Serializable):
+            return value.serialize(**kwargs)
+        if isinstance(value, tuple):
+            return list(value)
+        return value
+
+    def _serialize(self, **kwargs):
+        """
+        Serialize the frame column by column. nan becomes None, because JSON has no nan.
+        """
+        value = self._serialize_value
+        result = OrderedDict((
+            ('source', self.source.serialize(**kwargs) if self.source is not None else None),
+            ('types', self.types),
+            ('lat', [value(lat) for lat in self.lat]),
+            ('lon', [value(lon) for lon in self.lon]),
+            ('distance', [value(distance) for distance in self.distance]),
+            ('name', self.name),
+            ('ids', OrderedDict((namespace, [value(id_) for id_ in column])
+                                for namespace, column in self.ids.items())),
+        ))
+        if self.fields:
+            result['fields'] = OrderedDict((name, [value(item, **kwargs) for item in column])
+                                           for name, column in self.fields.items())
+        return result
+
+    @classmethod
+    def _unserialize(cls, data):
+        from ..apis import API
+        fields = data.get('fields', {})
+        frame = cls(API.unserialize(data.get('source')), fields.keys())
+        frame.types = [intern(type_) for type_ in data['types']]
+        frame.lat = array('d', (nan if lat is None else lat for lat in data['lat']))
+        frame.lon = array('d', (nan if lon is None else lon for lon in data['lon']))
+        frame.distance = array('d', (nan if distance is None else distance for distance in data['distance']))
+        frame.name = [intern(name) if isinstance(name, str) else name for name in data['name']]
+        frame.ids = OrderedDict((namespace, [tuple(id_) if isinstance(id_, list) else id_ for id_ in column])
+                                for namespace, column in data['ids'].items())
+        for name, column in fields.items():
+            frame.fields[name] = list(column)
+        return frame
@@ -1,5 +1,6 @@
 from ..models import POI, Address, Addressable, GeoPoint, Location, Platform, Stop
 from .base import Query
+from .frames import GeoPointFrame
 
 
 class GeoPointQuery(Query):
@@ -14,12 +15,11 @@ class GeoPointQuery(Query):
     def max_distance(self, max_distance):
         """
         Set the maximum distance in meters from the given Coordinates (if the coord attribute is set).
-        None means unlimited (although APIs can have an internal limit)
+        Returns a new query. None means unlimited (although APIs can have an internal limit)
         """
         if not isinstance(max_distance, int) or max_distance < 1:
             raise TypeError('max_distance has to be int > 0')
-        self._update_setting('max_distance', max_distance)
-        return self
+        return self._update_setting('max_distance', max_distance)
 
     def _execute(self):
         """
@@ -30,6 +30,14 @@ class GeoPointQuery(Query):
         """
         super()._execute()
 
+    def _project_result(self, result, only):
+        if self.coords is None:
+            return super()._project_result(result, only)
+        # the results are ways to the actual results
+        only = tuple(name for name in result._nonproxy_fields if name != 'destination')+tuple(
+            'destination__'+name for name in only)
+        return result.Model.Sourced.from_object(result.source, result, only)
+
     def __iter__(self):
         return self._full_iter() if self.coords is None else iter(way.destination for way in self._full_iter())
 
@@ -42,6 +50,24 @@ class GeoPointQuery(Query):
             raise TypeError('results are not available as ways because coords was not part of the query')
         return self._full_iter()
 
+    def to_frame(self, *fields):
+        """
+        Get the results as a GeoPointFrame, which has their coordinates, distances, names, ids and the given
+        additional fields (e.g. city__name) in columns.
+        If the query was not executed yet and has no only setting, only these fields are parsed (see only()).
+
+        Example:
+        >>> query.to_frame('city__name').sort_by_distance().serialize()
+        """
+        for name in fields:
+            if name not in self.Model._fields:
+                raise TypeError('invalid field: %s.%s' % (self.Model.__name__, name))
+
+        query = self
+        if self._results_generator is None and self._settings['only'] is None:
+            query = self.only(tuple(name for name in ('coords', 'name', 'ids') if name in self.Model._fields)+fields)
+        return GeoPointFrame.from_results(query._full_iter(), self.api, fields)
+
 
 class PlatformQuery(GeoPointQuery):
     Model = Platform
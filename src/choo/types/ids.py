@@ -41,6 +41,8 @@ class IDs(SimpleSerializable):
     >>> if ids & IDs({'multiple_ids': 9}):
     ...     pass  # this gets executed if there are common ids
     """
+    __slots__ = ('data', )
+
     def __init__(self, initialdata={}):
         """
         Initialize the IDs object.
@@ -209,9 +211,14 @@ class FrozenIDs(IDs):
     """
     Like IDs, but can not be altered. Use IDs(frozenids) to get a alterable version.
     """
+    __slots__ = ()
+
     def _frozen_error(self, *args, **kwargs):
         raise TypeError('FrozenIDs can not be altered')
 
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
     @classmethod
     def _get_serialized_type_name(cls):
         return 'ids.frozen'
@@ -20,6 +20,7 @@ class ObjectCollector:
 
 
 class Serializable(ABC):
+    __slots__ = ()
     subclasses = {}
 
     @classmethod
@@ -79,6 +80,8 @@ class Serializable(ABC):
 
 
 class SimpleSerializable(Serializable, ABC):
+    __slots__ = ()
+
     @classmethod
     def unserialize(cls, data):
         if isinstance(data, (dict, OrderedDict)) and '@type' in data:
@@ -112,6 +115,8 @@ class Coordinates(SimpleSerializable, namedtuple('Coordinates', ('lat', 'lon')))
     """
     Coordinates in WGS84. Has a lat and lon attribute. Implemented as namedtuple.
     """
+    __slots__ = ()
+
     def distance_to(self, other):
         """
         Get distance to other Coordinates object in meteres.
@@ -1,10 +1,9 @@
 #!/usr/bin/env python3
 import json
-import os
 from datetime import datetime
 
 from choo.apis import *  # noqa
-from choo.apis.requests import Request
+from choo.apis.transports import RecordingTransport
 
 print('Please enter Query command:')
 command = input('Enter Query command: ')
@@ -17,26 +16,22 @@ while ordered_requests not in ['Y', 'N']:
         ordered_requests = 'Y'
 ordered_requests = (ordered_requests == 'Y')
 
-os.environ['CHOO_REQUESTS_DUMP'] = '1'
 query = eval(command)
+query.api.transport = transport = RecordingTransport()
 query.execute()
 
-print('import os\n')
 print('from choo.apis import *  # noqa')
-print('from choo.apis.requests import Request\n\n')
+print('from choo.apis.transports import ReplayTransport\n\n')
 
 print('class Test'+query.api.name.title()+query.__class__.__name__+':')
 print('    def test_'+datetime.now().strftime('%Y%m%d_%H%M%S_%f')+'(self):')
-requests_dump = json.dumps(Request.requests_dump, ensure_ascii=False, indent=4).replace('\n', '\n        ')
+requests_dump = json.dumps(transport.requests_dump, ensure_ascii=False, indent=4).replace('\n', '\n        ')
 requests_dump = '\n'.join((line if len(line) < 120 else (line+'  # noqa')) for line in requests_dump.split('\n'))
-print('        Request.requests_dump = '+requests_dump)
-print('        os.environ["CHOO_REQUESTS_TEST"] = "1"')
-if ordered_requests:
-    print('        os.environ["CHOO_REQUESTS_TEST_ORDERED"] = "1"')
+print('        requests_dump = '+requests_dump)
+print('        transport = '+query.api.name+'.transport')
+print('        '+query.api.name+'.transport = ReplayTransport(requests_dump, ordered=%s)' % ordered_requests)
 query_result = json.dumps(query.serialize(), ensure_ascii=False, indent=4).replace('\n', '\n        ')
 query_result = query_result.replace('null,\n', 'None,\n').replace('null\n', 'None\n')
 print('        query = '+command)
 print('        assert query.execute().serialize() == '+query_result)
-print('        os.environ.pop("CHOO_REQUESTS_TEST")')
-if ordered_requests:
-    print('        os.environ.pop("CHOO_REQUESTS_TEST_ORDERED")')
+print('        '+query.api.name+'.transport = transport')
@@ -15,13 +15,14 @@ setup(
     author_email='choo@codingcatgirl.de',
     url='https://github.com/codingcatgirl/choo',
     install_requires=['requests', 'defusedxml'],
+    extras_require={'lxml': ['lxml'], 'async': ['aiohttp>=3.3']},
     license='Apache License 2.0',
-    scripts=['choo/choo-cli', 'choo/choo-server'],
+    scripts=['choo/choo-cli', 'choo/choo-server', 'choo/choo-efa-server'],
     classifiers=[
         'Programming Language :: Python',
         'Programming Language :: Python :: 3',
         'Programming Language :: Python :: 3 :: Only',
-        'Programming Language :: Python :: 3.4',
+        'Programming Language :: Python :: 3.5',
         'Development Status :: 2 - Pre-Alpha',
         'Intended Audience :: Developers',
         'License :: OSI Approved :: Apache Software License',
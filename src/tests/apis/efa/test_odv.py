@@ -1,4 +1,8 @@
 # flake8: noqa
+from datetime import datetime
+
+from choo.apis import vrr
+from choo.apis.efa.parsers.odv import OdvNameElemStop
 from choo.types import Serializable
 
 
@@ -40,3 +44,16 @@ class TestOdvNameElemStop:
                 "vrr": "20009159"
             }
         }
+
+    def test_odv_city(self, xml_backend):
+        odv = '''<itdOdv type="stop"><itdOdvPlace state="identified"><odvPlaceElem omc="5113000" stateless="placeID:5113000:18">Essen</odvPlaceElem></itdOdvPlace><itdOdvName state="identified"><odvNameElem anyType="stop" gid="de:5113:9159" id="20009159" locality="Essen" objectName="Borbeck Süd Bahnhof" omc="5113000" stopID="20009159" x="6954254" y="51462987">Essen, Borbeck Süd Bahnhof</odvNameElem></itdOdvName></itdOdv>'''
+        data = xml_backend.fromstring(odv)
+        city, elem = data.find('./itdOdvPlace/odvPlaceElem'), data.find('./itdOdvName/odvNameElem')
+        parser = OdvNameElemStop(None, elem, api=vrr, time=datetime(2016, 7, 2, 12, 33, 50), odv_city=city)
+        result = parser.sourced().serialize()
+        assert result['city']['name'] == 'Essen'
+        assert result['city']['ids']['vrr'] == 'placeID:5113000:18'
+        # the elements are used as they are
+        assert parser.data is elem and len(elem) == 0 and 'choo-text' not in elem.attrib
+        assert data.find('./itdOdvPlace/odvPlaceElem') is city
+        assert Serializable.unserialize(parser.serialize()).sourced().serialize() == result
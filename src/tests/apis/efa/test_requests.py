@@ -0,0 +1,64 @@
+# flake8: noqa
+from datetime import datetime
+from io import BytesIO
+
+from choo.apis import vrr
+from choo.apis.efa.parsers.coordinfo import CoordInfoPlatform, GenAttrMapping
+from choo.apis.efa.requests.coord import CoordRequest
+from choo.models import Platform
+from choo.types import Coordinates
+from tests.utils import COORD_RESULT, replay_coord_request
+
+
+class TestCoordRequest:
+    def test_stream(self):
+        request, results = replay_coord_request()
+        stream_request, stream_results = replay_coord_request(stream=True)
+        assert stream_request.time == request.time
+        assert len(stream_results) == 2
+        assert stream_results == results
+        assert stream_results[1]['name'] == 'Gleis 1'
+
+        only_request, only_results = replay_coord_request(stream=True, only=('name', ))
+        assert only_results[1] == {'@type': 'platform.sourced', 'source': 'vrr', 'name': 'Gleis 1'}
+
+    def test_stream_close(self, monkeypatch):
+        source = BytesIO(COORD_RESULT.encode('iso-8859-1'))
+        monkeypatch.setattr(CoordRequest, '_stream', lambda self, method, endpoint, data=None, session=None: source)
+        request = CoordRequest(vrr, Coordinates(51.451137, 7.012941), Platform, 400, stream=True)
+        next(request.results)
+        assert not source.closed
+        request.results.close()
+        assert source.closed
+
+    def test_lxml(self, lxml_backend):
+        request, results = replay_coord_request()
+        for stream in (False, True):
+            lxml_request, lxml_results = replay_coord_request(xml_backend=lxml_backend, stream=stream)
+            assert lxml_results == results
+
+    def test_decode_result(self):
+        body = COORD_RESULT.encode('iso-8859-1')
+        assert CoordRequest._decode_result(body) == COORD_RESULT
+        assert CoordRequest._decode_result('<ä/>'.encode()) == '<ä/>'
+        request, results = replay_coord_request()
+        assert request._parse_result_to_data('<?xml version="1.0" encoding="ISO-8859-1"?><a b="ä"/>'.encode('iso-8859-1')).attrib['b'] == 'ä'
+
+    def test_eager(self, monkeypatch):
+        request, results = replay_coord_request()
+        data = vrr.xml_backend.fromstring(COORD_RESULT.encode('iso-8859-1'))
+        parser = CoordInfoPlatform(None, data.find('.//coordInfoItem'), api=vrr, time=datetime.now())
+        assert not parser.eager
+
+        monkeypatch.setattr(vrr, 'eager_parsing', True)
+        eager_request, eager_results = replay_coord_request()
+        assert eager_results == results
+
+        assert parser.eager and 'coords' not in parser.__dict__
+        parser.parse_eager()
+        assert isinstance(parser.__dict__['_attrs'], GenAttrMapping)
+        assert parser.__dict__['coords'] == Coordinates(51.45135, 7.013111)
+        assert parser.__dict__['name'] == '2'
+        assert parser.__dict__['ids']['ifopt'] == 'de:5113:9289:2:2'
+        assert 'platform_type' in parser.__dict__
+        assert parser.stop._attrs is parser._attrs
@@ -1,12 +1,10 @@
-import os
-
 from choo.apis import *  # noqa
-from choo.apis.requests import Request
+from choo.apis.transports import ReplayTransport
 
 
 class TestVrrPlatformQuery:
     def test_20160716_151208_613012(self):
-        Request.requests_dump = [
+        requests_dump = [
             {
                 "method": "POST",
                 "url": "http://efa.vrr.de/standard/XML_STOPFINDER_REQUEST",
@@ -39,8 +37,8 @@ class TestVrrPlatformQuery:
                 "result": "<?xml version=\"1.0\" encoding=\"ISO-8859-1\"?>\r\n<itdRequest version=\"10.0.43.44\" language=\"de\" lengthUnit=\"METER\" sessionID=\"0\" client=\"python-requests/2.10.0\" clientIP=\"217.253.97.185\" serverID=\"EFA2.vrr.de_\" virtDir=\"standard\" now=\"2016-07-16T15:12:08\" nowWD=\"7\"><clientHeaderLines/><itdCoordInfoRequest requestID=\"0\"><itdCoordInfo><coordInfoRequest max=\"-1\" purpose=\"\" deadline=\"0\"><itdCoord x=\"7012941\" y=\"51451137\" mapName=\"WGS84\"/><coordInfoFilterItemList><coordInfoFilterItem type=\"BUS_POINT\" radius=\"400\" inclDrawClasses=\"\" exclLayers=\"\" name=\"\" ratingMethod=\"NULL\" inclPOIHierarchy=\"\" clustering=\"0\"/></coordInfoFilterItemList></coordInfoRequest><coordInfoItemList><coordInfoItem type=\"BUS_POINT\" id=\"20009289-2-2\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"42\" stateless=\"20009289-2-2\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7013111</x><y>51451350</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Bay</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:2:2</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>2</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-6-6\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"43\" stateless=\"20009289-6-6\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7012797</x><y>51451361</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Bay</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:6:6</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>6</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-7-7\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"50\" stateless=\"20009289-7-7\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7012824</x><y>51450868</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Bay</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:7:7</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>7</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-3-3\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"54\" stateless=\"20009289-3-3\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7013165</x><y>51450868</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Bay</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:3:3</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>3</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-8-8\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"78\" stateless=\"20009289-8-8\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7012806</x><y>51450706</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Bay</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:8:8</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>8</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-1-1\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"107\" stateless=\"20009289-1-1\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7013076</x><y>51451731</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Bay</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:1:1</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>1</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-9-9\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"111\" stateless=\"20009289-9-9\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7012734</x><y>51450527</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Bay</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:9:9</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>9</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-92-10\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"122\" stateless=\"20009289-92-10\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7014037</x><y>51451171</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value>10</value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Platform</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>Gl710</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:92:10</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>10</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-92-7\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"122\" stateless=\"20009289-92-7\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7014010</x><y>51451300</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Bay</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>Gl710</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:92:7</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>7</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-97-12\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"122\" stateless=\"20009289-97-12\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7014037</x><y>51451115</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value>12</value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Platform</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>G1112</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:97:12</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>12</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-91-6\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"125\" stateless=\"20009289-91-6\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7014001</x><y>51451361</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value>6</value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Platform</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>Gl4-6</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:91:6</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>6</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-97-11\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"127\" stateless=\"20009289-97-11\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7014064</x><y>51451014</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Bay</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>G1112</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:97:11</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>11</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-91-4\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"132\" stateless=\"20009289-91-4\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7013983</x><y>51451495</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value>4</value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Platform</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>Gl4-6</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:91:4</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>4</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-90-2\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"141\" stateless=\"20009289-90-2\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7013974</x><y>51451596</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value>2</value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Platform</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>Gl1+2</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:90:2</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>2</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-92-8\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"142\" stateless=\"20009289-92-8\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7011665</x><y>51451081</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value>8</value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Platform</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>Gl710</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:92:8</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>8</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-4-4\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"143\" stateless=\"20009289-4-4\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7013686</x><y>51450482</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Bay</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:4:4</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>4</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-90-1\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"154\" stateless=\"20009289-90-1\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7013956</x><y>51451719</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value>1</value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Platform</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>Gl1+2</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:90:1</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>1</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-13-3\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"162\" stateless=\"20009289-13-3\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7012707</x><y>51450241</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Bay</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>1+3</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:13:3</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>3</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-98-98g\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"162\" stateless=\"20009289-98-98g\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7014369</x><y>51451305</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>G2122</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:98:98g</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>98g</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-13-1\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"167\" stateless=\"20009289-13-1\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7012896</x><y>51450202</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Bay</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>1+3</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:13:1</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>1</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-98-98\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"184\" stateless=\"20009289-98-98\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7014594</x><y>51451176</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>G2122</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:98:98</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>98</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-5-5\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"206\" stateless=\"20009289-5-5\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7014441</x><y>51450465</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Bay</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:5:5</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>5</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-90-90\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"209\" stateless=\"20009289-90-90\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7014369</x><y>51451893</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value>9</value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Platform</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>Gl1+2</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:90:90</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>90</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-14-2\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"251\" stateless=\"20009289-14-2\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7012159</x><y>51449822</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Bay</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>2+4</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:14:2</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>2</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-14-4\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"255\" stateless=\"20009289-14-4\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7012303</x><y>51449766</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Bay</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>2+4</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:14:4</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>4</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-92-9\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"353\" stateless=\"20009289-92-9\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7016085</x><y>51451389</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value>9</value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Platform</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>Gl710</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:92:9</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>9</value></genAttrElem></genAttrList></coordInfoItem><coordInfoItem type=\"BUS_POINT\" id=\"20009289-98-21\" name=\"Hauptbahnhof\" omc=\"5113000\" placeID=\"18\" locality=\"Essen\" gisLayer=\"SYS-STOPPOINT\" distance=\"430\" stateless=\"20009289-98-21\"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7016534</x><y>51452027</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value>21</value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Platform</value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_REFERED_NAMEWITHPLACE</name><value></value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>G2122</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:98:21</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>21</value></genAttrElem></genAttrList></coordInfoItem></coordInfoItemList></itdCoordInfo></itdCoordInfoRequest></itdRequest>\r\n"  # noqa
             }
         ]
-        os.environ["CHOO_REQUESTS_TEST"] = "1"
-        os.environ["CHOO_REQUESTS_TEST_ORDERED"] = "1"
+        transport = vrr.transport
+        vrr.transport = ReplayTransport(requests_dump, ordered=True)
         query = vrr.platforms.where(stop__name='Essen Hbf')
         assert query.execute().serialize() == {
             "@type": "platform.query",
@@ -1967,5 +1965,4 @@ class TestVrrPlatformQuery:
                 }
             ]
         }
-        os.environ.pop("CHOO_REQUESTS_TEST")
-        os.environ.pop("CHOO_REQUESTS_TEST_ORDERED")
+        vrr.transport = transport
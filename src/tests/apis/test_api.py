@@ -0,0 +1,41 @@
+import pytest
+
+from choo.apis import EFA, vrr
+from choo.apis.policy import UpstreamPolicy
+
+
+class TestAPI:
+    def test_session(self):
+        assert vrr.session is vrr.session
+        adapter = vrr.session.get_adapter(vrr.base_url)
+        assert adapter._pool_maxsize == vrr.pool_size
+
+    def test_pool_settings(self):
+        api = EFA(name='test_pool', base_url='http://localhost/', preset='de', pool_size=3, keep_alive=False)
+        assert api.session.get_adapter(api.base_url)._pool_maxsize == 3
+        assert api.session.headers['Connection'] == 'close'
+
+        with pytest.raises(TypeError):
+            EFA(name='test_pool_invalid', base_url='http://localhost/', preset='de', pool_size=0)
+
+    def test_mirrors(self):
+        api = EFA(name='test_mirrors', base_url='http://localhost/efa/', preset='de', mirrors=('http://mirror/efa/', ),
+                  policy=UpstreamPolicy(hedge_percentile=95))
+        assert api.get_mirror_urls('http://localhost/efa/XML_STOPFINDER_REQUEST') == (
+            'http://mirror/efa/XML_STOPFINDER_REQUEST',
+        )
+        assert api.get_mirror_urls('http://elsewhere/XML_STOPFINDER_REQUEST') == ()
+        assert api.session.get_adapter(api.base_url)._pool_connections == 2
+
+        # hedge requests are sent after a percentile of the recent latencies of the host
+        stats = api.get_latency_stats('http://localhost/efa/XML_STOPFINDER_REQUEST')
+        assert api.policy.get_hedge_delay(stats) == api.policy.hedge_delay
+        for i in range(100):
+            stats.add(i/100)
+        assert api.policy.get_hedge_delay(stats) == 0.95
+        assert stats.percentile(50) == 0.5
+        assert stats is api.get_latency_stats('http://localhost/efa/XML_COORD_REQUEST')
+        assert not len(api.get_latency_stats('http://mirror/efa/XML_STOPFINDER_REQUEST'))
+
+        # hedging is disabled by default
+        assert UpstreamPolicy().get_hedge_delay(stats) is None
@@ -0,0 +1,72 @@
+import gzip
+import json
+import os
+
+from choo.apis import vrr
+from choo.apis.cassettes import Cassette, CassetteWriter
+from choo.apis.efa.requests.stopfinder import StopfinderRequest
+from choo.apis.transports import RecordingTransport, ReplayTransport
+from tests.utils import StaticTransport
+
+
+class TestCassettes:
+    request = StopfinderRequest.__new__(StopfinderRequest)
+    url = vrr.base_url+'XML_STOPFINDER_REQUEST'
+    recordings = [
+        {'method': 'POST', 'url': url, 'data': {'name_sf': 'Süd'}, 'result': 'a'},
+        {'method': 'POST', 'url': url, 'data': {'name_sf': 'B'}, 'result': 'b'},
+        {'method': 'POST', 'url': url, 'data': {'name_sf': 'Süd'}, 'result': 'c'},
+    ]
+
+    def write_cassette(self, tmpdir):
+        path = str(tmpdir.join('test.cassette'))
+        with CassetteWriter(path) as cassette:
+            cassette.extend(self.recordings[:2])
+        with CassetteWriter(path) as cassette:
+            cassette.write(self.recordings[2])
+        return path
+
+    def test_write(self, tmpdir):
+        path = self.write_cassette(tmpdir)
+        with Cassette(path) as cassette:
+            assert len(cassette) == 3
+            assert list(cassette) == self.recordings
+
+        # the cassette is a valid gzip compressed JSON lines file
+        with gzip.open(path, 'rt') as f:
+            assert [json.loads(line) for line in f] == self.recordings
+
+    def test_rebuild_index(self, tmpdir):
+        path = self.write_cassette(tmpdir)
+        with open(Cassette.get_index_path(path)) as f:
+            index = f.read()
+        os.remove(Cassette.get_index_path(path))
+
+        with Cassette(path) as cassette:
+            assert list(cassette) == self.recordings
+        with open(Cassette.get_index_path(path)) as f:
+            assert f.read() == index
+
+    def test_replay(self, tmpdir):
+        path = self.write_cassette(tmpdir)
+        with Cassette(path) as cassette:
+            transport = ReplayTransport(cassette)
+            assert len(transport) == 3
+            assert transport.fetch(self.request, 'POST', self.url, {'name_sf': 'B'}) == 'b'
+            assert transport.fetch(self.request, 'POST', self.url, {'name_sf': 'Süd'}) == 'a'
+            assert transport.fetch(self.request, 'POST', self.url, {'name_sf': 'Süd'}) == 'c'
+            assert len(transport) == 0
+
+            transport = ReplayTransport(cassette, ordered=True, repeat=True)
+            assert [transport.fetch(self.request, 'POST', self.url) for i in range(4)] == ['a', 'b', 'c', 'a']
+
+    def test_recording(self, tmpdir):
+        path = str(tmpdir.join('test.cassette'))
+        body = '<?xml version="1.0" encoding="UTF-8"?><itdRequest/>'.encode()
+        with CassetteWriter(path) as cassette:
+            transport = RecordingTransport(StaticTransport(body), cassette=cassette)
+            transport.fetch(self.request, 'POST', self.url, {'name_sf': 'B'})
+        assert transport.requests_dump == []
+
+        with Cassette(path) as cassette:
+            assert ReplayTransport(cassette).fetch(self.request, 'POST', self.url, {'name_sf': 'B'}) == body.decode()
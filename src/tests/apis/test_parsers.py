@@ -0,0 +1,46 @@
+from datetime import datetime
+
+import pytest
+
+from choo.apis import ParserError, vrr
+from choo.apis.efa.parsers.coordinfo import CoordInfoPlatform
+from choo.apis.parsers import ParserDebugMessage, XMLParser, get_debug_data
+from tests.utils import COORD_RESULT
+
+
+def get_parser(data=COORD_RESULT):
+    root = vrr.xml_backend.fromstring(data.encode('iso-8859-1'))
+    return CoordInfoPlatform(None, root.find('.//coordInfoItem'), api=vrr, time=datetime(2016, 7, 16, 15, 12, 8))
+
+
+class TestDebugData:
+    def test_lazy(self, monkeypatch):
+        calls = []
+        printable_data = XMLParser.printable_data
+
+        def count_printable_data(parser, pretty=True):
+            calls.append(pretty)
+            return printable_data(parser, pretty)
+        monkeypatch.setattr(XMLParser, 'printable_data', count_printable_data)
+
+        parser = get_parser(COORD_RESULT.replace('omc="5113000" ', '', 1))
+        with pytest.raises(KeyError) as excinfo:
+            parser.stop.city.ids
+        assert isinstance(excinfo.value.args[0], ParserDebugMessage)
+        assert not calls
+        assert '### CHOO DEBUG INFO:\n<coordInfoItem' in str(excinfo.value.args[0])
+        assert calls == [False, True]
+        assert 'CHOO DEBUG INFO' in str(excinfo.value)
+        assert calls == [False, True]
+
+        error = ParserError(parser, 'Unknown coordInfoItem type')
+        assert str(error) == 'Unknown coordInfoItem type'
+        assert len(calls) == 2
+        assert error.pretty_data.startswith('<coordInfoItem')
+
+    def test_max_length(self):
+        parser = get_parser()
+        data = get_debug_data(parser, max_length=100)
+        assert data.startswith(parser.printable_data(pretty=False)[:100])
+        assert data.endswith('characters omitted)')
+        assert get_debug_data(parser) == parser.printable_data()
@@ -0,0 +1,182 @@
+import asyncio
+from time import monotonic, sleep
+
+import pytest
+import requests
+
+from choo.apis.deadlines import Deadline, get_deadline
+from choo.apis.policy import CircuitBreaker, TokenBucket, UpstreamPolicy
+from choo.exceptions import CircuitOpenError, DeadlineExceeded
+
+
+class FlakyUpstream:
+    def __init__(self, failures, exception=requests.ConnectionError):
+        self.failures = failures
+        self.exception = exception
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.exception()
+        return 'result'
+
+
+class TestUpstreamPolicy:
+    def test_retries(self):
+        policy = UpstreamPolicy(backoff=0, failure_threshold=None)
+        upstream = FlakyUpstream(2)
+        assert policy.call(upstream) == 'result'
+        assert upstream.calls == 3
+
+        upstream = FlakyUpstream(3)
+        with pytest.raises(requests.ConnectionError):
+            policy.call(upstream)
+        assert upstream.calls == 3
+
+        upstream = FlakyUpstream(1, ValueError)
+        with pytest.raises(ValueError):
+            policy.call(upstream)
+        assert upstream.calls == 1
+
+    def test_acall(self):
+        policy = UpstreamPolicy(backoff=0, failure_threshold=1, reset_timeout=0, rate_limit=1000)
+        upstream = FlakyUpstream(1)
+
+        async def call():
+            return upstream()
+
+        async def cancelled():
+            raise asyncio.CancelledError
+
+        loop = asyncio.new_event_loop()
+        try:
+            assert loop.run_until_complete(policy.acall(call, host='a')) == 'result'
+            assert upstream.calls == 2
+            assert not policy.get_circuit_breaker('a').is_open
+
+            # a cancelled trial call does not count as a failure of the upstream
+            policy.get_circuit_breaker('b').record_failure()
+            with pytest.raises(asyncio.CancelledError):
+                loop.run_until_complete(policy.acall(cancelled, host='b'))
+            assert policy.get_circuit_breaker('b').is_open
+            assert loop.run_until_complete(policy.acall(call, host='b')) == 'result'
+            assert not policy.get_circuit_breaker('b').is_open
+        finally:
+            loop.close()
+
+    def test_backoff(self):
+        policy = UpstreamPolicy(backoff=1, max_backoff=3)
+        assert all(0 <= policy.get_backoff(attempt) <= 3 for attempt in range(10))
+
+    def test_deadline(self):
+        policy = UpstreamPolicy(timeout=(3.05, 10), backoff=0.2, max_backoff=0.2)
+        assert policy.get_timeout() == (3.05, 10)
+        with Deadline(1):
+            assert all(timeout <= 1 for timeout in policy.get_timeout())
+            with Deadline(5):
+                assert all(timeout <= 1 for timeout in policy.get_timeout())
+        assert get_deadline() is None
+
+        def slow_upstream():
+            sleep(0.05)
+            raise requests.Timeout()
+
+        with Deadline(0.02):
+            with pytest.raises(DeadlineExceeded):
+                policy.call(slow_upstream)
+        assert not policy.circuit_breaker._failures
+
+        # the backoff is random, so it is fixed to be longer than the remaining time
+        policy.get_backoff = lambda attempt: 0.2
+        upstream = FlakyUpstream(1)
+        with Deadline(0.01):
+            with pytest.raises(DeadlineExceeded):
+                policy.call(upstream)
+        assert upstream.calls <= 1
+
+    def test_circuit_breaker(self):
+        policy = UpstreamPolicy(retries=0, failure_threshold=2, reset_timeout=0.05)
+        upstream = FlakyUpstream(2)
+        for i in range(2):
+            with pytest.raises(requests.ConnectionError):
+                policy.call(upstream)
+        assert policy.circuit_breaker.is_open
+        with pytest.raises(CircuitOpenError):
+            policy.call(upstream)
+        assert upstream.calls == 2
+
+        start = monotonic()
+        while monotonic() - start < 0.05:
+            pass
+        assert policy.call(upstream) == 'result'
+        assert not policy.circuit_breaker.is_open
+
+    def test_circuit_breaker_hosts(self):
+        policy = UpstreamPolicy(retries=0, failure_threshold=1)
+        with pytest.raises(requests.ConnectionError):
+            policy.call(FlakyUpstream(1), host='primary')
+        assert policy.get_circuit_breaker('primary').is_open
+        with pytest.raises(CircuitOpenError):
+            policy.call(FlakyUpstream(0), host='primary')
+        assert policy.call(FlakyUpstream(0), host='mirror') == 'result'
+        assert not policy.circuit_breaker.is_open
+        assert UpstreamPolicy(failure_threshold=None).get_circuit_breaker('primary') is None
+
+    def test_circuit_breaker_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_failure()
+        assert breaker.is_open
+
+    def test_circuit_breaker_aborted_trial(self):
+        policy = UpstreamPolicy(retries=0, failure_threshold=1, reset_timeout=0)
+        policy.circuit_breaker.record_failure()
+
+        def slow_upstream():
+            sleep(0.05)
+            raise requests.Timeout()
+
+        with Deadline(0.02):
+            with pytest.raises(DeadlineExceeded):
+                policy.call(slow_upstream)
+        assert policy.circuit_breaker.is_open
+        assert policy.call(FlakyUpstream(0)) == 'result'
+        assert not policy.circuit_breaker.is_open
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=50, burst=2)
+        start = monotonic()
+        for i in range(4):
+            bucket.acquire()
+        assert monotonic() - start >= 0.035
+
+    def test_token_bucket_deadline(self):
+        bucket = TokenBucket(rate=1, burst=1)
+        bucket.acquire()
+        start = monotonic()
+        with Deadline(0.05):
+            with pytest.raises(DeadlineExceeded):
+                bucket.acquire()
+        assert monotonic() - start < 0.5
+
+        loop = asyncio.new_event_loop()
+        try:
+            with Deadline(0.05):
+                with pytest.raises(DeadlineExceeded):
+                    loop.run_until_complete(bucket.aacquire())
+        finally:
+            loop.close()
+
+        policy = UpstreamPolicy(rate_limit=1, failure_threshold=1, reset_timeout=0)
+        policy.rate_limiter.acquire()
+        policy.circuit_breaker.record_failure()
+        with Deadline(0.05):
+            with pytest.raises(DeadlineExceeded):
+                policy.call(FlakyUpstream(0))
+        # the trial call that was aborted while waiting for a token is released
+        policy.rate_limiter = None
+        assert policy.call(FlakyUpstream(0)) == 'result'
@@ -0,0 +1,74 @@
+import asyncio
+from threading import Event, Thread
+from time import sleep
+
+import pytest
+
+from choo.apis.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    def test_coalesce(self):
+        flight = SingleFlight()
+        started, release = Event(), Event()
+        calls = []
+
+        def func(value):
+            calls.append(value)
+            started.set()
+            release.wait(5)
+            return value
+
+        results = []
+        leader = Thread(target=lambda: results.append(flight.do('key', func, 1)))
+        leader.start()
+        started.wait(5)
+        followers = [Thread(target=lambda: results.append(flight.do('key', func, 2))) for i in range(5)]
+        for thread in followers:
+            thread.start()
+        sleep(0.2)
+        release.set()
+        for thread in [leader]+followers:
+            thread.join()
+
+        assert calls == [1]
+        assert results == [1]*6
+        assert len(flight) == 0
+        assert flight.do('key', func, 3) == 3
+
+    def test_exception(self):
+        flight = SingleFlight()
+
+        def func():
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            flight.do('key', func)
+        assert len(flight) == 0
+
+    def test_ado(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def func(value):
+            calls.append(value)
+            await asyncio.sleep(0.05)
+            return value
+
+        async def cancelled_follower():
+            follower = asyncio.ensure_future(flight.ado('key', func, 2))
+            await asyncio.sleep(0.01)
+            follower.cancel()
+            return await flight.ado('key', func, 3)
+
+        async def run():
+            return await asyncio.gather(flight.ado('key', func, 1), cancelled_follower(), flight.ado('other', func, 4))
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(run())
+            assert calls == [1, 4]
+            assert results == [1, 1, 4]
+            assert len(flight) == 0
+        finally:
+            loop.close()
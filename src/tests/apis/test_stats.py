@@ -0,0 +1,38 @@
+import pytest
+
+from choo.apis import parsers
+from choo.apis.stats import ParserStats
+from tests.utils import replay_coord_request
+
+
+class TestParserStats:
+    def test_record(self):
+        with ParserStats() as stats:
+            assert parsers._parser_stats is stats
+            replay_coord_request()
+        assert parsers._parser_stats is None
+
+        items = {key: (calls, seconds, exceptions) for key, calls, seconds, exceptions in stats.items()}
+        assert items['CoordInfoPlatform.area'][0] == 2
+        assert items['CoordInfoStop.ids'][0] == 2
+        assert items['CoordInfoStop._attrs'][0] == 2
+        assert all(seconds >= 0 and not exceptions for calls, seconds, exceptions in items.values())
+        assert len(stats.table().split('\n')) == len(items)+1
+
+        replay_coord_request()
+        assert stats.items()[0][1] == items[stats.items()[0][0]][0]
+
+    def test_exceptions(self):
+        stats = ParserStats()
+
+        def fail():
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            stats.measure(stats, 'fail', fail)
+        assert stats.measure(stats, 'name', lambda: 42) == 42
+        assert [(key, calls, exceptions) for key, calls, seconds, exceptions in sorted(stats.items())] == [
+            ('ParserStats.fail', 1, 1), ('ParserStats.name', 1, 0)
+        ]
+        stats.reset()
+        assert not stats.items()
@@ -0,0 +1,138 @@
+import asyncio
+from threading import current_thread
+from time import monotonic, sleep
+
+import pytest
+
+from choo.apis import vrr
+from choo.apis.deadlines import Deadline
+from choo.apis.efa.requests.stopfinder import StopfinderRequest
+from choo.apis.policy import UpstreamPolicy
+from choo.apis.transports import LiveTransport, RecordingTransport, ReplayTransport, StreamedResponse
+from choo.exceptions import DeadlineExceeded
+from tests.utils import StaticTransport
+
+
+class TestTransports:
+    request = StopfinderRequest.__new__(StopfinderRequest)
+    url = vrr.base_url+'XML_STOPFINDER_REQUEST'
+    body = '<?xml version="1.0" encoding="ISO-8859-1"?><itdRequest name="Süd"/>'.encode('iso-8859-1')
+
+    def test_recording(self):
+        transport = RecordingTransport(StaticTransport(self.body))
+        assert transport.fetch(self.request, 'POST', self.url, {'name_sf': 'Süd'}) == self.body
+        assert transport.requests_dump == [{
+            'method': 'POST',
+            'url': self.url,
+            'data': {'name_sf': 'Süd'},
+            'result': '<?xml version="1.0" encoding="ISO-8859-1"?><itdRequest name="Süd"/>',
+        }]
+
+    def test_replay(self):
+        requests_dump = [
+            {'method': 'POST', 'url': self.url, 'data': {'name_sf': 'A', 'limit': 1}, 'result': 'a'},
+            {'method': 'POST', 'url': self.url, 'data': {'name_sf': 'B'}, 'result': 'b'},
+            {'method': 'POST', 'url': self.url, 'data': {'name_sf': 'A', 'limit': 1}, 'result': 'c'},
+        ]
+        transport = ReplayTransport(requests_dump)
+        assert len(transport) == 3
+        assert transport.fetch(self.request, 'POST', self.url, {'name_sf': 'B'}) == 'b'
+        assert transport.fetch(self.request, 'POST', self.url, {'limit': 1, 'name_sf': 'A'}) == 'a'
+        assert transport.fetch(self.request, 'POST', self.url, {'limit': 1, 'name_sf': 'A'}) == 'c'
+        with pytest.raises(AssertionError):
+            transport.fetch(self.request, 'POST', self.url, {'name_sf': 'B'})
+
+        transport = ReplayTransport(requests_dump, ordered=True)
+        assert [transport.fetch(self.request, 'POST', self.url) for i in range(3)] == ['a', 'b', 'c']
+        with pytest.raises(AssertionError):
+            transport.fetch(self.request, 'POST', self.url)
+
+    def test_passthrough(self):
+        live = StaticTransport(self.body)
+        transport = ReplayTransport([{'method': 'GET', 'url': self.url, 'result': 'a'}], passthrough=live)
+        assert transport.fetch(self.request, 'GET', self.url) == self.body
+        assert live.calls == 1
+        assert len(transport) == 0
+
+    def test_streamed_response(self):
+        class Response:
+            closed = False
+
+            def iter_content(self, chunk_size):
+                return iter((b'abc', b'defg'))
+
+            def close(self):
+                self.closed = True
+
+        completed = []
+        stream = StreamedResponse(Response(), completed.append)
+        assert stream.read(2) == b'ab'
+        assert stream.read(3) == b'cde'
+        assert not stream.response.closed
+        assert stream.read() == b'fg'
+        assert stream.read(1) == b''
+        assert stream.response.closed and completed == [b'abcdefg']
+
+        # a response that was closed early is not completed
+        stream = StreamedResponse(Response(), completed.append)
+        assert stream.read(1) == b'a'
+        stream.close()
+        assert stream.read() == b''
+        assert stream.response.closed and len(completed) == 1
+
+    def test_afetch(self):
+        transport = RecordingTransport(ReplayTransport([{'method': 'GET', 'url': self.url, 'result': 'a'}]))
+        loop = asyncio.new_event_loop()
+        try:
+            assert loop.run_until_complete(transport.afetch(self.request, 'GET', self.url)) == 'a'
+        finally:
+            loop.close()
+        assert transport.requests_dump == [{'method': 'GET', 'url': self.url, 'result': 'a'}]
+
+    def test_hedge(self):
+        closed = []
+        threads = {}
+
+        class Response:
+            def __init__(self, url):
+                self.url = url
+
+            def close(self):
+                closed.append(self.url)
+
+        def mirror(url):
+            threads[url] = current_thread()
+            if url.startswith('slow'):
+                sleep(0.1)
+            if url.endswith('broken'):
+                raise ValueError
+            return Response(url)
+
+        transport = LiveTransport(debug=False)
+        policy = UpstreamPolicy(retries=0)
+
+        # the first url is called in the current thread, the next one only if there was no result in time
+        assert transport._hedge(policy, mirror, ('fast', 'unused'), 0.05).url == 'fast'
+        assert threads == {'fast': current_thread()}
+        assert transport._hedge(policy, mirror, ('slow', 'fast'), 0.02).url == 'slow'
+        assert threads['slow'] is current_thread() and threads['fast'] is not current_thread()
+        assert closed == ['fast']
+
+        # if the first call fails, the result of the hedge request that is already on its way is used
+        start = monotonic()
+        assert transport._hedge(policy, mirror, ('slowbroken', 'fast'), 0.02).url == 'fast'
+        assert monotonic() - start < 0.15
+
+        # failed requests are hedged immediately
+        start = monotonic()
+        assert transport._hedge(policy, mirror, ('broken', 'fast'), 1).url == 'fast'
+        assert monotonic() - start < 1
+        with pytest.raises(ValueError):
+            transport._hedge(policy, mirror, ('broken', 'broken'), 0.01)
+
+        # waiting for the hedge requests is limited by the deadline
+        start = monotonic()
+        with Deadline(0.03):
+            with pytest.raises(DeadlineExceeded):
+                transport._hedge(policy, mirror, ('broken', 'slow'), 1)
+        assert monotonic() - start < 0.1
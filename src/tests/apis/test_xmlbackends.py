@@ -0,0 +1,52 @@
+import os
+from io import BytesIO
+
+import pytest
+from defusedxml import EntitiesForbidden
+
+from choo.apis import vrr
+from choo.apis.transports import ReplayTransport
+from choo.apis.xmlbackends import ElementTreeBackend, XPath, tostring
+from choo.efaserver import load_recordings
+
+DOCUMENT = '<?xml version="1.0" encoding="ISO-8859-1"?><a name="Süd"><b><c>1</c></b><b><c>2</c></b><b/></a>'
+ENTITIES = b'<?xml version="1.0"?><!DOCTYPE a [<!ENTITY e "ee"><!ENTITY f "&e;&e;">]><a>&f;</a>'
+EXTERNAL = b'<?xml version="1.0"?><!DOCTYPE a [<!ENTITY e SYSTEM "file:///etc/passwd">]><a>&e;</a>'
+
+
+class TestXMLBackends:
+    def test_parse(self, xml_backend):
+        for data in (DOCUMENT, DOCUMENT.encode('iso-8859-1')):
+            root = xml_backend.fromstring(data)
+            assert root.attrib['name'] == 'Süd'
+            assert tostring(root).startswith('<a name="Süd"><b><c>1</c></b>')
+
+        events = list(xml_backend.iterparse(BytesIO(DOCUMENT.encode('iso-8859-1'))))
+        assert [(event, element.tag) for event, element in events[:3]] == [
+            ('start', 'a'), ('start', 'b'), ('start', 'c')
+        ]
+
+    def test_entities_forbidden(self, xml_backend):
+        for data in (ENTITIES, EXTERNAL):
+            with pytest.raises(EntitiesForbidden):
+                xml_backend.fromstring(data)
+            with pytest.raises(EntitiesForbidden):
+                list(xml_backend.iterparse(BytesIO(data)))
+
+    def test_xpath(self, xml_backend):
+        root = xml_backend.fromstring(DOCUMENT)
+        assert [c.text for c in XPath('./b/c').findall(root)] == ['1', '2']
+        assert XPath('./b/c').find(root).text == '1'
+        assert XPath('./b/c').findtext(root) == '1'
+        assert XPath('./d').find(root) is None
+        assert XPath('./d').findtext(root, 'default') == 'default'
+
+    def test_query(self, lxml_backend, monkeypatch):
+        path = os.path.join(os.path.dirname(__file__), 'efa', 'test_vrr.py')
+        results = []
+        for backend in (ElementTreeBackend(), lxml_backend):
+            monkeypatch.setattr(vrr, 'transport', ReplayTransport(load_recordings(path), ordered=True))
+            monkeypatch.setattr(vrr, 'xml_backend', backend)
+            results.append(vrr.platforms.where(stop__name='Essen Hbf').execute().serialize())
+        assert results[0]['results']
+        assert results[0] == results[1]
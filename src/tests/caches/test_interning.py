@@ -0,0 +1,45 @@
+from choo.apis import vrr
+from choo.caches import InternPool
+from choo.models import City, Stop
+from choo.types import Coordinates, FrozenIDs
+from tests.utils import replay_coord_request
+
+
+def get_stop(name='Hauptbahnhof', city_name='Essen'):
+    city = City.Sourced(vrr, name=city_name, ids=FrozenIDs({'vrr': 'placeID:5113000:18'}))
+    return Stop.Sourced(vrr, name=name, city=city, coords=Coordinates(51.451137, 7.012941),
+                        ids=FrozenIDs({'vrr': '20009289'}))
+
+
+class TestInternPool:
+    def test_intern(self):
+        pool = InternPool()
+        stop = pool.intern(get_stop())
+        assert pool.intern(get_stop()) is stop
+        assert pool.intern(get_stop('Rathaus')).city is stop.city
+        assert pool.intern(get_stop(city_name='Duisburg')) is not stop
+        assert stop | pool.intern(get_stop()) is stop
+        assert len(pool) == 5 and pool.hits == 5
+
+        stop = Stop(name='Hauptbahnhof')
+        assert pool.intern(stop) is stop
+
+    def test_maxsize(self):
+        pool = InternPool(maxsize=2)
+        stop = pool.intern(get_stop())
+        assert len(pool) == 2
+        pool.intern(get_stop(city_name='Duisburg'))
+        assert len(pool) == 2
+        assert pool.intern(get_stop()) is not stop
+        pool.clear()
+        assert not len(pool) and not pool.hits
+
+    def test_api(self, monkeypatch):
+        request, results = replay_coord_request()
+        monkeypatch.setattr(vrr, 'intern_pool', InternPool())
+        request, interned_results = replay_coord_request()
+        assert interned_results == results
+
+        request, results = replay_coord_request(stream=True)
+        assert results[0]['stop']['city'] == results[1]['stop']['city']
+        assert vrr.intern_pool.hits
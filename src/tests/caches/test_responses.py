@@ -0,0 +1,42 @@
+from choo.apis import vrr
+from choo.apis.requests import request_fingerprint
+from choo.caches import ResponseCache
+
+
+class TestResponseCache:
+    def test_fingerprint(self):
+        url = 'http://efa.vrr.de/standard/XML_STOPFINDER_REQUEST'
+        assert (request_fingerprint('POST', url, {'name_sf': 'Essen', 'type_sf': 'any'}) ==
+                request_fingerprint('POST', url, {'type_sf': 'any', 'name_sf': 'Essen'}))
+        assert (request_fingerprint('POST', url, {'name_sf': 'Essen'}) !=
+                request_fingerprint('POST', url, {'name_sf': 'Bochum'}))
+        assert request_fingerprint('GET', url) != request_fingerprint('POST', url)
+
+    def test_ttl(self):
+        cache = ResponseCache(ttls={'XML_COORD_REQUEST': 10}, default_ttl=5)
+        assert cache.get_ttl('XML_COORD_REQUEST', vrr.response_ttls) == 10
+        stopfinder_ttl = vrr.response_ttls['XML_STOPFINDER_REQUEST']
+        assert cache.get_ttl('XML_STOPFINDER_REQUEST', vrr.response_ttls) == stopfinder_ttl
+        assert cache.get_ttl('XML_TRIP_REQUEST2', vrr.response_ttls) == 5
+
+        assert cache.set('a', b'<a/>', ttl=0) is None
+        assert cache.get('a') is None
+        cache.set('a', b'<a/>', ttl=-1)
+        assert cache.get('a') is None
+
+    def test_lru(self):
+        cache = ResponseCache(maxsize=2)
+        cache.set('a', b'<a/>', ttl=10)
+        cache.set('b', b'<b/>', ttl=10)
+        assert cache.get('a').body == b'<a/>'
+        cache.set('c', b'<c/>', ttl=10)
+        assert cache.get('b') is None
+        assert cache.get('a').body == b'<a/>'
+        assert len(cache) == 2
+
+    def test_directory(self, tmpdir):
+        ResponseCache(directory=str(tmpdir)).set('a', '<ä/>'.encode(), ttl=10)
+        cache = ResponseCache(directory=str(tmpdir))
+        assert cache.get('a').body == '<ä/>'.encode()
+        cache.clear()
+        assert ResponseCache(directory=str(tmpdir)).get('a') is None
@@ -0,0 +1,24 @@
+import pytest
+
+from choo.apis.xmlbackends import ElementTreeBackend, LXMLBackend
+
+
+def get_lxml_backend():
+    pytest.importorskip('lxml')
+    return LXMLBackend()
+
+
+@pytest.fixture
+def lxml_backend():
+    """
+    An LXMLBackend. The test is skipped if lxml is not installed.
+    """
+    return get_lxml_backend()
+
+
+@pytest.fixture(params=('etree', 'lxml'))
+def xml_backend(request):
+    """
+    Each XML backend. The lxml case is skipped if lxml is not installed.
+    """
+    return get_lxml_backend() if request.param == 'lxml' else ElementTreeBackend()
@@ -1,8 +1,14 @@
+import pickle
+from copy import deepcopy
+from datetime import datetime
+
 import pytest
 
 from choo.apis import vrr
-from choo.models import City, Stop
-from choo.models.sourced import SourcedModelMixin
+from choo.apis.efa.parsers.odv import OdvNameElemStop
+from choo.models import City, IDIndex, Stop
+from choo.models.sourced import LazySourcedModelMixin, SourcedModelMixin
+from choo.types import Coordinates, FrozenIDs, IDs, Serializable
 
 
 class TestModel:
@@ -14,6 +20,18 @@ class TestModel:
         with pytest.raises(TypeError):
             Stop(city=27)
 
+    def test_data(self):
+        stop = Stop(name='Essen Hbf', city=City(name='Essen'), coords=Coordinates(51.451137, 7.012941))
+        assert isinstance(stop._data, Stop._Data) and not hasattr(stop._data, '__dict__')
+        assert not isinstance(stop, tuple) and stop.__dict__ == {'_data': stop._data}
+        assert not hasattr(stop.coords, '__dict__') and not hasattr(stop.ids, '__dict__')
+        assert stop.address is None and isinstance(stop.ids, IDs)
+        assert dict(stop._data.items()) == {'name': 'Essen Hbf', 'city': stop.city, 'coords': stop.coords,
+                                            'ids': stop.ids}
+        for copied in (deepcopy(stop), pickle.loads(pickle.dumps(stop))):
+            assert copied.serialize() == stop.serialize()
+            assert copied.city is not stop.city
+
     def test_serializing(self):
         serialized = {
             '@type': 'stop',
@@ -55,6 +73,27 @@ class TestSourcedModelMixin:
         with pytest.raises(TypeError):
             Stop.Sourced.from_parser(City)
 
+    def test_new(self):
+        stop = Stop.Sourced(vrr, name='Hauptbahnhof', city=City(name='Essen'), ids=IDs({'vrr': '20009289'}))
+        assert isinstance(stop.city, City.Sourced) and stop.city.source == vrr
+        assert isinstance(stop.ids, FrozenIDs) and stop.ids['vrr'] == '20009289'
+        assert isinstance(Stop.Sourced(vrr).ids, FrozenIDs)
+        assert Stop.Sourced(vrr, city=self.sourced_city).city is self.sourced_city
+        kwargs = {'name': 'Hauptbahnhof', 'city': City(name='Essen'), 'ids': IDs({'vrr': '20009289'})}
+        # the generated constructor does the same as the generic one
+        assert Stop.Sourced.__new__ is not SourcedModelMixin.__new__
+        assert (Stop.Sourced(vrr, **kwargs).serialize() ==
+                SourcedModelMixin.__new__(Stop.Sourced, vrr, **kwargs).serialize())
+
+        with pytest.raises(TypeError):
+            Stop.Sourced(vrr, name=42)
+        with pytest.raises(TypeError):
+            Stop.Sourced(vrr, city=Stop())
+        with pytest.raises(TypeError):
+            Stop.Sourced(vrr, invalid_field='Essen')
+        with pytest.raises(TypeError):
+            Stop.Sourced('vrr', name='Hauptbahnhof')
+
     def test_mutable(self):
         assert self.sourced_city.mutable().serialize() == {
             "@type": "city",
@@ -82,6 +121,57 @@ class TestSourcedModelMixin:
             self.sourced_city.choo_testing_property
 
 
+class TestLazySourcedModelMixin:
+    data = ('<odvNameElem anyType="stop" gid="de:5113:9159" id="20009159" locality="Essen" '
+            'objectName="Borbeck Süd Bahnhof" omc="5113000" stopID="20009159" x="6954254" y="51462987">'
+            'Essen, Borbeck Süd Bahnhof<odvPlaceElem omc="5113000" stateless="placeID:5113000:18">Essen</odvPlaceElem>'
+            '</odvNameElem>')
+
+    def get_parser(self):
+        return OdvNameElemStop.parse(vrr, datetime(2016, 7, 2, 12, 33, 50), self.data)
+
+    def test_lazy(self):
+        parser = self.get_parser()
+        stop = parser.lazy_sourced()
+        assert isinstance(stop, Stop.Sourced) and isinstance(stop, LazySourcedModelMixin)
+        assert stop.source == vrr
+        assert stop.name == 'Borbeck Süd Bahnhof'
+        assert 'name' in parser.__dict__ and 'city' not in parser.__dict__ and 'coords' not in parser.__dict__
+
+        assert isinstance(stop.city, City.LazySourced)
+        assert stop.city.name == 'Essen'
+        assert stop.materialize().serialize() == self.get_parser().sourced().serialize()
+        assert stop.__dict__['_parser'] is None
+
+    def test_only(self):
+        stop = self.get_parser().lazy_sourced()
+        assert type(stop.city.from_object(vrr, stop.city)) is City.Sourced
+        assert Stop.Sourced.from_object(vrr, stop, ('name', 'city__name')).serialize() == {
+            '@type': 'stop.sourced',
+            'source': 'vrr',
+            'city': {
+                '@type': 'city.sourced',
+                'source': 'vrr',
+                'name': 'Essen',
+            },
+            'name': 'Borbeck Süd Bahnhof',
+        }
+
+    def test_serializing(self):
+        stop = self.get_parser().lazy_sourced()
+        serialized = stop.serialize()
+        assert serialized == self.get_parser().sourced().serialize()
+        assert type(Serializable.unserialize(serialized)) is Stop.Sourced
+        assert stop.mutable().serialize() == self.get_parser().mutable().serialize()
+
+    def test_immutable(self):
+        stop = self.get_parser().lazy_sourced()
+        with pytest.raises(TypeError):
+            stop.name = 'Essen Hbf'
+        with pytest.raises(TypeError):
+            Stop.LazySourced(vrr, name='Essen Hbf')
+
+
 class TestModelWithIDs:
     city1 = {
         "@type": "city",
@@ -109,3 +199,32 @@ class TestModelWithIDs:
         assert (City.unserialize(self.city1) == City.unserialize(self.city2)) is None
         assert (City.unserialize(self.city1) == Stop()) is False
         assert (City.unserialize(self.city1) == 42) is False
+
+    def test_hash(self):
+        city = City.unserialize(self.city1)
+        for obj in (city, City.Sourced(vrr, name='Essen', ids=FrozenIDs(city.ids))):
+            with pytest.raises(TypeError):
+                hash(obj)
+        assert len(IDIndex([city, City.unserialize(self.city1), City.unserialize(self.city2)])) == 2
+        assert hash(FrozenIDs({'de': '05113000'})) == hash(FrozenIDs({'de': '05113000'}))
+
+
+class TestIDIndex:
+    def test_groups(self):
+        stops = [
+            Stop(name='a', ids=IDs({'vrr': '1'})),
+            Stop(name='b', ids=IDs({'vrr': '2'})),
+            Stop(name='c', ids=IDs({'vrr': '1', 'de': 'x'})),
+            Stop(name='d', ids=IDs({'de': 'x', 'vrr': '3'})),
+            Stop(name='e'),
+            City(name='f', ids=IDs({'vrr': '1'})),
+        ]
+        index = IDIndex(stops)
+        assert [[stop.name for stop in group] for group in index.groups()] == [['a', 'c', 'd'], ['b'], ['e'], ['f']]
+        assert [stop.name for stop in index.unique()] == ['a', 'b', 'e', 'f']
+        assert len(index) == 4
+        assert [stop.name for stop in index.get_group(Stop(ids=IDs({'vrr': '3'})))] == ['a', 'c', 'd']
+        assert Stop(ids=IDs({'de': 'x'})) in index
+        assert Stop(ids=IDs({'de': 'y'})) not in index
+        with pytest.raises(TypeError):
+            index.add(42)
@@ -1,8 +1,16 @@
+import asyncio
+from time import sleep
+
 import pytest
 
 from choo.apis import vrr
+from choo.apis.deadlines import check_deadline, get_deadline
+from choo.apis.transports import ReplayTransport
+from choo.exceptions import DeadlineExceeded
 from choo.models import Stop
-from choo.types import Coordinates, Serializable
+from choo.queries import GeoPointFrame
+from choo.types import Coordinates, IDs, Serializable
+from tests.utils import COORD_RESULT
 
 
 class TestQuery:
@@ -20,6 +28,13 @@ class TestQuery:
         assert query.max_distance(500).settings.max_distance == 500
         assert query.limit(10).settings.limit == 10
 
+        # the original query is not changed
+        limited = query.limit(5).timeout(1).only('name')
+        assert (query.settings.limit, query.settings.timeout, query.settings.only) == (None, None, None)
+        assert limited.max_distance(500).settings.max_distance == 500
+        assert limited.settings.max_distance == 1000
+        assert (limited.settings.limit, limited.settings.timeout, limited.settings.only) == (5, 1, ('name', ))
+
         with pytest.raises(AttributeError):
             query.settings.whatever
         with pytest.raises(TypeError):
@@ -53,3 +68,162 @@ class TestQuery:
         query.set_results_generator(results, nocache=True)
         assert tuple(query) == results
         assert tuple(query) == results
+
+    def test_async(self):
+        query = vrr.stops
+        results = (Stop(city__name='Essen', name='Hauptbahnhof'), )
+        query.set_results_generator(results, nocache=True)
+
+        async def collect():
+            collected = []
+            async for stop in query:
+                collected.append(stop)
+            return tuple(collected)
+
+        loop = asyncio.new_event_loop()
+        try:
+            assert loop.run_until_complete(collect()) == results
+            assert loop.run_until_complete(query.aexecute()) is query
+            with pytest.raises(TypeError):
+                loop.run_until_complete(Stop.Query().aexecute())
+        finally:
+            loop.close()
+
+    def test_aexecute(self, monkeypatch):
+        def run_async(api, func, *args):
+            raise AssertionError('The query should not be executed in the executor.')
+
+        recording = {'method': 'POST', 'url': vrr.base_url+'XML_COORD_REQUEST', 'result': COORD_RESULT}
+        monkeypatch.setattr(vrr, 'transport', ReplayTransport([recording], ordered=True))
+        monkeypatch.setattr(type(vrr), 'run_async', run_async)
+        query = vrr.platforms.where(coords=Coordinates(51.451137, 7.012941)).max_distance(400)
+
+        loop = asyncio.new_event_loop()
+        try:
+            assert loop.run_until_complete(query.aexecute()) is query
+        finally:
+            loop.close()
+        assert [platform.name for platform in query] == ['2', 'Gleis 1']
+
+    def test_get_many(self, monkeypatch):
+        calls = []
+
+        def get_uncached(query, obj, deadline=None):
+            calls.append(obj.name)
+            if obj.name == 'Nowhere':
+                return None
+            return Stop.Sourced(vrr, ids=IDs({'vrr': obj.name}), name=obj.name)
+
+        monkeypatch.setattr(type(vrr.stops), '_get_uncached', get_uncached)
+        query = vrr.stops
+        objs = [Stop(name='Hauptbahnhof'), Stop(name='Nowhere'), Stop(name='Rathaus'), Stop(name='Hauptbahnhof')]
+        results = query.get_many(objs, concurrency=2)
+        assert [(r.name if r is not None else None) for r in results] == ['Hauptbahnhof', None, 'Rathaus',
+                                                                          'Hauptbahnhof']
+        assert results[0] is results[3]
+        assert sorted(calls) == ['Hauptbahnhof', 'Nowhere', 'Rathaus']
+
+        # results of this API are taken from the query's cache
+        assert query.get_many([Stop(ids=IDs({'vrr': 'Rathaus'}))]) == [results[2]]
+        assert len(calls) == 3
+
+        with pytest.raises(TypeError):
+            query.get_many(objs, concurrency=0)
+        with pytest.raises(TypeError):
+            Stop.Query().get_many(objs)
+
+    def test_timeout(self, monkeypatch):
+        deadlines = []
+
+        def execute(query):
+            yield Stop.Sourced(vrr, name='Hauptbahnhof')
+            deadlines.append(get_deadline())
+            sleep(0.05)
+            check_deadline()
+            yield Stop.Sourced(vrr, name='Rathaus')
+
+        monkeypatch.setattr(type(vrr.stops), '_execute', execute)
+        assert len(list(vrr.stops)) == 2
+        assert vrr.stops.timeout(1).settings.timeout == 1
+        with pytest.raises(DeadlineExceeded):
+            list(vrr.stops.timeout(0.01))
+        assert deadlines[0] is None and deadlines[1] is not None
+        assert get_deadline() is None
+
+        with pytest.raises(TypeError):
+            vrr.stops.timeout(0)
+
+    def test_only(self, monkeypatch):
+        query = vrr.platforms.where(coords=Coordinates(51.451137, 7.012941))
+        assert query.only('name', 'stop__city__name', 'stop__name').settings.only == ('name', 'stop__city__name',
+                                                                                      'stop__name')
+        assert Serializable.unserialize(query.only('name').serialize()).settings.only == ('name', )
+        assert query.only(None).settings.only is None
+        with pytest.raises(TypeError):
+            query.only('invalid_field')
+
+        recording = {'method': 'POST', 'url': vrr.base_url+'XML_COORD_REQUEST', 'result': COORD_RESULT}
+        monkeypatch.setattr(vrr, 'transport', ReplayTransport([recording], ordered=True, repeat=True))
+        results = list(query.only('name', 'stop__city__name', 'stop__name'))
+        assert results[1].serialize() == {
+            '@type': 'platform.sourced',
+            'source': 'vrr',
+            'stop': {
+                '@type': 'stop.sourced',
+                'source': 'vrr',
+                'city': {
+                    '@type': 'city.sourced',
+                    'source': 'vrr',
+                    'name': 'Essen',
+                },
+                'name': 'Hauptbahnhof',
+            },
+            'name': 'Gleis 1',
+        }
+        ways = list(query.only('name').ways())
+        assert ways[0].distance and ways[0].destination.coords is None
+
+    def test_to_frame(self, monkeypatch):
+        query = vrr.platforms.where(coords=Coordinates(51.451137, 7.012941))
+        with pytest.raises(TypeError):
+            query.to_frame('invalid_field')
+
+        recording = {'method': 'POST', 'url': vrr.base_url+'XML_COORD_REQUEST', 'result': COORD_RESULT}
+        monkeypatch.setattr(vrr, 'transport', ReplayTransport([recording], ordered=True, repeat=True))
+        frame = query.to_frame('stop__name')
+        assert query.settings.only is None
+        assert len(frame) == 2
+        assert frame[1] == {
+            'type': 'platform',
+            'lat': 51.45148,
+            'lon': 7.01253,
+            'distance': frame.distance[1],
+            'name': 'Gleis 1',
+            'ids': {'vrr': '20009289-3-1', 'ifopt': 'de:5113:9289:3:1'},
+            'stop__name': 'Hauptbahnhof',
+        }
+        assert [row['name'] for row in frame.sort_by_distance()] == ['2', 'Gleis 1']
+        assert Serializable.unserialize(frame.serialize()).serialize() == frame.serialize()
+
+
+class TestGeoPointFrame:
+    def test_columns(self):
+        stops = (
+            Stop(name='a', coords=Coordinates(51.45, 7.01), ids=IDs({'vrr': '1'})),
+            Stop(name='b'),
+            Stop(name='c', coords=Coordinates(51.46, 7.02), ids=IDs({'vrr': ('2', '3'), 'de': 'x'})),
+        )
+        frame = GeoPointFrame.from_results(stops, vrr, ('city__name', ))
+        assert frame.ids == {'vrr': ['1', None, ('2', '3')], 'de': [None, None, 'x']}
+        assert frame.fields == {'city__name': [None, None, None]}
+        assert [row['name'] for row in frame.within(51.455, 7.0, 51.47, 7.03)] == ['c']
+        assert frame.filter((True, False, False)).ids == {'vrr': ['1']}
+
+        distances = frame.distances_to(Coordinates(51.46, 7.02))
+        assert distances[0] == stops[0].coords.distance_to(stops[2].coords) and distances[2] == 0
+        assert [row['name'] for row in frame.sort_by_distance(Coordinates(51.46, 7.02))] == ['c', 'a', 'b']
+        assert [row['name'] for row in frame.sort_by_distance(Coordinates(51.46, 7.02), max_distance=100)] == ['c']
+
+        serialized = frame.serialize()
+        assert serialized['lat'] == [51.45, None, 51.46]
+        assert Serializable.unserialize(serialized).serialize() == serialized
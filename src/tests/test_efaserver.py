@@ -0,0 +1,89 @@
+import asyncio
+import os
+from time import monotonic
+
+import pytest
+import requests
+
+from choo.apis import EFA
+from choo.apis.policy import UpstreamPolicy
+from choo.efaserver import RecordedResponses, StandInServer, SyntheticResponses, load_recordings
+from choo.models import Platform, Stop
+from choo.types import Coordinates
+
+
+@pytest.fixture
+def server():
+    server = StandInServer(('127.0.0.1', 0), [])
+    server.start()
+    yield server
+    server.stop()
+
+
+class TestStandInServer:
+    def test_synthetic(self, server):
+        server.sources = [SyntheticResponses(size=5)]
+        api = EFA(name='standin_synthetic', base_url=server.base_url, preset='de')
+
+        stops = list(api.stops.where(name='Hauptbahnhof'))
+        assert len(stops) == 5
+        assert all(isinstance(stop, Stop) for stop in stops)
+        assert 'Hauptbahnhof' in [stop.name for stop in stops]
+        assert all(stop.city.name == 'Essen' for stop in stops)
+
+        platforms = list(api.platforms.where(coords=Coordinates(51.451137, 7.012941)).max_distance(400))
+        assert len(platforms) == 5
+        assert all(isinstance(platform, Platform) for platform in platforms)
+        assert api.transfer_stats.requests == 2
+
+    def test_recorded(self, server):
+        path = os.path.join(os.path.dirname(__file__), 'apis', 'efa', 'test_vrr.py')
+        server.sources = [RecordedResponses(load_recordings(path), strict=True)]
+        api = EFA(name='standin_recorded', base_url=server.base_url, preset='de')
+
+        platforms = list(api.platforms.where(stop__name='Essen Hbf'))
+        assert platforms
+        assert all(platform.stop.name == 'Hauptbahnhof' for platform in platforms)
+
+        with pytest.raises(requests.HTTPError):
+            list(api.stops.where(name='Unknown'))
+
+    def test_errors(self, server):
+        server.sources = [SyntheticResponses()]
+        server.error_rate = 1
+        api = EFA(name='standin_errors', base_url=server.base_url, preset='de',
+                  policy=UpstreamPolicy(retries=0, failure_threshold=None))
+        with pytest.raises(requests.HTTPError) as excinfo:
+            list(api.stops.where(name='Hauptbahnhof'))
+        assert excinfo.value.response.status_code == 503
+
+    def test_async(self, server):
+        pytest.importorskip('aiohttp')
+        server.sources = [SyntheticResponses(size=3)]
+        server.latency = 0.2
+        api = EFA(name='standin_async', base_url=server.base_url, preset='de')
+
+        async def run():
+            queries = [api.stops.where(name='Hauptbahnhof %d' % i) for i in range(10)]
+            return await asyncio.gather(*(query.aexecute() for query in queries))
+
+        loop = asyncio.new_event_loop()
+        try:
+            start = monotonic()
+            queries = loop.run_until_complete(run())
+            duration = monotonic() - start
+
+            # the requests were sent concurrently without using the executor
+            assert duration < 1
+            assert api._executor is None
+            assert all(len(list(query)) == 3 for query in queries)
+            assert api.transfer_stats.requests == 10
+
+            server.error_rate = 1
+            api.policy = UpstreamPolicy(retries=0, failure_threshold=None)
+            with pytest.raises(requests.HTTPError) as excinfo:
+                loop.run_until_complete(api.stops.where(name='Hauptbahnhof').aexecute())
+            assert excinfo.value.response.status_code == 503
+        finally:
+            loop.run_until_complete(api.aclose())
+            loop.close()
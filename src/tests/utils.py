@@ -0,0 +1,39 @@
+# flake8: noqa
+from choo.apis import vrr
+from choo.apis.efa.requests.coord import CoordRequest
+from choo.apis.transports import ReplayTransport, Transport
+from choo.models import Platform
+from choo.types import Coordinates
+
+COORD_RESULT = '''<?xml version="1.0" encoding="ISO-8859-1"?>
+<itdRequest version="10.0.43.44" language="de" now="2016-07-16T15:12:08" nowWD="7"><itdCoordInfoRequest requestID="0"><itdCoordInfo><coordInfoItemList>
+<coordInfoItem type="BUS_POINT" id="20009289-2-2" name="Hauptbahnhof" omc="5113000" placeID="18" locality="Essen" gisLayer="SYS-STOPPOINT" distance="42" stateless="20009289-2-2"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7013111</x><y>51451350</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value></value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Bay</value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>Bus</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:2:2</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>2</value></genAttrElem></genAttrList></coordInfoItem>
+<coordInfoItem type="BUS_POINT" id="20009289-3-1" name="Hauptbahnhof" omc="5113000" placeID="18" locality="Essen" gisLayer="SYS-STOPPOINT" distance="60" stateless="20009289-3-1"><itdPathCoordinates><coordEllipsoid>WGS84</coordEllipsoid><coordType>GEO_DECIMAL</coordType><itdCoordinateBaseElemList><itdCoordinateBaseElem><x>7012530</x><y>51451480</y></itdCoordinateBaseElem></itdCoordinateBaseElemList></itdPathCoordinates><genAttrList><genAttrElem><name>STOP_POINT_LONGNAME</name><value>Gleis 1</value></genAttrElem><genAttrElem><name>STOP_POINT_CHARACTERISTICS</name><value>Platform</value></genAttrElem><genAttrElem><name>STOP_AREA_NAME</name><value>Zug</value></genAttrElem><genAttrElem><name>STOP_GLOBAL_ID</name><value>de:5113:9289</value></genAttrElem><genAttrElem><name>STOPPOINT_GLOBAL_ID</name><value>de:5113:9289:3:1</value></genAttrElem><genAttrElem><name>IDENTIFIER</name><value>1</value></genAttrElem></genAttrList></coordInfoItem>
+</coordInfoItemList></itdCoordInfo></itdCoordInfoRequest></itdRequest>
+'''
+
+
+def replay_coord_request(xml_backend=None, **kwargs):
+    transport, default_xml_backend = vrr.transport, vrr.xml_backend
+    vrr.transport = ReplayTransport([{'method': 'POST', 'url': vrr.base_url+'XML_COORD_REQUEST',
+                                      'result': COORD_RESULT}], ordered=True)
+    vrr.xml_backend = xml_backend or default_xml_backend
+    try:
+        request = CoordRequest(vrr, Coordinates(51.451137, 7.012941), Platform, 400, **kwargs)
+        return request, [result.sourced().serialize() for result in request.results]
+    finally:
+        vrr.transport, vrr.xml_backend = transport, default_xml_backend
+
+
+class StaticTransport(Transport):
+    def __init__(self, body):
+        super().__init__(debug=False)
+        self.body = body
+        self.calls = 0
+
+    def fetch(self, request, method, url, data=None, session=None, fingerprint=None):
+        self.calls += 1
+        return self.body
+
+    def stream(self, request, method, url, data=None, session=None, fingerprint=None, on_complete=None):
+        raise NotImplementedError